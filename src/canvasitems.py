@@ -0,0 +1,293 @@
+import tkinter as tk
+import typing
+
+from PIL import ImageTk
+
+class ObjectItems:
+    __slots__ = (
+        'background',
+        'foreground',
+        'child_sprites',
+        'radius',
+        'path',
+        'overlays',
+        'images',
+        'child_sprite_images',
+        'materialized',
+        'bounds',
+    )
+
+    def __init__(self) -> None:
+        """Canvas items and Tk images of one level object."""
+        self.background: int | None = None
+        self.foreground: int | None = None
+        self.child_sprites: list[int] = []
+        self.radius: list[int] = []
+        # part -> item, so path items can be moved instead of created again
+        self.path: dict[str, int] = {}
+        # overlay name -> items
+        self.overlays: dict[str, list[int]] = {}
+
+        # the canvas only shows images that are still referenced
+        self.images: dict[str, ImageTk.PhotoImage] = {}
+        self.child_sprite_images: list[ImageTk.PhotoImage] = []
+
+        # whether the object is drawn, objects outside of the view are not
+        self.materialized = False
+        # image bounds (left, top, right, bottom) relative to the object position, in canvas pixels at zoom 1
+        self.bounds: tuple[float, float, float, float] | None = None
+
+    def objectItems(self) -> list[int]:
+        """Get the items that are drawn by `updateObject`.
+
+        Returns:
+            list[int]: Canvas item ids.
+        """
+        items = [item for item in (self.background, self.foreground) if item is not None]
+        return items + self.child_sprites + self.radius + list(self.path.values())
+
+    def popObjectItems(self) -> list[int]:
+        """Forget the items that are drawn by `updateObject`, so they can be deleted.
+
+        Returns:
+            list[int]: Canvas item ids.
+        """
+        items = self.objectItems()
+
+        self.background = None
+        self.foreground = None
+        self.child_sprites = []
+        self.radius = []
+        self.path = {}
+        self.images.clear()
+        self.child_sprite_images = []
+        self.materialized = False
+
+        return items
+
+    def popOverlay(self, overlay: str) -> list[int]:
+        """Forget the items of an overlay, so they can be deleted.
+
+        Args:
+            overlay (str): Overlay name.
+
+        Returns:
+            list[int]: Canvas item ids.
+        """
+        return self.overlays.pop(overlay, [])
+
+    def items(self) -> list[int]:
+        """Get every item of the object, including overlays.
+
+        Returns:
+            list[int]: Canvas item ids.
+        """
+        items = self.objectItems()
+        for overlay_items in self.overlays.values():
+            items.extend(overlay_items)
+        return items
+
+class CanvasItemRegistry:
+    def __init__(self) -> None:
+        """Canvas items of every level object, by role.
+
+        Records are keyed by the object's canvas tag (`object-<id>`), so looking up an object's items doesn't need to ask the canvas.
+        """
+        self._records: dict[str, ObjectItems] = {}
+
+    def get(self, id: str) -> ObjectItems | None:
+        return self._records.get(id)
+
+    def record(self, id: str) -> ObjectItems:
+        """Get the record of an object, creating it if needed.
+
+        Args:
+            id (str): Object canvas tag.
+
+        Returns:
+            ObjectItems: The record.
+        """
+        record = self._records.get(id)
+        if record is None:
+            record = self._records[id] = ObjectItems()
+        return record
+
+    def addOverlayItem(self, id: str, overlay: str, item: int) -> int:
+        """Remember an overlay item.
+
+        Args:
+            id (str): Object canvas tag.
+            overlay (str): Overlay name.
+            item (int): Canvas item id.
+
+        Returns:
+            int: `item`
+        """
+        self.record(id).overlays.setdefault(overlay, []).append(item)
+        return item
+
+    def pop(self, id: str) -> ObjectItems | None:
+        return self._records.pop(id, None)
+
+    def popOverlay(self, overlay: str) -> list[int]:
+        """Forget the items of an overlay for every object.
+
+        Args:
+            overlay (str): Overlay name.
+
+        Returns:
+            list[int]: Canvas item ids.
+        """
+        items = []
+        for record in self._records.values():
+            items.extend(record.popOverlay(overlay))
+        return items
+
+    def clear(self) -> list[int]:
+        """Forget everything.
+
+        Returns:
+            list[int]: Every item that was in the registry, so they can be deleted.
+        """
+        items = []
+        for record in self._records.values():
+            items.extend(record.items())
+        self._records.clear()
+        return items
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+class CanvasItemPool:
+    POOL_TAG = 'pooled'
+
+    def __init__(self, canvas: tk.Canvas, max_free: int = 1024) -> None:
+        """Reuse canvas items instead of deleting them and creating new ones.
+
+        It has the same `create_*` methods as the canvas. Released items are reused for the next item of the same type with the same options, by moving them with `coords` and setting the options with `itemconfig`. Items that aren't reused are hidden by `hideReleased`, and kept for later.
+
+        Args:
+            canvas (tk.Canvas): The canvas.
+            max_free (int, optional): Number of unused items to keep, the others are deleted. Defaults to 1024.
+        """
+        self.canvas = canvas
+        self.max_free = max_free
+
+        # item -> (type, option names)
+        self._keys: dict[int, tuple[str, tuple[str, ...]]] = {}
+        # (type, option names) -> unused items, dicts are used as ordered sets
+        self._free: dict[tuple[str, tuple[str, ...]], dict[int, None]] = {}
+        # unused items that haven't been hidden yet
+        self._released: dict[int, None] = {}
+        self._hide: str | None = None
+
+    def create_line(self, *coords, **options) -> int:
+        return self._create('line', coords, options)
+
+    def create_polygon(self, *coords, **options) -> int:
+        return self._create('polygon', coords, options)
+
+    def create_oval(self, *coords, **options) -> int:
+        return self._create('oval', coords, options)
+
+    def create_circle(self, x: float, y: float, r: float, **options) -> int:
+        return self._create('oval', (x - r, y - r, x + r, y + r), options)
+
+    def create_text(self, x: float, y: float, **options) -> int:
+        return self._create('text', (x, y), options)
+
+    def create_image(self, x: float, y: float, **options) -> int:
+        return self._create('image', (x, y), options)
+
+    def release(self, *items: int) -> list[int]:
+        """Give items back to the pool, so they can be reused.
+
+        Args:
+            *items (int): Canvas item ids.
+
+        Returns:
+            list[int]: The items that weren't created by the pool, so they have to be deleted.
+        """
+        others = []
+        for item in items:
+            key = self._keys.get(item)
+            if key is None:
+                others.append(item)
+                continue
+            self._free.setdefault(key, {})[item] = None
+            self._released[item] = None
+
+        if len(self._released) > 0 and self._hide is None:
+            self._hide = self.canvas.after_idle(self.hideReleased)
+
+        return others
+
+    def hideReleased(self):
+        """Hide the released items that weren't reused, and delete the ones over `max_free`."""
+        if self._hide is not None:
+            self.canvas.after_cancel(self._hide)
+            self._hide = None
+
+        released = [item for item in self._released if item in self._keys and self._isFree(item)]
+        self._released.clear()
+
+        for item in released:
+            # without their tags, the items aren't shown again with their view
+            self.canvas.itemconfig(item, state = 'hidden', tags = (self.POOL_TAG,))
+
+        surplus = sum(len(free) for free in self._free.values()) - self.max_free
+        if surplus > 0:
+            extra = []
+            for free in self._free.values():
+                while surplus > 0 and len(free) > 0:
+                    item = next(iter(free))
+                    del free[item]
+                    del self._keys[item]
+                    extra.append(item)
+                    surplus -= 1
+            self.canvas.delete(*extra)
+
+    def discard(self, *items: int):
+        """Forget items that were deleted.
+
+        Args:
+            *items (int): Canvas item ids.
+        """
+        for item in items:
+            key = self._keys.pop(item, None)
+            if key is None:
+                continue
+            self._free.get(key, {}).pop(item, None)
+            self._released.pop(item, None)
+
+    def clear(self):
+        """Delete the unused items, and forget every item."""
+        for free in self._free.values():
+            self.canvas.delete(*free)
+        self._keys.clear()
+        self._free.clear()
+        self._released.clear()
+
+    def _isFree(self, item: int) -> bool:
+        return item in self._free.get(self._keys[item], {})
+
+    def _create(self, kind: str, coords: typing.Iterable[float], options: dict[str, typing.Any]) -> int:
+        # items are only reused for the same options, so every option that was set before is set again
+        key = (kind, tuple(sorted(options)))
+
+        free = self._free.get(key)
+        if free:
+            item = next(iter(free))
+            del free[item]
+            self._released.pop(item, None)
+
+            self.canvas.coords(item, *coords)
+            self.canvas.itemconfig(item, **{'state': 'normal', 'tags': (), **options})
+            return item
+
+        item = getattr(self.canvas, f'create_{kind}')(*coords, **options)
+        self._keys[item] = key
+        return item
@@ -0,0 +1,107 @@
+import logging
+import os
+import threading
+import typing
+import xml.etree.ElementTree as ET
+
+class HSPropertyCache:
+    def __init__(self) -> None:
+        """Cache of the `Property` values in `.hs` files.
+
+        Each file is read once, so every object that uses the same file shares one parsed copy. Lookups don't touch the file system; `refresh` reads the files that changed again, e.g. when a level is loaded.
+        """
+        # path -> (modification time, properties), both None if the file can't be read
+        self._cache: dict[str, tuple[float | None, dict[str, str] | None]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> dict[str, str] | None:
+        """Get the properties in a `.hs` file.
+
+        Args:
+            path (str): Path to the `.hs` file.
+
+        Returns:
+            dict[str, str] | None: Property names and values. None if the file does not exist or can't be read.
+        """
+        cached = self._cache.get(path)
+        if cached is not None:
+            return cached[1]
+
+        return self._read(path)
+
+    def _read(self, path: str) -> dict[str, str] | None:
+        try:
+            mtime = os.path.getmtime(path)
+            root = ET.parse(path).getroot()
+        except Exception:
+            logging.debug(f'unable to read properties from {path}')
+            with self._lock:
+                self._cache[path] = (None, None)
+            return None
+
+        properties = {}
+        for prop in root.iter('Property'):
+            name = prop.get('name')
+            if name and not properties.get(name):
+                properties[name] = prop.get('value')
+
+        with self._lock:
+            self._cache[path] = (mtime, properties)
+
+        return properties
+
+    def getProperty(self, path: str, name: str, default: typing.Any = None) -> str | typing.Any:
+        """Get one property from a `.hs` file.
+
+        Args:
+            path (str): Path to the `.hs` file.
+            name (str): Property name.
+            default (Any, optional): Value if the file or property doesn't exist. Defaults to None.
+
+        Returns:
+            str | Any: Property value.
+        """
+        properties = self.get(path)
+        if not properties:
+            return default
+        value = properties.get(name)
+        if not value:
+            return default
+        return value
+
+    def preload(self, paths: typing.Iterable[str]) -> threading.Thread:
+        """Read files in a background thread.
+
+        Args:
+            paths (Iterable[str]): Paths to `.hs` files.
+
+        Returns:
+            threading.Thread: The started thread.
+        """
+        paths = list(dict.fromkeys(paths))
+
+        def load():
+            for path in paths:
+                self.get(path)
+
+        thread = threading.Thread(target = load, daemon = True)
+        thread.start()
+        return thread
+
+    def refresh(self):
+        """Forget the files that changed, were created or were removed since they were read, so they're read again when they're used."""
+        with self._lock:
+            cached = list(self._cache.items())
+
+        for path, (mtime, properties) in cached:
+            try:
+                current = os.path.getmtime(path)
+            except OSError:
+                current = None
+            if current != mtime:
+                with self._lock:
+                    self._cache.pop(path, None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
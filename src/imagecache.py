@@ -0,0 +1,130 @@
+import typing
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+def properties_key(
+    properties: dict,
+    names: typing.Iterable[str] | None = None,
+    prefixes: tuple[str, ...] = (),
+) -> tuple[tuple[str, str], ...]:
+    """Get a hashable snapshot of an object's properties, to use in a cache key.
+
+    Args:
+        properties (dict): Object properties.
+        names (Iterable[str] | None, optional): Only include these properties. Defaults to every property.
+        prefixes (tuple[str, ...], optional): Also include the properties that start with one of these, like numbered properties. Only used with `names`. Defaults to ().
+
+    Returns:
+        tuple[tuple[str, str], ...]: (name, value) pairs, sorted when every property is included.
+    """
+    if names is None:
+        return tuple(sorted((str(name), str(value)) for name, value in properties.items()))
+
+    key = tuple((name, str(properties[name])) for name in names if name in properties)
+    if prefixes:
+        key += tuple(sorted((str(name), str(value)) for name, value in properties.items() if str(name).startswith(prefixes)))
+    return key
+
+def scale_image(image: Image.Image, factor: float, resample: int = Image.BILINEAR) -> Image.Image:
+    """Resize an image by a factor.
+
+    Args:
+        image (Image.Image): The image.
+        factor (float): Scale factor. `1` returns the image itself.
+        resample (int, optional): Resampling filter. Defaults to Image.BILINEAR.
+
+    Returns:
+        Image.Image: Resized image, at least 1x1.
+    """
+    if factor == 1:
+        return image
+
+    size = (max(1, round(image.width * factor)), max(1, round(image.height * factor)))
+    return image.resize(size, resample = resample)
+
+class RotatedImageCache:
+    def __init__(self, max_size: int = 512, max_pixels: int = 32_000_000, angle_step: float = 1) -> None:
+        """LRU cache of rotated Tk images.
+
+        Entries are keyed by (owner, part, angle, scale). The cache only holds on to images while they are in the cache, so anything that is displayed on a canvas must also be referenced by whoever displays it.
+
+        Args:
+            max_size (int, optional): Maximum amount of images to keep. Defaults to 512.
+            max_pixels (int, optional): Maximum total amount of pixels in all images. Defaults to 32,000,000.
+            angle_step (float, optional): Angles are rounded to a multiple of this, in degrees. Defaults to 1.
+        """
+        self.max_size = max_size
+        self.max_pixels = max_pixels
+        self.angle_step = angle_step
+
+        self._images: OrderedDict[tuple, ImageTk.PhotoImage] = OrderedDict()
+        self._pixels = 0
+
+    def quantize(self, angle: float) -> float:
+        if not self.angle_step:
+            return angle % 360
+        return (round(angle / self.angle_step) * self.angle_step) % 360
+
+    def get(
+        self,
+        owner: typing.Any,
+        part: typing.Hashable,
+        angle: float,
+        scale: typing.Hashable,
+        render: typing.Callable[[float], Image.Image],
+        quantize: bool = True,
+    ) -> ImageTk.PhotoImage:
+        """Get a cached image, or render it.
+
+        Args:
+            owner (Any): What the image belongs to, e.g. a level object.
+            part (Hashable): Which image of the owner this is, e.g. a sprite.
+            angle (float): Rotation in degrees.
+            scale (Hashable): Image scale, along with anything else that changes the rendered image, e.g. `(scale, zoom)`.
+            render (Callable[[float], Image.Image]): Called with the (quantized) angle to create the image when it's not cached.
+            quantize (bool, optional): Round the angle to `angle_step`. Disable this if `render` can't rotate to an arbitrary angle. Defaults to True.
+
+        Returns:
+            ImageTk.PhotoImage: Tk image.
+        """
+        angle = float(angle)
+        if quantize:
+            angle = self.quantize(angle)
+
+        key = (owner, part, angle, scale)
+
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+
+        image = ImageTk.PhotoImage(render(angle))
+        self._images[key] = image
+        self._pixels += image.width() * image.height()
+
+        # always keep the image that was just added
+        while len(self._images) > 1 and (len(self._images) > self.max_size or self._pixels > self.max_pixels):
+            self._pop(next(iter(self._images)))
+
+        return image
+
+    def _pop(self, key: tuple):
+        image = self._images.pop(key)
+        self._pixels -= image.width() * image.height()
+
+    def discard(self, owner: typing.Any):
+        """Remove every image of an owner.
+
+        Args:
+            owner (Any): The owner.
+        """
+        for key in [key for key in self._images if key[0] is owner]:
+            self._pop(key)
+
+    def clear(self):
+        self._images.clear()
+        self._pixels = 0
+
+    def __len__(self) -> int:
+        return len(self._images)
@@ -0,0 +1,54 @@
+import tkinter as tk
+
+class CanvasLayers:
+    MARKER_TAG = 'layerMarker'
+
+    def __init__(self, canvas: tk.Canvas, layers: list[str]) -> None:
+        """Keep canvas items in named layers without restacking the whole canvas.
+
+        Every layer has a hidden marker item at its top. Placing an item in a layer lowers it right below that marker, which only moves that one item.
+
+        Args:
+            canvas (tk.Canvas): The canvas.
+            layers (list[str]): Layer names, from bottom to top.
+        """
+        self.canvas = canvas
+        self.layers = list(layers)
+        self._markers: dict[str, int] = {}
+
+        # items are created on top, so creating the markers in order stacks them in order
+        for layer in self.layers:
+            self._markers[layer] = self.canvas.create_line(
+                0, 0, 0, 0,
+                state = 'hidden',
+                tags = (self.MARKER_TAG, f'{self.MARKER_TAG}-{layer}'),
+            )
+
+    def marker(self, layer: str) -> int:
+        """Get the marker item at the top of a layer.
+
+        Args:
+            layer (str): Layer name.
+
+        Returns:
+            int: Canvas item id.
+        """
+        return self._markers[layer]
+
+    def place(self, item: int | str, layer: str):
+        """Move items to the top of a layer.
+
+        Args:
+            item (int | str): Canvas item id, or a tag. Items with the same tag keep their order.
+            layer (str): Layer name.
+        """
+        self.canvas.tag_lower(item, self._markers[layer])
+
+    def placeBelow(self, item: int | str, other: int | str):
+        """Move items right below another item.
+
+        Args:
+            item (int | str): Canvas item id, or a tag.
+            other (int | str): Canvas item id, or a tag.
+        """
+        self.canvas.tag_lower(item, other)
@@ -0,0 +1,99 @@
+import typing
+
+import wmwpy
+
+class LevelBounds:
+    def __init__(self) -> None:
+        """Running bounding box of object positions, in level units.
+
+        Adding, moving and removing objects is O(1). The box is only recomputed from every object when an object that was on its edge moves inward or is removed, and then only the next time it's asked for.
+        """
+        self._positions: dict[wmwpy.classes.Object, tuple[float, float]] = {}
+        # (min x, min y, max x, max y)
+        self._bounds: tuple[float, float, float, float] | None = None
+        self._dirty = False
+
+    def rebuild(self, objects: typing.Iterable[wmwpy.classes.Object]):
+        """Forget the objects, and track these objects instead.
+
+        Args:
+            objects (Iterable[wmwpy.classes.Object]): The objects.
+        """
+        self._positions = {obj: self._position(obj) for obj in objects}
+        self._dirty = True
+
+    def update(self, obj: wmwpy.classes.Object):
+        """Add an object, or update it after it moved.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+        """
+        pos = self._position(obj)
+        old_pos = self._positions.get(obj)
+        if pos == old_pos:
+            return
+
+        self._positions[obj] = pos
+
+        if self._dirty:
+            return
+        if self._bounds is None:
+            self._bounds = pos + pos
+            return
+
+        if old_pos is not None and self._onEdge(old_pos):
+            # it might have been the only object on that edge
+            min_x, min_y, max_x, max_y = self._bounds
+            if (old_pos[0] == min_x and pos[0] > min_x) \
+               or (old_pos[1] == min_y and pos[1] > min_y) \
+               or (old_pos[0] == max_x and pos[0] < max_x) \
+               or (old_pos[1] == max_y and pos[1] < max_y):
+                self._dirty = True
+                return
+
+        self._extend(pos)
+
+    def remove(self, obj: wmwpy.classes.Object):
+        pos = self._positions.pop(obj, None)
+        if pos is not None and not self._dirty and self._onEdge(pos):
+            self._dirty = True
+
+    def bounds(self) -> tuple[float, float, float, float] | None:
+        """Get the bounding box.
+
+        Returns:
+            tuple[float, float, float, float] | None: (min x, min y, max x, max y), or None if there are no objects.
+        """
+        if self._dirty:
+            self._dirty = False
+            self._bounds = None
+            for pos in self._positions.values():
+                self._extend(pos)
+        return self._bounds
+
+    def clear(self):
+        self._positions.clear()
+        self._bounds = None
+        self._dirty = False
+
+    def _position(self, obj: wmwpy.classes.Object) -> tuple[float, float]:
+        return (float(obj.pos[0]), float(obj.pos[1]))
+
+    def _onEdge(self, pos: tuple[float, float]) -> bool:
+        if self._bounds is None:
+            return False
+        min_x, min_y, max_x, max_y = self._bounds
+        return pos[0] in (min_x, max_x) or pos[1] in (min_y, max_y)
+
+    def _extend(self, pos: tuple[float, float]):
+        if self._bounds is None:
+            self._bounds = pos + pos
+            return
+
+        min_x, min_y, max_x, max_y = self._bounds
+        self._bounds = (
+            min(min_x, pos[0]),
+            min(min_y, pos[1]),
+            max(max_x, pos[0]),
+            max(max_y, pos[1]),
+        )
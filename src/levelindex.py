@@ -0,0 +1,241 @@
+import typing
+
+import wmwpy
+
+class ObjectNameIndex:
+    def __init__(self, objects: typing.Iterable[wmwpy.classes.Object] = (), order: 'ObjectOrder | None' = None) -> None:
+        """Look up level objects by name.
+
+        The index has to be told about every object that is added, removed, or renamed.
+
+        Args:
+            objects (Iterable[wmwpy.classes.Object], optional): Objects to index. Defaults to ().
+            order (ObjectOrder | None, optional): Positions of the objects in the level, so lookups and names follow the level order like a search through the object list would. Defaults to the order the objects were indexed in.
+        """
+        self._names: dict[str, list[wmwpy.classes.Object]] = {}
+        self._order = order
+        self.rebuild(objects)
+
+    def rebuild(self, objects: typing.Iterable[wmwpy.classes.Object]):
+        """Forget everything, and index these objects instead.
+
+        Args:
+            objects (Iterable[wmwpy.classes.Object]): Objects in level order.
+        """
+        self._names.clear()
+        for obj in objects:
+            self.add(obj)
+
+    def add(self, obj: wmwpy.classes.Object):
+        self._names.setdefault(obj.name, []).append(obj)
+
+    def remove(self, obj: wmwpy.classes.Object, name: str | None = None):
+        """Remove an object from the index.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+            name (str | None, optional): The name the object was indexed with. Defaults to the current name.
+        """
+        if name is None:
+            name = obj.name
+
+        objects = self._names.get(name)
+        if objects is None:
+            return
+
+        for index, other in enumerate(objects):
+            if other is obj:
+                del objects[index]
+                break
+
+        if len(objects) == 0:
+            del self._names[name]
+
+    def rename(self, obj: wmwpy.classes.Object, old_name: str):
+        """Update the index after an object was renamed.
+
+        Args:
+            obj (wmwpy.classes.Object): The object, already renamed.
+            old_name (str): The previous name.
+        """
+        self.remove(obj, old_name)
+        self.add(obj)
+
+    def get(self, name: str) -> wmwpy.classes.Object | None:
+        """Get the object with a name. If several objects share the name, the first one in the level is returned.
+
+        Args:
+            name (str): Object name.
+
+        Returns:
+            wmwpy.classes.Object | None: The object, or None if there is no object with that name.
+        """
+        objects = self._names.get(name)
+        if not objects:
+            return None
+        if len(objects) == 1:
+            return objects[0]
+        return min(objects, key = self._position)
+
+    def names(self, exclude: wmwpy.classes.Object | None = None) -> list[str]:
+        """Get the name of every object, in level order. Names that several objects share are listed once for each of them.
+
+        Args:
+            exclude (wmwpy.classes.Object | None, optional): Leave out this object. Defaults to None.
+
+        Returns:
+            list[str]: Object names.
+        """
+        objects = [obj for objects in self._names.values() for obj in objects if obj is not exclude]
+        objects.sort(key = self._position)
+        return [obj.name for obj in objects]
+
+    def _position(self, obj: wmwpy.classes.Object) -> int:
+        # objects that aren't in the order yet go after the ones that are, in the order they were indexed in
+        if self._order is None or obj not in self._order:
+            return len(self._order) if self._order is not None else 0
+        return self._order.index(obj)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+class ObjectIdIndex:
+    def __init__(self, objects: typing.Iterable[wmwpy.classes.Object] = ()) -> None:
+        """Look up level objects by id, like `Level.getObjectById` without searching the object list.
+
+        The index has to be told about every object that is added or removed.
+
+        Args:
+            objects (Iterable[wmwpy.classes.Object], optional): Objects to index. Defaults to ().
+        """
+        self._ids: dict[int, wmwpy.classes.Object] = {}
+        self.rebuild(objects)
+
+    def rebuild(self, objects: typing.Iterable[wmwpy.classes.Object]):
+        self._ids = {obj.id: obj for obj in objects}
+
+    def add(self, obj: wmwpy.classes.Object):
+        self._ids[obj.id] = obj
+
+    def remove(self, obj: wmwpy.classes.Object):
+        if self._ids.get(obj.id) is obj:
+            del self._ids[obj.id]
+
+    def get(self, id: int | str) -> wmwpy.classes.Object | None:
+        """Get the object with an id.
+
+        Args:
+            id (int | str): Object id, or a string of it like the ones in canvas tags and the object selector.
+
+        Returns:
+            wmwpy.classes.Object | None: The object, or None if there is no object with that id.
+        """
+        try:
+            id = int(float(id))
+        except (TypeError, ValueError):
+            return None
+        return self._ids.get(id)
+
+    def __contains__(self, id: int) -> bool:
+        return id in self._ids
+
+class ObjectOrder:
+    def __init__(self, objects: list[wmwpy.classes.Object] | None = None) -> None:
+        """Keep track of where objects are in the level object list.
+
+        Membership is O(1). Positions are remembered, and after the list changes only the positions from the first changed index onwards are worked out again, the next time one of them is needed. Every change to the list has to go through this class, or be followed by `rebuild`.
+
+        Args:
+            objects (list[wmwpy.classes.Object] | None, optional): The level object list. It is changed in place. Defaults to None.
+        """
+        self.rebuild(objects if objects is not None else [])
+
+    def rebuild(self, objects: list[wmwpy.classes.Object]):
+        """Track a new object list.
+
+        Args:
+            objects (list[wmwpy.classes.Object]): The level object list.
+        """
+        self.objects = objects
+        self._positions: dict[wmwpy.classes.Object, int] = {obj: index for index, obj in enumerate(objects)}
+        # positions before this index are up to date
+        self._valid = len(objects)
+
+    def index(self, obj: wmwpy.classes.Object) -> int:
+        """Get the position of an object in the list.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+
+        Raises:
+            ValueError: The object is not in the list.
+
+        Returns:
+            int: Index in the list.
+        """
+        if obj not in self._positions:
+            raise ValueError(f'{obj!r} is not in the level')
+
+        index = self._positions[obj]
+        if index >= self._valid:
+            for index in range(self._valid, len(self.objects)):
+                self._positions[self.objects[index]] = index
+            self._valid = len(self.objects)
+            index = self._positions[obj]
+        return index
+
+    def add(self, obj: wmwpy.classes.Object):
+        """Track an object that was appended to the list, like `Level.addObject` does.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+        """
+        if obj in self._positions:
+            return
+        if len(self.objects) == 0 or self.objects[-1] is not obj:
+            self.objects.append(obj)
+
+        index = len(self.objects) - 1
+        self._positions[obj] = index
+        if self._valid == index:
+            self._valid += 1
+
+    def insert(self, index: int, obj: wmwpy.classes.Object):
+        index = max(0, min(index, len(self.objects)))
+        self.objects.insert(index, obj)
+        self._positions[obj] = index
+        self._valid = min(self._valid, index)
+
+    def remove(self, obj: wmwpy.classes.Object) -> int:
+        """Remove an object from the list.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+
+        Raises:
+            ValueError: The object is not in the list.
+
+        Returns:
+            int: The index it had.
+        """
+        index = self.index(obj)
+        del self.objects[index]
+        del self._positions[obj]
+        self._valid = min(self._valid, index)
+        return index
+
+    def move(self, obj: wmwpy.classes.Object, index: int):
+        """Move an object to another position in the list.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+            index (int): New index.
+        """
+        self.remove(obj)
+        self.insert(index, obj)
+
+    def __contains__(self, obj: wmwpy.classes.Object) -> bool:
+        return obj in self._positions
+
+    def __len__(self) -> int:
+        return len(self.objects)
@@ -110,7 +110,7 @@ _log_filename = setup_logger(_log_filename_format, debug = debug)
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import tkwidgets
-from PIL import Image, ImageTk, ImageDraw
+from PIL import Image, ImageTk
 from settings import Settings
 import numpy
 import typing
@@ -120,6 +120,22 @@ import webbrowser
 
 import wmwpy
 from scrollframe import ScrollFrame
+from overlays import OverlayDependencies, OverlayPlugin, OverlayRegistry
+from overlayworker import OverlayWorker
+from scheduler import RenderScheduler
+import trajectory
+from hsproperties import HSPropertyCache
+from levelindex import ObjectNameIndex, ObjectIdIndex, ObjectOrder
+import imagecache
+from layers import CanvasLayers
+from canvasitems import CanvasItemPool, CanvasItemRegistry
+from tiles import TiledImage
+from objectclasses import ObjectClassIndex
+import propertyrecords
+from levelbounds import LevelBounds
+from spatialindex import SpatialIndex
+from rasterlayer import RasterLayer
+import vacuumfield
 import popups
 
 logging.info(f'wme version: {__version__}')
@@ -183,6 +199,7 @@ class WME(tk.Tk):
         self.clipboard = None
 
         self.scale = 5
+        self.zoom = 1
         self.settings = Settings(
             filename = os.path.join(os.path.dirname(__file__), 'settings.json'),
             default_settings = {
@@ -208,7 +225,19 @@ class WME(tk.Tk):
                     'particleTrajectory': True,
                     'vacuum': True,
                     'parent': True
-                }
+                },
+                'render': {
+                    # minimum time between canvas redraws in milliseconds
+                    'frame_budget': 16,
+                    # objects this far outside of the view in canvas pixels are still drawn
+                    'cull_margin': 256,
+                    # size of the level background tiles in canvas pixels
+                    'tile_size': 256,
+                    # threads that compute overlay geometry, like particle trajectories
+                    'overlay_workers': 2,
+                    # draw each overlay in RASTER_OVERLAYS into one image, instead of a canvas item for every shape
+                    'raster_overlays': False,
+                },
             }
         )
         self.updateSettings()
@@ -258,6 +287,42 @@ class WME(tk.Tk):
         self.dragInfo: dict[typing.Literal['offset'], tuple[float, float]] = {'offset': (0, 0)}
         self.level : wmwpy.classes.Level = None
         self.game : wmwpy.Game = None
+        self.overlayDependencies = OverlayDependencies()
+        self.hsProperties = HSPropertyCache()
+        self.objectOrder = ObjectOrder()
+        self.objectNames = ObjectNameIndex(order = self.objectOrder)
+        self.objectIds = ObjectIdIndex()
+        self.objectClasses = ObjectClassIndex()
+        self.propertyRecords = propertyrecords.PropertyRecordCache()
+        self.levelBounds = LevelBounds()
+        self.overlayWorker = OverlayWorker(self, self.settings.get('render.overlay_workers', 2))
+        self.overlayPlugins = OverlayRegistry(self.overlayWorker, self._onOverlayResult)
+        self.registerOverlays()
+        # objects with dragged PathPoints that haven't been written to their properties yet
+        self.pendingPathPoints: dict[wmwpy.classes.Object, None] = {}
+        # object image bounds and path points, in canvas pixels at zoom 1
+        self.spatialIndex = SpatialIndex()
+        # bounds of every level object, drawn or not, to find the objects in view, in canvas pixels at zoom 1
+        self.cullIndex = SpatialIndex()
+        # (overlay, object) -> what the overlay of the object drew, in canvas pixels at zoom 1, so overlays are culled by their own extent
+        self.overlayCullIndex = SpatialIndex()
+        # objects that aren't drawn, but have overlays that reach into the view
+        self.detachedOverlays: set[wmwpy.classes.Object] = set()
+        # objects that have canvas items
+        self.materializedObjects: set[wmwpy.classes.Object] = set()
+        # whether updateLevel is drawing every object in order
+        self._drawingLevel = False
+        # whether a property panel variable is being set from the object, instead of being edited
+        self._syncingPropertyPanel = False
+        self.imageCache = imagecache.RotatedImageCache()
+        self.canvasItems = CanvasItemRegistry()
+        # view setting -> objects that weren't drawn for it while it was hidden
+        self.staleViews: dict[str, set[wmwpy.classes.Object]] = {}
+        self.renderScheduler = RenderScheduler(
+            self,
+            self._flushRender,
+            lambda: self.overlayPlugins.names(with_object = False),
+            self.settings.get('render.frame_budget', 16))
 
         self.createMenubar()
         self.createWindow()
@@ -408,14 +473,24 @@ class WME(tk.Tk):
         self.level_canvas = tk.Canvas(self.separator, width=90*self.scale, height=120*self.scale)
         self.separator.add(self.level_canvas, weight=1)
 
-        self.level_images = {
-            'background': self.level_canvas.create_image(
-                0,0,
-                anchor = 'c',
-                image = None,
-                tag = 'level'
-            ),
-            'objects': {}
+        self.levelTiles = TiledImage(self.level_canvas, self.imageCache, self.settings.get('render.tile_size', 256))
+        self.layers = CanvasLayers(self.level_canvas, self.LAYERS)
+
+        # overlay -> layer, for the overlays that are drawn into one image
+        self.rasterLayers: dict[str, RasterLayer] = {}
+        if self.settings.get('render.raster_overlays', False):
+            for overlay in self.RASTER_OVERLAYS:
+                # not tagged passthrough: the layer covers the whole view, so every click would reach onLevelClick twice
+                layer = RasterLayer(self.level_canvas, tags = (self.getViewTag(overlay),))
+                layer.margin = self.settings.get('render.cull_margin', 256)
+                self.layers.place(layer.item, overlay)
+                self.rasterLayers[overlay] = layer
+
+        # overlay -> pool, so redrawing an overlay moves its items instead of creating new ones
+        self.overlayPools: dict[str, CanvasItemPool] = {
+            overlay: CanvasItemPool(self.level_canvas)
+            for overlay in self.RASTER_OVERLAYS
+            if overlay not in self.rasterLayers
         }
 
         self.level_scrollbars = {
@@ -434,8 +509,16 @@ class WME(tk.Tk):
         self.level_scrollbars['horizontal'].pack(side='bottom', fill='x')
         self.level_scrollbars['vertical'].pack(side='right', fill='y')
 
-        self.level_canvas.configure(xscrollcommand=self.level_scrollbars['horizontal'].set)
-        self.level_canvas.configure(yscrollcommand=self.level_scrollbars['vertical'].set)
+        def scrollCommand(scrollbar: ttk.Scrollbar):
+            def command(*args):
+                scrollbar.set(*args)
+                self.onLevelViewChanged()
+            return command
+
+        self.level_canvas.configure(xscrollcommand=scrollCommand(self.level_scrollbars['horizontal']))
+        self.level_canvas.configure(yscrollcommand=scrollCommand(self.level_scrollbars['vertical']))
+        self._viewport_update = None
+        self._scrollregion = None
 
         self.createLevelContextMenu()
 
@@ -453,12 +536,17 @@ class WME(tk.Tk):
 
             self.level_canvas.bind("<Shift-Button-4>", lambda *args: self.onLevelMouseWheel(*args, type = 1))
             self.level_canvas.bind("<Shift-Button-5>", lambda *args: self.onLevelMouseWheel(*args, type = 1))
+
+            self.level_canvas.bind(f"<{crossplatform.modifier()}-Button-4>", self.onLevelZoom)
+            self.level_canvas.bind(f"<{crossplatform.modifier()}-Button-5>", self.onLevelZoom)
         else:
             self.level_canvas.bind("<MouseWheel>", self.onLevelMouseWheel)
             self.level_canvas.bind("<Shift-MouseWheel>", lambda *args: self.onLevelMouseWheel(*args, type = 1))
+            self.level_canvas.bind(f"<{crossplatform.modifier()}-MouseWheel>", self.onLevelZoom)
 
         self.level_canvas.bind('<Button-1>', self.onLevelClick)
         self.level_canvas.bind('<Button1-Motion>', self.onLevelMove)
+        self.level_canvas.bind('<ButtonRelease-1>', self.onLevelRelease)
 
         self.level_canvas.bind('<Enter>', self.bindKeyboardShortcuts)
         self.level_canvas.bind('<Leave>', self.unbindKeyboardShortcuts)
@@ -493,12 +581,17 @@ class WME(tk.Tk):
 
             self.level_canvas.unbind("<Shift-Button-4>")
             self.level_canvas.unbind("<Shift-Button-5>")
+
+            self.level_canvas.unbind(f"<{crossplatform.modifier()}-Button-4>")
+            self.level_canvas.unbind(f"<{crossplatform.modifier()}-Button-5>")
         else:
             self.level_canvas.unbind("<MouseWheel>")
             self.level_canvas.unbind("<Shift-MouseWheel>")
+            self.level_canvas.unbind(f"<{crossplatform.modifier()}-MouseWheel>")
 
         self.level_canvas.unbind('<Button-1>')
         self.level_canvas.unbind('<Button1-Motion>')
+        self.level_canvas.unbind('<ButtonRelease-1>')
 
         if platform.system() == 'Darwin':
             self.level_canvas.unbind('<Button-2>')
@@ -648,53 +741,376 @@ class WME(tk.Tk):
                 scroll( 1, "units" )
 
     OBJECT_MULTIPLIER = 1.25
+    # distance from the level center where particle trajectories stop, in canvas units
+    TRAJECTORY_BOUNDS = 2000
+
+    # canvas layers from bottom to top, above the level image
+    LAYERS = [
+        'child_sprite',
+        'background',
+        'foreground',
+        'selection',
+        'radius',
+        'pathLine',
+        'pathPoint',
+        'particleTrajectory',
+        'vacuum',
+        'parent',
+    ]
+
+    # overlays that can be drawn into raster layers or pooled canvas items, the ones drawn with their objects are interactive and stay on the canvas
+    RASTER_OVERLAYS = [
+        'particleTrajectory',
+        'vacuum',
+        'parent',
+    ]
+
+    ZOOM_LEVELS = [0.25, 0.35, 0.5, 0.7, 1, 1.4, 2, 2.8, 4]
+
+    def onLevelZoom(self, event: tk.Event):
+        if event.num == 4 or event.delta > 0:
+            step = 1
+        elif event.num == 5 or event.delta < 0:
+            step = -1
+        else:
+            return
 
-    def updateLayers(self):
-        objects = self.level_canvas.find_withtag('object')
-        if len(objects) < 0:
+        # the closest zoom level, in case the zoom was set to something else
+        index = min(range(len(self.ZOOM_LEVELS)), key = lambda i: abs(self.ZOOM_LEVELS[i] - self.zoom))
+        index = numpy.clip(index + step, 0, len(self.ZOOM_LEVELS) - 1)
+
+        self.setZoom(self.ZOOM_LEVELS[index], (event.x, event.y))
+
+    def setZoom(self, zoom: float, anchor: tuple[float, float] | None = None):
+        """Zoom the level canvas.
+
+        Args:
+            zoom (float): New zoom, `1` is the default size.
+            anchor (tuple[float, float] | None, optional): Window position that stays in place. Defaults to the middle of the canvas.
+        """
+        if self.level == None or zoom == self.zoom:
             return
 
-        def raise_tag(bottom, top):
-            objects = self.level_canvas.find_withtag(top)
-            if len(objects):
-                self.level_canvas.tag_raise(top, bottom)
-                return top
-            return bottom
-
-        order = [
-            'level',
-            *[f'object&&object-{obj.id}' for obj in self.level.objects],
-            'background',
-            'foreground',
-            'selection',
-            'radius',
-            'pathLine',
-            'pathPoint',
-            'particleTrajectory',
-            'vacuum',
-            'parent'
-        ]
+        if anchor is None:
+            anchor = (self.level_canvas.winfo_width() / 2, self.level_canvas.winfo_height() / 2)
+
+        anchor_pos = numpy.array((self.level_canvas.canvasx(anchor[0]), self.level_canvas.canvasy(anchor[1])))
+
+        factor = zoom / self.zoom
+        self.zoom = zoom
 
-        last_tag = order[0]
-
-        for tag in order[1::]:
-            last_tag = raise_tag(last_tag, tag)
-
-        # for obj in self.level.objects:
-        #     obj_id = f'object-{obj.id}'
-        #     last_tag = raise_tag(last_tag, f'object&&{obj_id}')
-        # 
-        # last_tag = raise_tag(last_tag, 'background')
-        # last_tag = raise_tag(last_tag, 'foreground')
-        # 
-        # for visualization_tag in self.settings.get('view', {}):
-        #     logging.debug(f'visualization tag: {visualization_tag}')
-        #     last_tag = raise_tag(last_tag, visualization_tag)
-        # 
-        # raise_tag('pathLine', 'pathPoint')
-        # 
-        # if len(self.level_canvas.find_withtag('selection')) > 0:
-        #     last_tag = raise_tag('object', 'selection')
+        # object and part items are only moved, images are replaced with ones from the cache for this zoom below
+        # overlays have parts that keep their size in pixels, like indicators and arrow heads, so they are drawn again instead
+        overlay_tags = '||'.join(self.getViewTag(overlay) for overlay in self.overlayPlugins.names(with_object = False))
+        self.level_canvas.scale(f'!({overlay_tags})' if overlay_tags else 'all', 0, 0, factor, factor)
+
+        self.updateLevelImage()
+        self.updateLevelScroll()
+
+        scrollregion = [float(value) for value in str(self.level_canvas.cget('scrollregion')).split()]
+        if len(scrollregion) == 4:
+            width = scrollregion[2] - scrollregion[0]
+            height = scrollregion[3] - scrollregion[1]
+            left, top = anchor_pos * factor - anchor
+            self.level_canvas.xview_moveto((left - scrollregion[0]) / width)
+            self.level_canvas.yview_moveto((top - scrollregion[1]) / height)
+
+        for obj in self.level.objects:
+            if self.isMaterialized(obj):
+                self.updateObject(obj)
+
+        self.updateOverlays()
+
+        self.updateSelectionRectangle()
+
+    def updateLevelImage(self):
+        """Show the level image at the current zoom."""
+        if self.level == None:
+            return
+
+        # tiles are scaled straight from the level image, instead of from the scaled up `level.image`
+        self.levelTiles.setSource(self.level._image, self.getCanvasScale())
+        self.levelTiles.update(self.getViewport())
+
+    def getViewport(self) -> tuple[float, float, float, float]:
+        """Get the part of the level canvas that is drawn, which is the visible part plus the cull margin.
+
+        Returns:
+            tuple[float, float, float, float]: (left, top, right, bottom) in canvas coordinates.
+        """
+        margin = self.settings.get('render.cull_margin', 256)
+        return (
+            self.level_canvas.canvasx(0) - margin,
+            self.level_canvas.canvasy(0) - margin,
+            self.level_canvas.canvasx(self.level_canvas.winfo_width()) + margin,
+            self.level_canvas.canvasy(self.level_canvas.winfo_height()) + margin,
+        )
+
+    def isInViewport(self, obj: wmwpy.classes.Object, viewport: tuple[float, float, float, float] | None = None) -> bool:
+        """Check if an object is close enough to the view to be drawn.
+
+        Objects that have never been drawn use the estimate from `estimateBounds`, since getting their exact size means rendering them.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+            viewport (tuple[float, float, float, float] | None, optional): Result of `getViewport`. Defaults to the current viewport.
+
+        Returns:
+            bool: Whether the object should be drawn.
+        """
+        if viewport is None:
+            viewport = self.getViewport()
+
+        rect = self.cullIndex.get(obj)
+        if rect is None:
+            self.indexCullBounds(obj)
+            rect = self.cullIndex.get(obj)
+
+        return self.rectInViewport(rect, viewport)
+
+    def rectInViewport(self, rect: tuple[float, float, float, float], viewport: tuple[float, float, float, float] | None = None) -> bool:
+        """Check if a rectangle from the cull indexes overlaps the view.
+
+        Args:
+            rect (tuple[float, float, float, float]): (left, top, right, bottom) in canvas pixels at zoom 1.
+            viewport (tuple[float, float, float, float] | None, optional): Result of `getViewport`. Defaults to the current viewport.
+
+        Returns:
+            bool: Whether the rectangle is in view.
+        """
+        if viewport is None:
+            viewport = self.getViewport()
+
+        left, top, right, bottom = numpy.array(rect) * self.zoom
+        return (
+            right >= viewport[0] and
+            bottom >= viewport[1] and
+            left <= viewport[2] and
+            top <= viewport[3]
+        )
+
+    def isOverlayInView(self, overlay: str, obj: wmwpy.classes.Object, viewport: tuple[float, float, float, float] | None = None) -> bool:
+        """Check if the overlay of an object should be drawn. It is drawn when the object is, or when what it drew last time reaches into the view.
+
+        Args:
+            overlay (str): Overlay name.
+            obj (wmwpy.classes.Object): The object.
+            viewport (tuple[float, float, float, float] | None, optional): Result of `getViewport`. Defaults to the current viewport.
+
+        Returns:
+            bool: Whether the overlay should be drawn. Overlays that were never drawn are, so their extent is known.
+        """
+        if self.isMaterialized(obj):
+            return True
+
+        rect = self.overlayCullIndex.get((overlay, obj))
+        return rect is None or self.rectInViewport(rect, viewport)
+
+    def isMaterialized(self, obj: wmwpy.classes.Object) -> bool:
+        record = self.canvasItems.get(f'object-{str(obj.id)}')
+        return record is not None and record.materialized
+
+    def isDrawn(self, obj: wmwpy.classes.Object) -> bool:
+        """Check if an object is both in view and not hidden, so its overlays should be drawn.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+
+        Returns:
+            bool: Whether the object is drawn.
+        """
+        return self.isMaterialized(obj) and self.isObjectShown(obj)
+
+    def cullObject(self, obj: wmwpy.classes.Object):
+        """Delete the canvas items of an object that is outside of the view, including its overlays.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+        """
+        record = self.canvasItems.get(f'object-{str(obj.id)}')
+        if record is None or not record.materialized:
+            return
+
+        self.level_canvas.delete(*record.popObjectItems())
+        self.materializedObjects.discard(obj)
+        self.spatialIndex.removeOwned(obj)
+        # overlays can reach further than the object, like trajectories and connections
+        viewport = self.getViewport()
+        for overlay in list(record.overlays):
+            if not self.isOverlayInView(overlay, obj, viewport):
+                self._deleteOverlay(overlay, [f'object-{str(obj.id)}'])
+        if len(record.overlays) > 0:
+            self.detachedOverlays.add(obj)
+
+    def estimateBounds(self, obj: wmwpy.classes.Object) -> tuple[float, float, float, float]:
+        """Get bounds that contain the image of an object that hasn't been drawn, without rendering it.
+
+        The image can be rotated, so this is the square around the circle that contains it in every rotation.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+
+        Returns:
+            tuple[float, float, float, float]: (left, top, right, bottom) relative to the object position, in canvas pixels at zoom 1.
+        """
+        try:
+            if not numpy.any(obj.size):
+                obj.getOffset()
+            size = numpy.hypot(*obj.size)
+            offset = numpy.hypot(*obj._offset)
+        except Exception as e:
+            logging.debug(f'Failed to get size of {obj.name}: {e}')
+            return (0, 0, 0, 0)
+
+        scale = max(float(obj.scale), self.OBJECT_MULTIPLIER * self.level.scale)
+        radius = float((size / 2 + offset) * scale)
+        return (-radius, -radius, radius, radius)
+
+    def indexCullBounds(self, obj: wmwpy.classes.Object):
+        """Update the rectangle of an object in the cull index.
+
+        Objects that have never been drawn use the estimate from `estimateBounds`.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+        """
+        x, y = numpy.array(self.getObjectPosition(obj.pos)) / self.zoom
+        record = self.canvasItems.get(f'object-{str(obj.id)}')
+        if record is not None and record.bounds is not None:
+            bounds = record.bounds
+        else:
+            bounds = self.estimateBounds(obj)
+
+        self.cullIndex.insert(obj, (
+            float(x + bounds[0]),
+            float(y + bounds[1]),
+            float(x + bounds[2]),
+            float(y + bounds[3]),
+        ))
+
+    def overlayCanvas(self, overlay: str) -> tk.Canvas | RasterLayer | CanvasItemPool:
+        """Get what an overlay is drawn on.
+
+        Args:
+            overlay (str): Overlay name.
+
+        Returns:
+            tk.Canvas | RasterLayer | CanvasItemPool: The raster layer or item pool of the overlay, or the level canvas if it has neither.
+        """
+        if overlay in self.rasterLayers:
+            return self.rasterLayers[overlay]
+        return self.overlayPools.get(overlay, self.level_canvas)
+
+    def deleteItems(self, *items: int):
+        """Delete overlay and object items, including shapes that were drawn into raster layers.
+
+        Args:
+            *items (int): Canvas item or shape ids.
+        """
+        if len(self.rasterLayers) > 0:
+            for layer in self.rasterLayers.values():
+                layer.delete(*items)
+            # shape ids are negative
+            items = [item for item in items if item > 0]
+
+        for pool in self.overlayPools.values():
+            pool.discard(*items)
+
+        self.level_canvas.delete(*items)
+
+    def onLevelViewChanged(self):
+        # scrolling calls this several times in a row, so only update once it's done
+        if self._viewport_update is None:
+            self._viewport_update = self.after_idle(self.updateViewport)
+
+    def updateViewport(self):
+        """Draw the objects that came into view, and delete the ones that left it."""
+        self._viewport_update = None
+
+        if self.level == None:
+            return
+
+        viewport = self.getViewport()
+        self.levelTiles.update(viewport)
+
+        view = tuple(value / self.zoom for value in viewport)
+        visible = set(self.cullIndex.query(view))
+        if self.selectedObject in self.objectOrder:
+            visible.add(self.selectedObject)
+
+        for obj in [obj for obj in self.materializedObjects if obj not in visible]:
+            self.cullObject(obj)
+
+        # in level order, so new objects can be stacked on the ones below them
+        for obj in sorted([obj for obj in visible if obj not in self.materializedObjects and obj in self.objectOrder], key = self.objectOrder.index):
+            self.updateObject(obj)
+            self._updateObjectOverlays(obj)
+
+        # overlays of objects outside of the view
+        for obj in list(self.detachedOverlays):
+            record = self.canvasItems.get(f'object-{str(obj.id)}')
+            if record is None or record.materialized or obj not in self.objectOrder:
+                self.detachedOverlays.discard(obj)
+                continue
+            for overlay in list(record.overlays):
+                if not self.isOverlayInView(overlay, obj, viewport):
+                    self._deleteOverlay(overlay, [f'object-{str(obj.id)}'])
+            if len(record.overlays) == 0:
+                self.detachedOverlays.discard(obj)
+
+        for overlay, obj in self.overlayCullIndex.query(view):
+            if obj in self.materializedObjects or obj not in self.objectOrder:
+                continue
+            record = self.canvasItems.get(f'object-{str(obj.id)}')
+            if record is None or overlay not in record.overlays:
+                self.updateOverlay(overlay, obj)
+
+        for layer in self.rasterLayers.values():
+            layer.flush()
+
+    def restackObject(self, obj: wmwpy.classes.Object):
+        """Move the images of an object to match its place in the level object list.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+        """
+        if self.level == None or obj not in self.objectOrder:
+            return
+
+        index = self.objectOrder.index(obj)
+        # only drawn objects have items to stack against, so there's no need to look through the whole level
+        above = sorted(
+            (other for other in self.materializedObjects if other is not obj and other in self.objectOrder and self.objectOrder.index(other) > index),
+            key = self.objectOrder.index,
+        )
+
+        def layerItems(obj: wmwpy.classes.Object, layer: str) -> list[int]:
+            record = self.canvasItems.get(f'object-{obj.id}')
+            if record is None:
+                return []
+            if layer == 'child_sprite':
+                return record.child_sprites
+            item = getattr(record, layer)
+            return [] if item is None else [item]
+
+        for layer in ['child_sprite', 'background', 'foreground']:
+            items = layerItems(obj, layer)
+            if len(items) == 0:
+                continue
+
+            # lower the object below the next object in the same layer
+            below = None
+            for other in above:
+                other_items = layerItems(other, layer)
+                if other_items:
+                    below = other_items[0]
+                    break
+
+            for item in items:
+                if below is None:
+                    self.layers.place(item, layer)
+                else:
+                    self.layers.placeBelow(item, below)
 
     SELECTION_BORDER_WIDTH = 2
 
@@ -708,35 +1124,49 @@ class WME(tk.Tk):
 
         obj_id = f'object-{str(obj.id)}'
 
-        platinum_type = obj.properties.get('PlatinumType', obj.defaultProperties.get('PlatinumType', 'none'))
-
-        if not self.settings.get(['view.PlatinumType', platinum_type], True):
+        if not self.isObjectShown(obj):
             self.level_canvas.delete('selection')
             return
 
-        pos = numpy.array(obj.pos)
+        pos = self.getObjectPosition(obj.pos, obj.offset)
         size = numpy.maximum(numpy.array(obj.size), [1,1])
         logging.debug(f'object size: {size}')
 
-        selectionImage = Image.new('RGBA', tuple(size * obj.scale), 'black')
-        selectionImageDraw = ImageDraw.Draw(selectionImage)
-        logging.debug(f'image size: {selectionImage.size}')
-        logging.debug(f'rectangle size: {(0,0) + tuple(numpy.array(selectionImage.size) - (self.SELECTION_BORDER_WIDTH - 1))}')
-        selectionImageDraw.rectangle((0,0) + tuple(numpy.array(selectionImage.size) - (self.SELECTION_BORDER_WIDTH - 1)), fill = '#0000', outline = 'black', width = self.SELECTION_BORDER_WIDTH)
-        selectionImage = obj.rotateImage(selectionImage)
-        self.selectionPhotoImage = ImageTk.PhotoImage(selectionImage)
-
-        pos = self.getObjectPosition(pos, obj.offset)
+        corners = self.getSelectionCorners(obj, pos, size).flatten()
 
-        id = self.level_canvas.find_withtag('selection')
-        if len(id) <= 0:
-            self.level_canvas.create_image(*pos, image = self.selectionPhotoImage, tags = 'selection')
+        items = self.level_canvas.find_withtag('selection')
+        if len(items) <= 0:
+            id = self.level_canvas.create_polygon(*corners, fill = '', outline = 'black', width = self.SELECTION_BORDER_WIDTH, tags = 'selection')
+            self.layers.place(id, 'selection')
         else:
-            self.level_canvas.itemconfig(id, image = self.selectionPhotoImage)
-            self.level_canvas.coords(id, *pos)
+            id = items[0]
+            self.level_canvas.coords(id, *corners)
 
         self.bindObject(id, obj)
 
+    def getSelectionCorners(self, obj: wmwpy.classes.Object, center: numpy.ndarray, size: numpy.ndarray) -> numpy.ndarray:
+        # same rectangle as the object image, rotated the same way wmwpy rotates it
+        half = (size * obj.scale * self.zoom) / 2
+        corners = numpy.array([
+            [-half[0], -half[1]],
+            [half[0], -half[1]],
+            [half[0], half[1]],
+            [-half[0], half[1]],
+        ])
+
+        try:
+            angle = numpy.radians(float(obj.properties.get('Angle', 0)))
+        except (TypeError, ValueError):
+            angle = 0
+
+        if angle != 0:
+            # the canvas y axis points down, so a counter-clockwise rotation flips the sign of sin
+            cos_a = numpy.cos(angle)
+            sin_a = numpy.sin(angle)
+            corners = corners @ numpy.array([[cos_a, -sin_a], [sin_a, cos_a]])
+
+        return corners + center
+
     def getObjectPosition(self, pos = (0,0), offset  = (0,0)):
         pos = numpy.array(pos)
         offset = numpy.array(offset)
@@ -748,9 +1178,17 @@ class WME(tk.Tk):
 
     def toLevelCanvasCoord(self, pos: int | float | numpy.ndarray, multiplier: float | int = OBJECT_MULTIPLIER) -> float | numpy.ndarray:
         if isinstance(pos, (int,float)):
-            return (pos * multiplier) * self.level.scale
+            return (pos * multiplier) * self.getCanvasScale()
         else:
-            return (pos * numpy.array([multiplier, -multiplier])) * self.level.scale
+            return (pos * numpy.array([multiplier, -multiplier])) * self.getCanvasScale()
+
+    def getCanvasScale(self) -> float:
+        """Get the amount of canvas pixels per level unit, without the object multiplier.
+
+        Returns:
+            float: Level scale times zoom.
+        """
+        return self.level.scale * self.zoom
 
     def updateObject(self, obj : wmwpy.classes.Object | None):
         if obj == None:
@@ -758,6 +1196,31 @@ class WME(tk.Tk):
             self.updateLevelScroll()
             return
 
+        self.levelBounds.update(obj)
+        self.indexCullBounds(obj)
+
+        if obj != self.selectedObject and not self.isInViewport(obj):
+            self.cullObject(obj)
+            return
+
+        id = f'object-{str(obj.id)}'
+
+        platinum_type = self.getPlatinumType(obj)
+        platinum_tag = self.getViewTag(f'PlatinumType.{platinum_type}')
+
+        if not self.isObjectShown(obj):
+            # hidden objects are drawn again when their group is shown
+            record = self.canvasItems.record(id)
+            self.level_canvas.delete(*record.popObjectItems())
+            self.spatialIndex.remove(obj)
+            self.spatialIndex.removeOwned(obj)
+            for overlay in list(record.overlays):
+                self.deleteItems(*record.popOverlay(overlay))
+            record.materialized = True
+            self.materializedObjects.add(obj)
+            self.markStaleView(f'PlatinumType.{platinum_type}', [obj])
+            return
+
         try:
             offset = numpy.array(obj.offset)
         except Exception as e:
@@ -767,55 +1230,67 @@ class WME(tk.Tk):
         canvas_pos = self.getObjectPosition(canvas_pos, offset)
         true_pos = self.getObjectPosition(obj.pos)
 
-        id = f'object-{str(obj.id)}'
-
-        platinum_type = obj.properties.get('PlatinumType', obj.defaultProperties.get('PlatinumType', 'none'))
-
-        if not self.settings.get(['view.PlatinumType', platinum_type], True):
-            self.level_canvas.delete(id)
-            return
-
-        items = self.level_canvas.find_withtag(id)
-
-        logging.debug(f'items: {items}')
-
-        background = None
-        foreground = None
-
-        for item in items:
-            tags = self.level_canvas.gettags(item)
-            logging.debug(f'tags: {tags}')
-            if 'background' in tags:
-                background = item
-            elif 'foreground' in tags:
-                foreground = item
-
-        self.level_canvas.delete(f'radius&&{id}')
-        self.level_canvas.delete(f'path&&{id}')
-        self.level_canvas.delete(f'child_sprite&&{id}')
+        record = self.canvasItems.record(id)
+
+        background = record.background
+        foreground = record.foreground
+        is_new = background is None and foreground is None
+
+        self.spatialIndex.removeOwned(obj)
+        # path items are reused by part, the ones that aren't are deleted after the path is drawn
+        old_path = record.path
+        record.path = {}
+        # child sprite items are reused in order, the ones that aren't are deleted after the child sprites are drawn
+        old_child_sprites = record.child_sprites
+        record.child_sprites = []
+        added_child_sprites = False
+
+        object_class = self.objectClasses.get(obj)
+        properties_key = imagecache.properties_key(obj.properties, object_class.image_properties, object_class.image_prefixes)
+
+        def objectImage(layer: typing.Literal['background', 'foreground']) -> ImageTk.PhotoImage:
+            # the object image is rotated by wmwpy, so the angle is part of the properties instead
+            record.images[layer] = self.imageCache.get(
+                obj,
+                (layer, self.objectClasses.key(obj), properties_key),
+                0,
+                (obj.scale, self.zoom),
+                lambda angle: imagecache.scale_image(getattr(obj, layer), self.zoom),
+                quantize = False,
+            )
+            return record.images[layer]
 
-        if len(items) > 0:
+        if not is_new:
+            # the PlatinumType can change, so the tags are set again
             if background:
                 self.level_canvas.coords(background, canvas_pos[0], canvas_pos[1])
-                self.level_canvas.itemconfig(background, image = obj.background_PhotoImage)
+                self.level_canvas.itemconfig(background, image = objectImage('background'), tags = ('object', 'background', platinum_tag, id))
 
             if foreground:
                 self.level_canvas.coords(foreground, canvas_pos[0], canvas_pos[1])
-                self.level_canvas.itemconfig(foreground, image = obj.foreground_PhotoImage)
+                self.level_canvas.itemconfig(foreground, image = objectImage('foreground'), tags = ('object', 'foreground', platinum_tag, id))
         else:
             if len(obj._background) > 0:
-                self.level_canvas.create_image(canvas_pos[0], canvas_pos[1], anchor = 'c', image = obj.background_PhotoImage, tags = ('object', 'background', id))
+                background = self.level_canvas.create_image(canvas_pos[0], canvas_pos[1], anchor = 'c', image = objectImage('background'), tags = ('object', 'background', platinum_tag, id))
+                self.layers.place(background, 'background')
+                record.background = background
 
             if len(obj._foreground) > 0:
                 try:
-                    self.level_canvas.create_image(canvas_pos[0], canvas_pos[1], anchor = 'c', image = obj.foreground_PhotoImage, tags = ('object', 'foreground', id))
+                    foreground = self.level_canvas.create_image(canvas_pos[0], canvas_pos[1], anchor = 'c', image = objectImage('foreground'), tags = ('object', 'foreground', platinum_tag, id))
+                    self.layers.place(foreground, 'foreground')
+                    record.foreground = foreground
                 except Exception as e:
                     logging.warning(f'Failed to create foreground image for {obj.name}: {e}')
                     pass
 
             if len(obj._foreground) == 0 and len(obj._background) == 0:
-                self.level_canvas.create_image(canvas_pos[0], canvas_pos[1], anchor = 'c', image = ImageTk.PhotoImage(Image.new('RGBA', (1, 1), 'black')), tags = ('object', 'foreground', id))
+                record.images['foreground'] = ImageTk.PhotoImage(Image.new('RGBA', (1, 1), 'black'))
+                foreground = self.level_canvas.create_image(canvas_pos[0], canvas_pos[1], anchor = 'c', image = record.images['foreground'], tags = ('object', 'foreground', platinum_tag, id))
+                self.layers.place(foreground, 'foreground')
+                record.foreground = foreground
 
+        record.child_sprite_images = []
         if hasattr(obj, '_child_sprites') and len(obj._child_sprites) > 0:
             for sprite in obj._child_sprites:
                 try:
@@ -834,79 +1309,67 @@ class WME(tk.Tk):
 
                     sprite_canvas_pos = self.getObjectPosition(obj.pos + sprite_pos, offset)
 
-                    sprite_image = sprite.image
-                    if obj_angle != 0:
-                        sprite_image = sprite_image.rotate(obj_angle, resample = Image.BILINEAR)
-
-                    sprite_photoimage = ImageTk.PhotoImage(sprite_image)
+                    sprite_photoimage = self.imageCache.get(
+                        obj,
+                        sprite,
+                        obj_angle,
+                        (sprite.scale, self.zoom),
+                        lambda angle, sprite = sprite: imagecache.scale_image(sprite.image, self.zoom).rotate(angle, resample = Image.BILINEAR) if angle != 0 else imagecache.scale_image(sprite.image, self.zoom),
+                    )
 
-                    self.level_canvas.create_image(sprite_canvas_pos[0], sprite_canvas_pos[1], anchor = 'c', image = sprite_photoimage, tags = ('object', 'child_sprite', id))
+                    sprite_tags = ('object', 'child_sprite', platinum_tag, id)
+                    if len(old_child_sprites) > 0:
+                        sprite_id = old_child_sprites.pop(0)
+                        self.level_canvas.coords(sprite_id, sprite_canvas_pos[0], sprite_canvas_pos[1])
+                        self.level_canvas.itemconfig(sprite_id, image = sprite_photoimage, tags = sprite_tags)
+                    else:
+                        sprite_id = self.level_canvas.create_image(sprite_canvas_pos[0], sprite_canvas_pos[1], anchor = 'c', image = sprite_photoimage, tags = sprite_tags)
+                        self.layers.place(sprite_id, 'child_sprite')
+                        added_child_sprites = True
 
-                    if not hasattr(obj, '_child_sprite_photoimages'):
-                        obj._child_sprite_photoimages = []
-                    obj._child_sprite_photoimages.append(sprite_photoimage)
+                    record.child_sprites.append(sprite_id)
+                    record.child_sprite_images.append(sprite_photoimage)
 
                 except Exception as e:
                     logging.warning(f'Failed to create child sprite for {obj.name}: {e}')
 
-        if (obj == self.selectedObject or self.settings.get('view.radius', True)) and obj.Type is not None:
-            properties = filter(lambda name : obj.Type.PROPERTIES[name].get('type', 'string') == 'radius', obj.Type.PROPERTIES)
-
-            for property in properties:
-                props = obj.Type.get_properties(property)
-                for name, radius in props.items():
-                    logging.debug(f'radius: {radius}')
-                    radius_canvas_size = self.toLevelCanvasCoord(radius)
-                    if radius_canvas_size > 0:
-                        r_id = self.level_canvas.create_circle(true_pos[0], true_pos[1], radius_canvas_size, fill = '', outline = 'red', width = self.OBJECT_MULTIPLIER, tags = ('passthrough', 'part', 'radius', property, id))
-
-                        logging.debug(f'radius tags: {self.level_canvas.gettags(r_id)}')
+        if len(old_child_sprites) > 0:
+            self.level_canvas.delete(*old_child_sprites)
+
+        # new images are on top of their layer, which is only right for the last object
+        restack = (is_new and not self._drawingLevel) or (added_child_sprites and not is_new)
+        if restack and self.level.objects and self.level.objects[-1] is not obj:
+            self.restackObject(obj)
+
+        record.materialized = True
+        self.materializedObjects.add(obj)
+        image_items = record.objectItems()
+        bbox = self.level_canvas.bbox(*image_items) if len(image_items) > 0 else None
+        if bbox:
+            record.bounds = tuple((numpy.array(bbox) - numpy.tile(true_pos, 2)) / self.zoom)
+            self.spatialIndex.insert(obj, tuple(float(value) for value in numpy.array(bbox) / self.zoom))
+            self.indexCullBounds(obj)
+
+        if not (obj == self.selectedObject or self.settings.get('view.radius', True)):
+            self.level_canvas.delete(*record.radius)
+            record.radius = []
+            self.markStaleView('radius', [obj])
+        else:
+            self._drawRadius(obj, self.overlayPlugins.result('radius', obj), true_pos, platinum_tag, id)
 
         is_selected = obj == self.selectedObject
         view_path = self.settings.get('view.path', True)
-        has_type = obj.Type is not None
 
-        # logging.debug(f'Path drawing conditions for {obj.name}: selected={is_selected}, view.path={view_path}, has_type={has_type}')
-
-        if (is_selected or view_path) and has_type:
-            path_points = obj.Type.get_properties('PathPos#')
-            logging.debug(f'path_points: {path_points}')
-            if isinstance(path_points, dict) and len(path_points) > 0:
-                self._drawPathPosPoints(obj, path_points, canvas_pos, id)
-
-            try:
-                path_points_data = obj.Type.get_property('PathPoints')
-                logging.debug(f'PathPoints property value: {path_points_data}')
-
-                if path_points_data:
-                    if isinstance(path_points_data, str):
-                        path_points_str = path_points_data
-                    elif isinstance(path_points_data, list):
-                        points = []
-                        for point in path_points_data:
-                            if isinstance(point, (list, tuple)) and len(point) >= 2:
-                                points.append(f'{float(point[0]):.4f} {float(point[1]):.4f}')
-                        path_points_str = ','.join(points)
-                    else:
-                        logging.debug(f'PathPoints has unexpected format: {type(path_points_data)}')
-                        return
+        if not (is_selected or view_path):
+            self.markStaleView('path', [obj])
+        else:
+            self._drawPath(obj, self.overlayPlugins.result('path', obj), old_path, id)
 
-                    if path_points_str and path_points_str.strip():
-                        logging.debug(f'Calling _drawPathPoints for {obj.name} with: {path_points_str}')
-                        self._drawPathPoints(obj, path_points_str, canvas_pos, id)
-                    else:
-                        logging.debug(f'PathPoints is empty or None for {obj.name}')
-                else:
-                    logging.debug(f'PathPoints is None for {obj.name}')
-            except AttributeError as e:
-                logging.debug(f'PathPoints property not found for {obj.name}: {e}')
-                pass
+        self.level_canvas.delete(*old_path.values())
 
         # logging.info(f"id: {id}")
         # logging.info(f"pos: {pos}\n")
 
-        self.updateLayers()
-
         self.bindObject(f'object&&{id}', obj)
 
         if obj == self.selectedObject:
@@ -916,195 +1379,335 @@ class WME(tk.Tk):
         # self._updateParticleTrajectories(obj)
         # self._updateVacuum()
 
-    def _updateParticleTrajectories(self, specific_obj=None):
-        trajectory_enabled = self.settings.get('view.particleTrajectory', False)
-        self.level_canvas.delete('particleTrajectory')
-        self.level_canvas.delete('offsetVariation')
-        self.level_canvas.delete('angleVariation')
-        self.level_canvas.delete('particleVariation')
-        self.level_canvas.delete('particleOffset')
-        if trajectory_enabled:
-            objects_to_check = self.level.objects
-
-            for obj in objects_to_check:
-                if hasattr(obj, 'defaultProperties') and obj.defaultProperties:
-                    if obj.defaultProperties.get('TemperatureType') == 'cold' or 'icicle' in obj.defaultProperties.get('ObjectType', '').lower():
-                        continue
+    def registerOverlays(self):
+        """Register the overlays that are drawn for level objects, with the properties they are drawn from."""
+        self.overlayPlugins.register(OverlayPlugin(
+            'radius',
+            compute = self._computeRadius,
+            draw = self._drawRadius,
+            properties = lambda obj: self.objectClasses.get(obj).radius_properties,
+            with_object = True,
+        ))
+        self.overlayPlugins.register(OverlayPlugin(
+            'path',
+            # PathProperties are already cached, and edited while points are dragged
+            compute = lambda obj: self.propertyRecords.get(obj, propertyrecords.PathProperties),
+            draw = self._drawPath,
+            properties = ('PathPoints', 'PathIsGlobal', 'PathIsClosed'),
+            prefixes = ('PathPos',),
+            cached = False,
+            with_object = True,
+        ))
+        self.overlayPlugins.register(OverlayPlugin(
+            'particleTrajectory',
+            snapshot = self._snapshotParticleTrajectory,
+            compute = self._computeParticleTrajectory,
+            draw = self._drawParticleTrajectory,
+            properties = ('ParticleSpeed', 'Angle', 'ExpulsionAngle', 'FluidType', 'OffsetVariation', 'ExpulsionAngleVariation', 'ParticleVariation', 'ParticleOffset', 'OffsetToMouth'),
+            objects = lambda: self.objectClasses.objects('spout'),
+            applies = lambda obj: self.objectClasses.get(obj).is_spout,
+            # the trajectory is clipped to the level, so it depends on where the spout is
+            key = lambda obj: tuple(obj.pos),
+            view_default = False,
+        ))
+        self.overlayPlugins.register(OverlayPlugin(
+            'vacuum',
+            snapshot = self._snapshotVacuum,
+            compute = self._computeVacuum,
+            draw = self._drawDrainVisualizations,
+            properties = ('SpoutType', 'FanType', 'Angle', 'AngleVariation', 'VacuumBaseAngle', 'VacuumMinAngle', 'VacuumMaxAngle', 'VacuumForce', 'VacuumMaxForce', 'VacuumMaxD', 'VacuumFriction', 'VacuumCenterOffsetA', 'VacuumCenterOffsetB'),
+            objects = lambda: self.objectClasses.objects('vacuum'),
+            applies = self.objectClasses.hasVacuumForce,
+            # the image is rendered for one zoom
+            key = lambda obj: self.zoom,
+            view_default = False,
+        ))
+        self.overlayPlugins.register(OverlayPlugin(
+            'parent',
+            # connections are found by name, and names can change on other objects
+            compute = self._computeParentConnections,
+            draw = self._drawParentConnections,
+            properties = ('Parent',),
+            prefixes = ('ConnectedSpout', 'ConnectedObject', 'ConnectedConverter'),
+            objects = lambda: self.level.objects,
+            # edges are replaced when a connection is drawn, and removed when its properties change or the object is deleted
+            related = self._getParentConnectionOwners,
+            cached = False,
+        ))
+
+    def _onOverlayResult(self, overlay: str, obj: wmwpy.classes.Object):
+        # a result from the worker is ready
+        if self.level != None and obj in self.objectOrder:
+            self.updateOverlay(overlay, obj)
+
+    def _flushRender(self, dirty: dict[wmwpy.classes.Object, set[str]]):
+        if self.level == None:
+            return
 
-                is_spout = False
-                if hasattr(obj, 'defaultProperties') and obj.defaultProperties:
-                    spout_indicators = ['ParticleSpeed', 'Angle', 'ExpulsionAngle', 'FluidType', 'OffsetToMouth']
-                    for prop in spout_indicators:
-                        if prop in obj.defaultProperties:
-                            is_spout = True
-                            break
-
-                if is_spout:
-                    canvas_pos = self.getObjectPosition(obj.pos, obj.offset)
-                    obj_id = f'object-{str(obj.id)}'
-                    self._drawParticleTrajectory(obj, canvas_pos, obj_id)
-
-    def _updateVacuum(self):
-        vacuum_enabled = self.settings.get('view.vacuum', False)
-        self.level_canvas.delete('drainAngleVariation')
-        self.level_canvas.delete('vacuumWindField')
-        self.level_canvas.delete('vacuumForces')
-        self.level_canvas.delete('vacuumFriction')
-        if vacuum_enabled:
-            for obj in self.level.objects:
-                has_vacuum_force = (obj.properties and 'VacuumForce' in obj.properties) or (obj.Type and 'VacuumForce' in obj.Type.PROPERTIES)
-                if has_vacuum_force:
-                    canvas_pos = self.getObjectPosition(obj.pos, obj.offset)
-                    obj_id = f'object-{str(obj.id)}'
-                    self._drawDrainVisualizations(obj, canvas_pos, obj_id)
+        for obj, overlays in dirty.items():
+            if obj not in self.objectOrder:
+                continue
 
-    def _drawParticleTrajectory(self, obj, canvas_pos, id):
-        try:
-            properties = dict(obj.properties) if obj.properties else {}
-            if hasattr(obj, 'defaultProperties') and obj.defaultProperties:
-                for prop_name, prop_value in obj.defaultProperties.items():
-                    if prop_name not in properties:
-                        properties[prop_name] = prop_value
-
-            particle_speed = None
-            if 'ParticleSpeed' in properties:
-                particle_speed = float(properties.get('ParticleSpeed', 1))
-            elif obj.Type and 'ParticleSpeed' in obj.Type.PROPERTIES:
-                default_prop = obj.Type.PROPERTIES['ParticleSpeed']
-                if 'default' in default_prop:
-                    particle_speed = float(default_prop['default'])
-
-            if particle_speed is None:
-                return
+            self.updateObject(obj)
+            for overlay in overlays:
+                self.updateOverlay(overlay, obj)
+
+    def _updateObjectOverlays(self, obj: wmwpy.classes.Object):
+        # only redraw the overlays that depend on this object, everything else stays on the canvas
+        for overlay in self.overlayPlugins.names(with_object = False):
+            self.updateOverlay(overlay, obj)
+
+    def updateOverlays(self):
+        """Redraw every overlay that isn't drawn with the objects. Results that are still valid are reused."""
+        for overlay in self.overlayPlugins.names(with_object = False):
+            self.updateOverlay(overlay)
+
+    def updateOverlay(self, overlay: str, specific_obj: wmwpy.classes.Object | None = None):
+        """Redraw an overlay.
+
+        Args:
+            overlay (str): Overlay name.
+            specific_obj (wmwpy.classes.Object | None, optional): Only redraw the overlay of this object, and of the objects related to it. Defaults to every object.
+        """
+        plugin = self.overlayPlugins.get(overlay)
+        enabled = self.settings.get(f'view.{overlay}', plugin.view_default)
+
+        if specific_obj is not None:
+            owners = list(plugin.related(specific_obj)) if plugin.related is not None else [specific_obj]
+            ids = [f'object-{str(obj.id)}' for obj in owners]
+            self._deleteOverlay(overlay, ids)
+            objects_to_check = [obj for obj in owners if obj in self.objectOrder and (plugin.applies is None or plugin.applies(obj))]
+        else:
+            self._deleteOverlay(overlay)
+            if plugin.reset is not None:
+                plugin.reset()
+            objects_to_check = list(plugin.objects())
 
-            spout_pos = numpy.array(obj.pos)
+        if not enabled:
+            self.markStaleView(overlay, objects_to_check)
+            return
 
-            spout_angle = float(properties.get('Angle', 0))
-            expulsion_angle = float(properties.get('ExpulsionAngle', 0))
-            total_angle = spout_angle + expulsion_angle
+        viewport = self.getViewport()
+        for obj in objects_to_check:
+            if not self.isObjectShown(obj) or not self.isOverlayInView(overlay, obj, viewport):
+                continue
 
-            fluid_type = properties.get('FluidType', 'water').lower()
-            trajectory_color = self._getFluidTypeColor(fluid_type)
+            try:
+                result = self.overlayPlugins.result(overlay, obj)
+                if result is None:
+                    continue
 
-            offset_variation = float(properties.get('OffsetVariation', 0))
-            angle_variation = float(properties.get('ExpulsionAngleVariation', 0))
-            particle_variation = float(properties.get('ParticleVariation', 0))
-            particle_offset = properties.get('ParticleOffset', '0 0')
+                canvas_pos = self.getObjectPosition(obj.pos, obj.offset)
+                plugin.draw(obj, result, canvas_pos, f'object-{str(obj.id)}')
+            except Exception as e:
+                logging.debug(f'Failed to draw {overlay} for {obj.name}: {e}')
 
-            offset_to_mouth = properties.get('OffsetToMouth', None)
+            self._indexOverlay(overlay, obj, viewport)
 
-            if offset_to_mouth is None and hasattr(obj, 'filename') and obj.filename:
-                hs_filename = obj.filename
-                if hs_filename.startswith(':game:'):
-                    hs_filename = hs_filename[6:]
+        if overlay in self.overlayPools:
+            self.overlayPools[overlay].hideReleased()
 
-                hs_files_to_check = [
-                    'shower_head.hs',
-                    f'touch_spout_{obj.name}.hs' if obj.name else None
-                ]
+        if specific_obj is not None:
+            self._placeOverlay(overlay, ids)
+        else:
+            self.layers.place(self.getViewTag(overlay), overlay)
 
-                if hs_filename and hs_filename.startswith('/'):
-                    hs_files_to_check.append(hs_filename[1:])
+    def _indexOverlay(self, overlay: str, obj: wmwpy.classes.Object, viewport: tuple[float, float, float, float]):
+        """Remember what the overlay of an object drew, and delete it again if it's outside of the view.
 
-                for hs_file in hs_files_to_check:
-                    if hs_file is None:
-                        continue
+        Args:
+            overlay (str): Overlay name.
+            obj (wmwpy.classes.Object): The object.
+            viewport (tuple[float, float, float, float]): Result of `getViewport`.
+        """
+        id = f'object-{str(obj.id)}'
+        record = self.canvasItems.get(id)
+        items = [] if record is None else record.overlays.get(overlay, [])
 
-                    if '/' in hs_file and hs_file.endswith('.hs'):
-                        hs_path = wmwpy.utils.path.joinPath(self.game.gamepath, self.game.assets, hs_file)
-                    else:
-                        hs_path = wmwpy.utils.path.joinPath(self.game.gamepath, self.game.assets, self.game.baseassets, 'Objects', hs_file)
-
-                    if os.path.exists(hs_path):
-                        try:
-                            with open(hs_path, 'r') as f:
-                                content = f.read()
-                            import xml.etree.ElementTree as ET
-                            root = ET.fromstring(content)
-                            if offset_to_mouth is None:
-                                for prop in root.findall('.//Property[@name="OffsetToMouth"]'):
-                                    value = prop.get('value')
-                                    if value:
-                                        offset_to_mouth = value
-                                        break
-                            if offset_to_mouth:
-                                break
-                        except Exception as e:
-                            pass
-
-            if offset_to_mouth is None:
-                offset_to_mouth = '0 0'
-
-            spout_true_pos = self.getObjectPosition(spout_pos, obj.offset)
-
-            # canvas_offset_x = offset_x * self.OBJECT_MULTIPLIER * self.level.scale
-            # canvas_offset_y = offset_y * self.OBJECT_MULTIPLIER * self.level.scale
-
-            particle_origin_canvas = spout_true_pos
-
-            particle_origin_x = (particle_origin_canvas[0] / self.level.scale) / self.OBJECT_MULTIPLIER
-            particle_origin_y = -(particle_origin_canvas[1] / self.level.scale) / self.OBJECT_MULTIPLIER
-            particle_origin = numpy.array([particle_origin_x, particle_origin_y])
-
-            angle_rad = numpy.radians(total_angle)
-
-            vx = particle_speed * numpy.cos(angle_rad)
-            vy = particle_speed * numpy.sin(angle_rad)
-
-            gravity = 9.8
-
-            trajectory_points = []
-            time_step = 0.05
-            t = 0
-            max_iterations = 100
-
-            while t < max_iterations:
-                x = particle_origin[0] + vx * t
-                if fluid_type == 'steam':
-                    y = particle_origin[1] + vy * t + 0.5 * gravity * t**2
-                else:
-                    y = particle_origin[1] + vy * t - 0.5 * gravity * t**2
+        bbox = self.overlayBounds(overlay, items)
+        if bbox is None:
+            self.overlayCullIndex.remove((overlay, obj))
+            return
 
-                canvas_x = (x * self.OBJECT_MULTIPLIER) * self.level.scale
-                canvas_y = (y * -self.OBJECT_MULTIPLIER) * self.level.scale
+        rect = tuple(float(value) for value in numpy.array(bbox) / self.zoom)
+        self.overlayCullIndex.insert((overlay, obj), rect, owner = obj)
 
-                if (abs(canvas_x) <= 2000 and abs(canvas_y) <= 2000):
-                    trajectory_points.append((canvas_x, canvas_y))
-                else:
-                    break
+        if not record.materialized:
+            if self.rectInViewport(rect, viewport):
+                self.detachedOverlays.add(obj)
+            else:
+                self._deleteOverlay(overlay, [id])
 
-                t += time_step
+    def overlayBounds(self, overlay: str, items: typing.Iterable[int]) -> tuple[float, float, float, float] | None:
+        """Get the bounds of overlay items, including shapes that were drawn into raster layers.
 
-            if len(trajectory_points) > 1:
-                for i in range(len(trajectory_points) - 1):
-                    x1, y1 = trajectory_points[i]
-                    x2, y2 = trajectory_points[i + 1]
+        Args:
+            overlay (str): Overlay name.
+            items (Iterable[int]): Canvas item or shape ids.
 
-                    self.level_canvas.create_line(x1, y1, x2, y2, fill=trajectory_color, width=2, tags=('passthrough', 'part', 'particleTrajectory', f'particleTrajectory&&{id}'))
+        Returns:
+            tuple[float, float, float, float] | None: (left, top, right, bottom) in canvas coordinates, or None if nothing was drawn.
+        """
+        items = list(items)
+        if len(items) == 0:
+            return None
 
-                if offset_variation > 0:
-                    self._drawOffsetVariationArrow(obj, particle_origin_canvas, offset_variation, id)
-                if angle_variation > 0:
-                    self._drawAngleVariationArrow(obj, particle_origin_canvas, total_angle, angle_variation, id)
-                if particle_variation > 0:
-                    self._drawParticleVariationIndicator(obj, particle_origin_canvas, particle_variation, id)
-                if particle_offset != '0 0':
-                    self._drawParticleOffsetIndicator(obj, particle_origin_canvas, particle_offset, id)
-        except Exception as e:
-            pass
+        if overlay in self.rasterLayers:
+            return self.rasterLayers[overlay].bbox(*items)
+        return self.level_canvas.bbox(*items)
+
+    def _deleteOverlay(self, overlay: str, ids: typing.Iterable[str] | None = None):
+        """Delete the canvas items of an overlay. Pooled items are released instead, so the redraw that follows can reuse them.
+
+        Args:
+            overlay (str): Overlay name.
+            ids (Iterable[str] | None, optional): Canvas tags of the objects whose overlay items to delete. Defaults to every object.
+        """
+        if ids is None:
+            items = self.canvasItems.popOverlay(overlay)
+        else:
+            items = []
+            for id in ids:
+                record = self.canvasItems.get(id)
+                if record is not None:
+                    items.extend(record.popOverlay(overlay))
+
+        pool = self.overlayPools.get(overlay)
+        if pool is not None:
+            items = pool.release(*items)
+
+        self.deleteItems(*items)
+
+    def _placeOverlay(self, overlay: str, ids: typing.Iterable[str]):
+        if overlay in self.rasterLayers:
+            return
+
+        for id in ids:
+            record = self.canvasItems.get(id)
+            if record is None:
+                continue
+            for item in record.overlays.get(overlay, []):
+                self.layers.place(item, overlay)
+
+    def _snapshotParticleTrajectory(self, obj: wmwpy.classes.Object) -> tuple[propertyrecords.SpoutProperties, tuple[float, float], float, float] | None:
+        """Get what is needed to simulate the particle trajectory of a spout, so it can be done in a worker thread.
+
+        Args:
+            obj (wmwpy.classes.Object): The spout.
+
+        Returns:
+            tuple[propertyrecords.SpoutProperties, tuple[float, float], float, float] | None: The spout properties, particle origin in level units, clipping bounds and gravity, or None if there's nothing to draw.
+        """
+        spout = self.propertyRecords.get(obj, propertyrecords.SpoutProperties, self._getOffsetToMouth)
+
+        if spout.particle_speed is None:
+            return None
+
+        particle_origin_canvas = self.getObjectPosition(obj.pos, obj.offset)
+
+        particle_origin_x = (particle_origin_canvas[0] / self.getCanvasScale()) / self.OBJECT_MULTIPLIER
+        particle_origin_y = -(particle_origin_canvas[1] / self.getCanvasScale()) / self.OBJECT_MULTIPLIER
+
+        # the trajectory is clipped to the area around the level
+        bounds = self.windowPosToWMWPos(self.TRAJECTORY_BOUNDS) * self.zoom
+        gravity = -trajectory.GRAVITY if spout.fluid_type == 'steam' else trajectory.GRAVITY
+
+        return spout, (float(particle_origin_x), float(particle_origin_y)), float(bounds), gravity
+
+    def _computeParticleTrajectory(self, snapshot: tuple[propertyrecords.SpoutProperties, tuple[float, float], float, float]) -> tuple[propertyrecords.SpoutProperties, tuple[float, float], numpy.ndarray] | None:
+        """Simulate the particle trajectory of a spout. This runs in a worker thread, so it only uses the snapshot.
+
+        Args:
+            snapshot (tuple[propertyrecords.SpoutProperties, tuple[float, float], float, float]): From `_snapshotParticleTrajectory`.
+
+        Returns:
+            tuple[propertyrecords.SpoutProperties, tuple[float, float], numpy.ndarray] | None: The spout properties, particle origin and trajectory points in level units, or None if there's nothing to draw.
+        """
+        spout, particle_origin, bounds, gravity = snapshot
+
+        trajectory_points = trajectory.particle_trajectory(
+            numpy.array(particle_origin),
+            spout.particle_speed,
+            spout.angle + spout.expulsion_angle,
+            gravity = gravity,
+            bounds = (-bounds, -bounds, bounds, bounds),
+        )
+
+        if len(trajectory_points) < 2:
+            return None
+
+        return spout, particle_origin, trajectory_points
+
+    def _drawParticleTrajectory(self, obj, result, canvas_pos, id):
+        spout, particle_origin, trajectory_points = result
+
+        total_angle = spout.angle + spout.expulsion_angle
+        trajectory_color = self._getFluidTypeColor(spout.fluid_type)
+
+        particle_origin_canvas = canvas_pos
+
+        # while the spout is dragged, the previous trajectory is drawn until the new one is ready, so it's moved along with the spout
+        trajectory_points = self.toLevelCanvasCoord(trajectory_points)
+        trajectory_points = trajectory_points + (numpy.array(canvas_pos) - self.toLevelCanvasCoord(numpy.array(particle_origin)))
+        self.canvasItems.addOverlayItem(id, 'particleTrajectory', self.overlayCanvas('particleTrajectory').create_line(*trajectory_points.flatten(), fill=trajectory_color, width=2, tags=('passthrough', 'part', 'particleTrajectory', 'view-particleTrajectory', f'particleTrajectory-{id}')))
+
+        if spout.offset_variation > 0:
+            self._drawOffsetVariationArrow(obj, particle_origin_canvas, spout.offset_variation, id)
+        if spout.angle_variation > 0:
+            self._drawAngleVariationArrow(obj, particle_origin_canvas, total_angle, spout.angle_variation, id)
+        if spout.particle_variation > 0:
+            self._drawParticleVariationIndicator(obj, particle_origin_canvas, spout.particle_variation, id)
+        if any(spout.particle_offset):
+            self._drawParticleOffsetIndicator(obj, particle_origin_canvas, spout.particle_offset, id)
+
+    def _getOffsetToMouth(self, obj) -> str | None:
+        for hs_path in self._getSpoutHSPaths(obj):
+            offset_to_mouth = self.hsProperties.getProperty(hs_path, 'OffsetToMouth')
+            if offset_to_mouth:
+                return offset_to_mouth
+        return None
+
+    def _getSpoutHSPaths(self, obj) -> list[str]:
+        if not (hasattr(obj, 'filename') and obj.filename):
+            return []
+
+        hs_filename = obj.filename
+        if hs_filename.startswith(':game:'):
+            hs_filename = hs_filename[6:]
+
+        hs_files_to_check = [
+            'shower_head.hs',
+            f'touch_spout_{obj.name}.hs' if obj.name else None
+        ]
+
+        if hs_filename and hs_filename.startswith('/'):
+            hs_files_to_check.append(hs_filename[1:])
+
+        hs_paths = []
+
+        for hs_file in hs_files_to_check:
+            if hs_file is None:
+                continue
+
+            if '/' in hs_file and hs_file.endswith('.hs'):
+                hs_paths.append(wmwpy.utils.path.joinPath(self.game.gamepath, self.game.assets, hs_file))
+            else:
+                hs_paths.append(wmwpy.utils.path.joinPath(self.game.gamepath, self.game.assets, self.game.baseassets, 'Objects', hs_file))
+
+        return hs_paths
 
     def _drawOffsetVariationArrow(self, obj, origin, variation, id):
         radius = variation * 10
         if radius < 5:
             radius = 5
 
-        self.level_canvas.create_circle(origin[0], origin[1], radius, fill='', outline='black', width=2, tags=('passthrough', 'part', 'offsetVariation', f'offsetVariation&&{id}'))
+        self.canvasItems.addOverlayItem(id, 'particleTrajectory', self.overlayCanvas('particleTrajectory').create_circle(origin[0], origin[1], radius, fill='', outline='black', width=2, tags=('passthrough', 'part', 'offsetVariation', 'view-particleTrajectory', f'particleTrajectory-{id}')))
 
         cross_size = radius * 0.7
-        self.level_canvas.create_line(origin[0] - cross_size, origin[1], origin[0] + cross_size, origin[1], fill='black', width=1, tags=('passthrough', 'part', 'offsetVariation', f'offsetVariation&&{id}'))
-        self.level_canvas.create_line(origin[0], origin[1] - cross_size, origin[0], origin[1] + cross_size, fill='black', width=1, tags=('passthrough', 'part', 'offsetVariation', f'offsetVariation&&{id}'))
+        self.canvasItems.addOverlayItem(id, 'particleTrajectory', self.overlayCanvas('particleTrajectory').create_line(origin[0] - cross_size, origin[1], origin[0] + cross_size, origin[1], fill='black', width=1, tags=('passthrough', 'part', 'offsetVariation', 'view-particleTrajectory', f'particleTrajectory-{id}')))
+        self.canvasItems.addOverlayItem(id, 'particleTrajectory', self.overlayCanvas('particleTrajectory').create_line(origin[0], origin[1] - cross_size, origin[0], origin[1] + cross_size, fill='black', width=1, tags=('passthrough', 'part', 'offsetVariation', 'view-particleTrajectory', f'particleTrajectory-{id}')))
 
-        self.level_canvas.create_circle(origin[0], origin[1], 2, fill='black', outline='', tags=('passthrough', 'part', 'offsetVariation', f'offsetVariation&&{id}'))
+        self.canvasItems.addOverlayItem(id, 'particleTrajectory', self.overlayCanvas('particleTrajectory').create_circle(origin[0], origin[1], 2, fill='black', outline='', tags=('passthrough', 'part', 'offsetVariation', 'view-particleTrajectory', f'particleTrajectory-{id}')))
 
     def _drawAngleVariationArrow(self, obj, origin, base_angle, variation, id):
         variation_deg = variation
@@ -1122,7 +1725,7 @@ class WME(tk.Tk):
             end_x = origin[0] + arrow_length * numpy.cos(angle_rad)
             end_y = origin[1] + arrow_length * numpy.sin(angle_rad)
 
-            self.level_canvas.create_line(origin[0], origin[1], end_x, end_y, fill='white', width=2, tags=('passthrough', 'part', 'angleVariation', f'angleVariation&&{id}'))
+            self.canvasItems.addOverlayItem(id, 'particleTrajectory', self.overlayCanvas('particleTrajectory').create_line(origin[0], origin[1], end_x, end_y, fill='white', width=2, tags=('passthrough', 'part', 'angleVariation', 'view-particleTrajectory', f'particleTrajectory-{id}')))
 
             arrow_size = 4
             arrow_angle1 = angle_rad + numpy.radians(150)
@@ -1133,37 +1736,36 @@ class WME(tk.Tk):
             arrow_x2 = end_x + arrow_size * numpy.cos(arrow_angle2)
             arrow_y2 = end_y + arrow_size * numpy.sin(arrow_angle2)
 
-            self.level_canvas.create_polygon(end_x, end_y, arrow_x1, arrow_y1, arrow_x2, arrow_y2, fill='white', outline='white', tags=('passthrough', 'part', 'angleVariation', f'angleVariation&&{id}'))
+            self.canvasItems.addOverlayItem(id, 'particleTrajectory', self.overlayCanvas('particleTrajectory').create_polygon(end_x, end_y, arrow_x1, arrow_y1, arrow_x2, arrow_y2, fill='white', outline='white', tags=('passthrough', 'part', 'angleVariation', 'view-particleTrajectory', f'particleTrajectory-{id}')))
 
     def _drawParticleVariationIndicator(self, obj, origin, variation, id):
         indicator_radius = 8
         variation_size = min(variation * 2, 15)
 
         outer_radius = indicator_radius + variation_size
-        self.level_canvas.create_circle(origin[0] + 40, origin[1], outer_radius, outline='red', width=2, fill='', tags=('passthrough', 'part', 'particleVariation', f'particleVariation&&{id}'))
+        self.canvasItems.addOverlayItem(id, 'particleTrajectory', self.overlayCanvas('particleTrajectory').create_circle(origin[0] + 40, origin[1], outer_radius, outline='red', width=2, fill='', tags=('passthrough', 'part', 'particleVariation', 'view-particleTrajectory', f'particleTrajectory-{id}')))
 
         inner_radius = max(indicator_radius - variation_size, 2)
-        self.level_canvas.create_circle(origin[0] + 40, origin[1], inner_radius, outline='blue', width=2, fill='', tags=('passthrough', 'part', 'particleVariation', f'particleVariation&&{id}'))
+        self.canvasItems.addOverlayItem(id, 'particleTrajectory', self.overlayCanvas('particleTrajectory').create_circle(origin[0] + 40, origin[1], inner_radius, outline='blue', width=2, fill='', tags=('passthrough', 'part', 'particleVariation', 'view-particleTrajectory', f'particleTrajectory-{id}')))
 
-        self.level_canvas.create_circle(origin[0] + 40, origin[1], 2, fill='black', outline='', tags=('passthrough', 'part', 'particleVariation', f'particleVariation&&{id}'))
+        self.canvasItems.addOverlayItem(id, 'particleTrajectory', self.overlayCanvas('particleTrajectory').create_circle(origin[0] + 40, origin[1], 2, fill='black', outline='', tags=('passthrough', 'part', 'particleVariation', 'view-particleTrajectory', f'particleTrajectory-{id}')))
 
-    def _drawParticleOffsetIndicator(self, obj, origin, offset_str, id):
+    def _drawParticleOffsetIndicator(self, obj, origin, offset, id):
         try:
-            offset_parts = offset_str.split()
-            offset_x = float(offset_parts[0])
-            offset_y = float(offset_parts[1]) if len(offset_parts) > 1 else 0
+            offset_x = offset[0]
+            offset_y = offset[1] if len(offset) > 1 else 0
 
-            canvas_offset_x = offset_x * self.OBJECT_MULTIPLIER * self.level.scale
-            canvas_offset_y = offset_y * self.OBJECT_MULTIPLIER * self.level.scale
+            canvas_offset_x = offset_x * self.OBJECT_MULTIPLIER * self.getCanvasScale()
+            canvas_offset_y = offset_y * self.OBJECT_MULTIPLIER * self.getCanvasScale()
 
             offset_pos_x = origin[0] + canvas_offset_x
             offset_pos_y = origin[1] + canvas_offset_y
 
-            self.level_canvas.create_line(origin[0], origin[1], offset_pos_x, offset_pos_y, fill='green', width=2, dash=(5, 3), tags=('passthrough', 'part', 'particleOffset', f'particleOffset&&{id}'))
+            self.canvasItems.addOverlayItem(id, 'particleTrajectory', self.overlayCanvas('particleTrajectory').create_line(origin[0], origin[1], offset_pos_x, offset_pos_y, fill='green', width=2, dash=(5, 3), tags=('passthrough', 'part', 'particleOffset', 'view-particleTrajectory', f'particleTrajectory-{id}')))
 
-            self.level_canvas.create_circle(offset_pos_x, offset_pos_y, 4, fill='', outline='green', width=2, tags=('passthrough', 'part', 'particleOffset', f'particleOffset&&{id}'))
+            self.canvasItems.addOverlayItem(id, 'particleTrajectory', self.overlayCanvas('particleTrajectory').create_circle(offset_pos_x, offset_pos_y, 4, fill='', outline='green', width=2, tags=('passthrough', 'part', 'particleOffset', 'view-particleTrajectory', f'particleTrajectory-{id}')))
 
-            self.level_canvas.create_circle(origin[0], origin[1], 2, fill='green', outline='', tags=('passthrough', 'part', 'particleOffset', f'particleOffset&&{id}'))
+            self.canvasItems.addOverlayItem(id, 'particleTrajectory', self.overlayCanvas('particleTrajectory').create_circle(origin[0], origin[1], 2, fill='green', outline='', tags=('passthrough', 'part', 'particleOffset', 'view-particleTrajectory', f'particleTrajectory-{id}')))
         except:
             pass
 
@@ -1179,260 +1781,113 @@ class WME(tk.Tk):
         }
         return fluid_colors.get(fluid_type, '#000000')
 
-    def _drawDrainVisualizations(self, obj, canvas_pos, id):
-        try:
-            if not obj.properties:
-                return
+    def _snapshotVacuum(self, obj: wmwpy.classes.Object) -> tuple[propertyrecords.VacuumProperties, float] | None:
+        """Get what is needed to render the vacuum of a drain, so it can be done in a worker thread.
 
-            properties = dict(obj.properties) if obj.properties else {}
-            if hasattr(obj, 'defaultProperties') and obj.defaultProperties:
-                for prop_name, prop_value in obj.defaultProperties.items():
-                    if prop_name not in properties:
-                        properties[prop_name] = prop_value
+        Args:
+            obj (wmwpy.classes.Object): The drain.
 
-            spout_type = properties.get('SpoutType', None)
-            fan_type = properties.get('FanType', None)
+        Returns:
+            tuple[propertyrecords.VacuumProperties, float] | None: The vacuum properties and zoom, or None if there's nothing to draw.
+        """
+        if not obj.properties:
+            return None
 
-            if spout_type is None:
-                spout_type = 'spout'
-            if fan_type is None:
-                fan_type = 'fan'
+        vacuum = self.propertyRecords.get(obj, propertyrecords.VacuumProperties)
 
-            if spout_type not in ['Drain', 'DrainSpout'] and fan_type != 'fan':
-                return
+        if vacuum.spout_type not in ['Drain', 'DrainSpout'] and vacuum.fan_type != 'fan':
+            return None
 
-            obj_angle = -float(properties.get('Angle', 0))
+        return vacuum, self.zoom
 
-            angle_variation = float(properties.get('AngleVariation', obj.defaultProperties.get('AngleVariation', 0)))
-            vacuum_base_angle = float(properties.get('VacuumBaseAngle', obj.defaultProperties.get('VacuumBaseAngle', 0)))
-            vacuum_min_angle = float(properties.get('VacuumMinAngle', obj.defaultProperties.get('VacuumMinAngle', 0)))
-            vacuum_max_angle = float(properties.get('VacuumMaxAngle', obj.defaultProperties.get('VacuumMaxAngle', 0)))
-            vacuum_force = float(properties.get('VacuumForce', obj.defaultProperties.get('VacuumForce', 0)))
-            vacuum_max_force = float(properties.get('VacuumMaxForce', obj.defaultProperties.get('VacuumMaxForce', 0)))
-            vacuum_max_d = float(properties.get('VacuumMaxD', obj.defaultProperties.get('VacuumMaxD', 0)))
-            vacuum_friction = float(properties.get('VacuumFriction', obj.defaultProperties.get('VacuumFriction', 0)))
+    def _computeVacuum(self, snapshot: tuple[propertyrecords.VacuumProperties, float]) -> vacuumfield.VacuumImage:
+        """Render the vacuum of a drain. This runs in a worker thread, so it only uses the snapshot.
 
-            vacuum_center_offset_A_str = properties.get('VacuumCenterOffsetA', '0 0')
-            vacuum_center_offset_B_str = properties.get('VacuumCenterOffsetB', '0 0')
-            vacuum_center_offset_A = [float(x) for x in vacuum_center_offset_A_str.split()]
-            vacuum_center_offset_B = [float(x) for x in vacuum_center_offset_B_str.split()]
+        Args:
+            snapshot (tuple[propertyrecords.VacuumProperties, float]): From `_snapshotVacuum`.
 
-            if angle_variation > 0:
-                self._drawDrainAngleVariation(obj, canvas_pos, angle_variation, obj_angle, id)
+        Returns:
+            vacuumfield.VacuumImage: The rendered vacuum.
+        """
+        return vacuumfield.VacuumImage(*snapshot)
 
-            if vacuum_min_angle != 0 or vacuum_max_angle != 0 or vacuum_max_d > 0:
-                self._drawVacuumWindField(obj, canvas_pos, vacuum_min_angle, vacuum_max_angle, vacuum_max_d, obj_angle, id, vacuum_center_offset_A, vacuum_center_offset_B, vacuum_base_angle)
+    def _drawDrainVisualizations(self, obj, result, canvas_pos, id):
+        if result.zoom != self.zoom:
+            # the image for this zoom is still being rendered
+            return
 
-            if vacuum_force > 0 or vacuum_max_force > 0:
-                self._drawVacuumForces(obj, canvas_pos, vacuum_force, vacuum_max_force, obj_angle, id, vacuum_center_offset_A, vacuum_center_offset_B, vacuum_base_angle)
+        if 'vacuum' in self.rasterLayers:
+            # raster layers composite the PIL image
+            image = result.image
+        else:
+            image = result.photoimage()
+        if image is None:
+            return
 
-            if vacuum_friction > 0:
-                self._drawVacuumFriction(obj, canvas_pos, vacuum_friction, obj_angle, id)
-        except Exception as e:
-            pass
+        self.canvasItems.addOverlayItem(id, 'vacuum', self.overlayCanvas('vacuum').create_image(canvas_pos[0] + result.offset[0], canvas_pos[1] + result.offset[1], image=image, anchor='nw', tags=('passthrough', 'part', 'vacuumField', 'view-vacuum', f'vacuum-{id}')))
 
-    def _drawDrainAngleVariation(self, obj, origin, variation, obj_angle, id):
-        variation_deg = variation
-        if variation_deg < 5:
-            variation_deg = 5
+    def _getParentConnectionOwners(self, obj: wmwpy.classes.Object) -> list[wmwpy.classes.Object]:
+        """Get the objects whose connections have to be redrawn when an object changes: its own, every connection that points at it, and every connection that points at its name.
 
-        arrow_length = 30
+        Args:
+            obj (wmwpy.classes.Object): The object.
 
-        start_angle = -variation_deg + obj_angle
-        end_angle = variation_deg + obj_angle
+        Returns:
+            list[wmwpy.classes.Object]: The objects, including `obj`.
+        """
+        objects = [obj]
+        for owner in self.overlayDependencies.dependents(obj.id) | self.overlayDependencies.referencing(obj.name):
+            other = self.objectIds.get(owner)
+            if other is not None and other is not obj:
+                objects.append(other)
+        return objects
 
-        for angle in [start_angle, end_angle]:
-            angle_rad = numpy.radians(angle)
-            end_x = origin[0] + arrow_length * numpy.cos(angle_rad)
-            end_y = origin[1] + arrow_length * numpy.sin(angle_rad)
-
-            self.level_canvas.create_line(origin[0], origin[1], end_x, end_y, fill='white', width=2, tags=('passthrough', 'part', 'drainAngleVariation', f'drainAngleVariation&&{id}'))
+    def _computeParentConnections(self, obj: wmwpy.classes.Object) -> list[tuple[str, str, wmwpy.classes.Object | None]] | None:
+        """Find the objects an object is connected to.
 
-            arrow_size = 4
-            arrow_angle1 = angle_rad + numpy.radians(150)
-            arrow_angle2 = angle_rad - numpy.radians(150)
+        Args:
+            obj (wmwpy.classes.Object): The object.
 
-            arrow_x1 = end_x + arrow_size * numpy.cos(arrow_angle1)
-            arrow_y1 = end_y + arrow_size * numpy.sin(arrow_angle1)
-            arrow_x2 = end_x + arrow_size * numpy.cos(arrow_angle2)
-            arrow_y2 = end_y + arrow_size * numpy.sin(arrow_angle2)
+        Returns:
+            list[tuple[str, str, wmwpy.classes.Object | None]] | None: (property, name, object) for every connection, with None if no object has the name, or None if the object has no properties.
+        """
+        if not obj.properties:
+            return None
 
-            self.level_canvas.create_polygon(end_x, end_y, arrow_x1, arrow_y1, arrow_x2, arrow_y2, fill='white', outline='white', tags=('passthrough', 'part', 'drainAngleVariation', f'drainAngleVariation&&{id}'))
+        connections = []
 
-    def _drawVacuumWindField(self, obj, origin, min_angle, max_angle, max_d, obj_angle, id, center_offset_A=None, center_offset_B=None, base_angle=0):
-        x_axis_angle = obj_angle + base_angle
-        angle_rad = numpy.radians(x_axis_angle)
-        cos_angle = numpy.cos(angle_rad)
-        sin_angle = numpy.sin(angle_rad)
+        parent_name = obj.properties.get('Parent', '')
+        if parent_name:
+            connections.append(('Parent', parent_name, self.objectNames.get(parent_name)))
 
-        if center_offset_A is not None and len(center_offset_A) >= 2:
-            point_A_x = origin[0] - center_offset_A[0] * 5 * cos_angle - center_offset_A[1] * 5 * sin_angle
-            point_A_y = origin[1] - center_offset_A[0] * 5 * sin_angle + center_offset_A[1] * 5 * cos_angle
-        else:
-            point_A_x = origin[0]
-            point_A_y = origin[1]
+        for prop_name, prop_value in obj.properties.items():
+            if prop_name.startswith('ConnectedSpout') or prop_name.startswith('ConnectedObject') or prop_name.startswith('ConnectedConverter'):
+                connected_obj_name = str(prop_value)
+                if connected_obj_name and connected_obj_name != '0':
+                    connections.append((prop_name, connected_obj_name, self.objectNames.get(connected_obj_name)))
 
-        if center_offset_B is not None and len(center_offset_B) >= 2:
-            point_B_x = origin[0] - center_offset_B[0] * 5 * cos_angle - center_offset_B[1] * 5 * sin_angle
-            point_B_y = origin[1] - center_offset_B[0] * 5 * sin_angle + center_offset_B[1] * 5 * cos_angle
-        else:
-            point_B_x = origin[0]
-            point_B_y = origin[1]
-
-        if center_offset_A is not None and len(center_offset_A) >= 2:
-            self.level_canvas.create_oval(point_A_x - 3, point_A_y - 3, point_A_x + 3, point_A_y + 3, fill='cyan', outline='cyan', tags=('passthrough', 'part', 'vacuumWindField', f'vacuumWindField&&{id}'))
-        if center_offset_B is not None and len(center_offset_B) >= 2:
-            self.level_canvas.create_oval(point_B_x - 3, point_B_y - 3, point_B_x + 3, point_B_y + 3, fill='magenta', outline='magenta', tags=('passthrough', 'part', 'vacuumWindField', f'vacuumWindField&&{id}'))
-
-        self._drawArrowLine(point_A_x, point_A_y, point_B_x, point_B_y, 'blue', 2, id, 'vacuumWindField')
-
-        if max_d > 0:
-            angle_rad = numpy.radians(x_axis_angle - min_angle + 180)
-            length = max_d * 5
-            point_A_prime_x = point_A_x + length * numpy.cos(angle_rad)
-            point_A_prime_y = point_A_y + length * numpy.sin(angle_rad)
-            self._drawArrowLine(point_A_x, point_A_y, point_A_prime_x, point_A_prime_y, 'green', 2, id, 'vacuumWindField')
-        else:
-            point_A_prime_x = point_A_x
-            point_A_prime_y = point_A_y
-
-        if max_d > 0:
-            angle_rad = numpy.radians(x_axis_angle - max_angle + 180)
-            length = max_d * 5
-            point_B_prime_x = point_B_x + length * numpy.cos(angle_rad)
-            point_B_prime_y = point_B_y + length * numpy.sin(angle_rad)
-            self._drawArrowLine(point_B_x, point_B_y, point_B_prime_x, point_B_prime_y, 'red', 2, id, 'vacuumWindField')
-        else:
-            point_B_prime_x = point_B_x
-            point_B_prime_y = point_B_y
-
-        if min_angle != 0 or max_angle != 0:
-            self.level_canvas.create_line(point_A_prime_x, point_A_prime_y, point_B_prime_x, point_B_prime_y, fill='purple', width=2, tags=('passthrough', 'part', 'vacuumWindField', f'vacuumWindField&&{id}'))
-
-    def _drawArrowLine(self, x1, y1, x2, y2, color, width, id, tag):
-        self.level_canvas.create_line(x1, y1, x2, y2, fill=color, width=width, tags=('passthrough', 'part', tag, f'{tag}&&{id}'))
-
-        angle = numpy.arctan2(y2 - y1, x2 - x1)
-        arrow_size = 5
-        arrow_angle1 = angle + numpy.radians(150)
-        arrow_angle2 = angle - numpy.radians(150)
-
-        arrow_x1 = x2 + arrow_size * numpy.cos(arrow_angle1)
-        arrow_y1 = y2 + arrow_size * numpy.sin(arrow_angle1)
-        arrow_x2 = x2 + arrow_size * numpy.cos(arrow_angle2)
-        arrow_y2 = y2 + arrow_size * numpy.sin(arrow_angle2)
-
-        self.level_canvas.create_polygon(x2, y2, arrow_x1, arrow_y1, arrow_x2, arrow_y2, fill=color, outline=color, tags=('passthrough', 'part', tag, f'{tag}&&{id}'))
-
-    def _drawVacuumForces(self, obj, origin, force, max_force, obj_angle, id, center_offset_A=None, center_offset_B=None, base_angle=0):
-        x_axis_angle = obj_angle + base_angle
-        angle_rad = numpy.radians(x_axis_angle)
-        cos_angle = numpy.cos(angle_rad)
-        sin_angle = numpy.sin(angle_rad)
-
-        if center_offset_A is not None and len(center_offset_A) >= 2 and center_offset_B is not None and len(center_offset_B) >= 2:
-            point_A_x = origin[0] - center_offset_A[0] * 5 * cos_angle - center_offset_A[1] * 5 * sin_angle
-            point_A_y = origin[1] - center_offset_A[0] * 5 * sin_angle + center_offset_A[1] * 5 * cos_angle
-
-            point_B_x = origin[0] - center_offset_B[0] * 5 * cos_angle - center_offset_B[1] * 5 * sin_angle
-            point_B_y = origin[1] - center_offset_B[0] * 5 * sin_angle + center_offset_B[1] * 5 * cos_angle
-
-            if max_force > 0:
-                midpoint_AB_x = (point_A_x + point_B_x) / 2
-                midpoint_AB_y = (point_A_y + point_B_y) / 2
-                self.level_canvas.create_text(midpoint_AB_x, midpoint_AB_y + 10, text=str(int(max_force)), fill='red', font=('Arial', 10, 'bold'), tags=('passthrough', 'part', 'vacuumForces', f'vacuumForces&&{id}'))
-
-            if force > 0:
-                min_angle = float(obj.properties.get('VacuumMinAngle', obj.defaultProperties.get('VacuumMinAngle', 0)))
-                max_angle = float(obj.properties.get('VacuumMaxAngle', obj.defaultProperties.get('VacuumMaxAngle', 0)))
-                max_d = float(obj.properties.get('VacuumMaxD', obj.defaultProperties.get('VacuumMaxD', 0)))
-
-                if max_d > 0:
-                    angle_rad = numpy.radians(x_axis_angle - min_angle + 180)
-                    length = max_d * 5
-                    point_A_prime_x = point_A_x + length * numpy.cos(angle_rad)
-                    point_A_prime_y = point_A_y + length * numpy.sin(angle_rad)
-
-                    angle_rad = numpy.radians(x_axis_angle - max_angle + 180)
-                    length = max_d * 5
-                    point_B_prime_x = point_B_x + length * numpy.cos(angle_rad)
-                    point_B_prime_y = point_B_y + length * numpy.sin(angle_rad)
-
-                    midpoint_A_primeB_prime_x = (point_A_prime_x + point_B_prime_x) / 2
-                    midpoint_A_primeB_prime_y = (point_A_prime_y + point_B_prime_y) / 2
-                    self.level_canvas.create_text(midpoint_A_primeB_prime_x, midpoint_A_primeB_prime_y - 10, text=str(int(force)), fill='red', font=('Arial', 10, 'bold'), tags=('passthrough', 'part', 'vacuumForces', f'vacuumForces&&{id}'))
-        else:
-            if force > 0:
-                line_length = (force * 5) / 2
-                x1 = origin[0] + line_length * cos_angle
-                y1 = origin[1] + line_length * sin_angle
-                x2 = origin[0] - line_length * cos_angle
-                y2 = origin[1] - line_length * sin_angle
-                self.level_canvas.create_line(x1, y1, x2, y2, fill='red', width=3, tags=('passthrough', 'part', 'vacuumForces', f'vacuumForces&&{id}'))
-
-            if max_force > 0:
-                line_length = (max_force * 5) / 2
-                x1 = origin[0] + line_length * cos_angle
-                y1 = origin[1] + line_length * sin_angle
-                x2 = origin[0] - line_length * cos_angle
-                y2 = origin[1] - line_length * sin_angle
-                self.level_canvas.create_line(x1, y1, x2, y2, fill='red', width=2, dash=(5, 3), tags=('passthrough', 'part', 'vacuumForces', f'vacuumForces&&{id}'))
-
-    def _drawVacuumFriction(self, obj, origin, friction, obj_angle, id):
-        radius = friction * 10
-        if radius < 3:
-            radius = 3
-
-        self.level_canvas.create_circle(origin[0], origin[1], radius, fill='', outline='orange', width=2, tags=('passthrough', 'part', 'vacuumFriction', f'vacuumFriction&&{id}'))
-
-    def _updateParentConnections(self):
-        self.level_canvas.delete('parent')
-        self.level_canvas.delete('connectedSpout')
-        parent_enabled = self.settings.get('view.parent', True)
-        if parent_enabled:
-            for obj in self.level.objects:
-                canvas_pos = self.getObjectPosition(obj.pos, obj.offset)
-                obj_id = f'object-{str(obj.id)}'
-                self._drawParentConnections(obj, canvas_pos, obj_id)
-            self.updateLayers()
+        return connections
 
-    def _drawParentConnections(self, obj, canvas_pos, id):
-        try:
-            if not obj.properties:
-                return
+    def _drawParentConnections(self, obj, connections, canvas_pos, id):
+        self.overlayDependencies.setTargets(
+            obj.id,
+            [target.id for prop_name, name, target in connections if target],
+            [name for prop_name, name, target in connections],
+        )
 
-            parent_name = obj.properties.get('Parent', '')
-            if parent_name:
-                parent_obj = None
-                for other_obj in self.level.objects:
-                    if other_obj.name == parent_name:
-                        parent_obj = other_obj
-                        break
-
-                if parent_obj:
-                    parent_canvas_pos = self.getObjectPosition(parent_obj.pos, parent_obj.offset)
-                    self._drawParentLine(parent_canvas_pos, canvas_pos, 'Parent', id, parent_obj.id)
-
-            for prop_name, prop_value in obj.properties.items():
-                if prop_name.startswith('ConnectedSpout') or prop_name.startswith('ConnectedObject') or prop_name.startswith('ConnectedConverter'):
-                    connected_obj_name = str(prop_value)
-                    if connected_obj_name and connected_obj_name != '0':
-                        connected_obj = None
-                        for other_obj in self.level.objects:
-                            if other_obj.name == connected_obj_name:
-                                connected_obj = other_obj
-                                break
-
-                        if connected_obj:
-                            connected_canvas_pos = self.getObjectPosition(connected_obj.pos, connected_obj.offset)
-                            self._drawConnectedSpoutLine(canvas_pos, connected_canvas_pos, prop_name, id, connected_obj.id)
-        except Exception as e:
-            pass
+        for prop_name, name, target in connections:
+            if not target:
+                continue
+            target_canvas_pos = self.getObjectPosition(target.pos, target.offset)
+            if prop_name == 'Parent':
+                self._drawParentLine(target_canvas_pos, canvas_pos, 'Parent', id, target.id)
+            else:
+                self._drawConnectedSpoutLine(canvas_pos, target_canvas_pos, prop_name, id, target.id)
 
     def _drawParentLine(self, parent_pos, child_pos, property_name, child_id, parent_id):
-        self.level_canvas.create_line(parent_pos[0], parent_pos[1], child_pos[0], child_pos[1], fill='blue', width=2, dash=(8, 4), tags=('passthrough', 'part', 'parent', f'parent&&{child_id}', f'parent&&{parent_id}'))
+        self.canvasItems.addOverlayItem(child_id, 'parent', self.overlayCanvas('parent').create_line(parent_pos[0], parent_pos[1], child_pos[0], child_pos[1], fill='blue', width=2, dash=(8, 4), tags=('passthrough', 'part', 'parent', 'view-parent', f'parent-{child_id}')))
 
-        self._drawArrow(parent_pos, child_pos, 'blue', 'parent')
+        self._drawArrow(parent_pos, child_pos, 'blue', 'parent', child_id)
 
     def _drawConnectedSpoutLine(self, from_pos, to_pos, property_name, from_id, to_id):
         connection_num = ''
@@ -1442,16 +1897,16 @@ class WME(tk.Tk):
             if match:
                 connection_num = match.group(2)
 
-        self.level_canvas.create_line(from_pos[0], from_pos[1], to_pos[0], to_pos[1], fill='green', width=2, tags=('passthrough', 'part', 'connectedSpout', f'connectedSpout&&{from_id}', f'connectedSpout&&{to_id}'))
+        self.canvasItems.addOverlayItem(from_id, 'parent', self.overlayCanvas('parent').create_line(from_pos[0], from_pos[1], to_pos[0], to_pos[1], fill='green', width=2, tags=('passthrough', 'part', 'connectedSpout', 'view-parent', f'parent-{from_id}')))
 
         if connection_num:
             mid_x = (from_pos[0] + to_pos[0]) / 2
             mid_y = (from_pos[1] + to_pos[1]) / 2
-            self.level_canvas.create_text(mid_x, mid_y, text=connection_num, fill='white', font=('Arial', 8, 'bold'), tags=('passthrough', 'part', 'connectedSpout', f'connectedSpout&&{from_id}', f'connectedSpout&&{to_id}'))
+            self.canvasItems.addOverlayItem(from_id, 'parent', self.overlayCanvas('parent').create_text(mid_x, mid_y, text=connection_num, fill='white', font=('Arial', 8, 'bold'), tags=('passthrough', 'part', 'connectedSpout', 'view-parent', f'parent-{from_id}')))
 
-        self._drawArrow(from_pos, to_pos, 'green', 'connectedSpout')
+        self._drawArrow(from_pos, to_pos, 'green', 'connectedSpout', from_id)
 
-    def _drawArrow(self, from_pos, to_pos, color, tag_prefix):
+    def _drawArrow(self, from_pos, to_pos, color, tag_prefix, id):
         arrow_ratio = 0.75
         arrow_x = from_pos[0] + (to_pos[0] - from_pos[0]) * arrow_ratio
         arrow_y = from_pos[1] + (to_pos[1] - from_pos[1]) * arrow_ratio
@@ -1465,104 +1920,248 @@ class WME(tk.Tk):
         arrow_x2 = arrow_x - arrow_length * numpy.cos(angle + arrow_angle)
         arrow_y2 = arrow_y - arrow_length * numpy.sin(angle + arrow_angle)
 
-        self.level_canvas.create_polygon(arrow_x, arrow_y, arrow_x1, arrow_y1, arrow_x2, arrow_y2, fill=color, outline=color, tags=('passthrough', 'part', tag_prefix))
+        self.canvasItems.addOverlayItem(id, 'parent', self.overlayCanvas('parent').create_polygon(arrow_x, arrow_y, arrow_x1, arrow_y1, arrow_x2, arrow_y2, fill=color, outline=color, tags=('passthrough', 'part', tag_prefix, 'view-parent', f'parent-{id}')))
+
+    def _computeRadius(self, obj: wmwpy.classes.Object) -> list[tuple[str, float]]:
+        """Get the radius properties of an object.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+
+        Returns:
+            list[tuple[str, float]]: (property, radius) in level units.
+        """
+        radius_properties = self.objectClasses.get(obj).radius_properties
+        if len(radius_properties) == 0:
+            return []
+
+        Type = obj.Type
+        radii = []
+        for property in radius_properties:
+            for name, radius in Type.get_properties(property).items():
+                radii.append((property, radius))
+        return radii
+
+    def _drawRadius(self, obj: wmwpy.classes.Object, radii: list[tuple[str, float]], true_pos: numpy.ndarray, platinum_tag: str, id: str):
+        record = self.canvasItems.record(id)
+
+        # circles from the last time are moved in order, the ones that aren't are deleted
+        old_items = record.radius
+        record.radius = []
+
+        for property, radius in radii:
+            logging.debug(f'radius: {radius}')
+            radius_canvas_size = self.toLevelCanvasCoord(radius)
+            if radius_canvas_size > 0:
+                tags = ('passthrough', 'part', 'radius', property, 'view-radius', platinum_tag, id)
+                if len(old_items) > 0:
+                    r_id = old_items.pop(0)
+                    self.level_canvas.coords(
+                        r_id,
+                        true_pos[0] - radius_canvas_size,
+                        true_pos[1] - radius_canvas_size,
+                        true_pos[0] + radius_canvas_size,
+                        true_pos[1] + radius_canvas_size,
+                    )
+                    # the circle might have been hidden with the radius view
+                    self.level_canvas.itemconfig(r_id, state = 'normal', tags = tags)
+                else:
+                    r_id = self.level_canvas.create_circle(true_pos[0], true_pos[1], radius_canvas_size, fill = '', outline = 'red', width = self.OBJECT_MULTIPLIER, tags = tags)
+                    self.layers.place(r_id, 'radius')
+                record.radius.append(r_id)
+
+        self.level_canvas.delete(*old_items)
+
+    def _drawPath(self, obj: wmwpy.classes.Object, path: propertyrecords.PathProperties, old_items: dict[str, int], id: str):
+        if not path.has_type:
+            return
+
+        if len(path.path_pos) > 0:
+            self._drawPathPosPoints(obj, path, old_items, id)
+
+        if len(path.points) >= 2:
+            self._drawPathPoints(obj, path, old_items, id)
+        else:
+            logging.debug(f'PathPoints has less than 2 points for {obj.name}')
+
+    def _pathItem(self, obj: wmwpy.classes.Object, old_items: dict[str, int], key: str, layer: str, create: typing.Callable[..., int], coords: list[float], **options) -> int:
+        """Move a path item from the last time the path was drawn, or create it if there isn't one.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+            old_items (dict[str, int]): Path items that haven't been reused yet. The item is taken out of it.
+            key (str): Part the item draws.
+            layer (str): Layer for new items.
+            create (Callable[..., int]): Canvas method to create the item with, like `create_line`.
+            coords (list[float]): Item coordinates.
+            **options: Item options.
+
+        Returns:
+            int: Canvas item id.
+        """
+        item = old_items.pop(key, None)
+        if item is None:
+            item = create(*coords, **options)
+            self.layers.place(item, layer)
+        else:
+            self.level_canvas.coords(item, *coords)
+            # the item might have been hidden with the path view
+            self.level_canvas.itemconfig(item, state = 'normal', **options)
+
+        self.canvasItems.record(f'object-{str(obj.id)}').path[key] = item
+        return item
+
+    def _pathHandle(self, obj: wmwpy.classes.Object, old_items: dict[str, int], property: str, pos: numpy.ndarray, radius: float, platinum_tag: str, id: str, **options) -> int:
+        item = self._pathItem(
+            obj,
+            old_items,
+            property,
+            'pathPoint',
+            self.level_canvas.create_oval,
+            [pos[0] - radius, pos[1] - radius, pos[0] + radius, pos[1] + radius],
+            tags = ('part', 'path', property, 'pathPoint', 'view-path', platinum_tag, id),
+            **options,
+        )
+        self._indexPart(obj, 'path', property, item, pos, radius)
+        return item
 
-    def _drawPathPosPoints(self, obj, path_points, canvas_pos, id):
-        is_global = obj.Type.get_property('PathIsGlobal')
-        is_closed = obj.Type.get_property('PathIsClosed')
+    def _drawPathPosPoints(self, obj: wmwpy.classes.Object, path: propertyrecords.PathProperties, old_items: dict[str, int], id: str):
+        platinum_tag = self.getViewTag(f'PlatinumType.{self.getPlatinumType(obj)}')
 
-        if is_global:
+        if path.is_global:
             path_start = obj.pos
         else:
             path_start = (0, 0)
 
         path_canvas_points = []
 
-        for property, path_point in path_points.items():
-            logging.debug(f'property: {property}')
-            logging.debug(f'value: {path_point}')
+        for property, path_point in path.path_pos.items():
             path_pos = copy(path_start)
 
-            if isinstance(path_point, list):
-                if len(path_point) == 1:
-                    path_point += [path_start[1]]
-                    path_pos = tuple(path_point)
-                elif len(path_point) >= 2:
-                    path_pos = (path_point[0], path_point[1])
+            if len(path_point) == 1:
+                path_pos = (path_point[0], path_start[1])
+            elif len(path_point) >= 2:
+                path_pos = (path_point[0], path_point[1])
 
             path_pos = numpy.array(path_pos)
 
-            global_pos = copy(canvas_pos)
-            if is_global:
+            if path.is_global:
                 global_pos = self.toLevelCanvasCoord(path_pos)
             else:
                 global_pos = self.toLevelCanvasCoord(obj.pos) + self.toLevelCanvasCoord(path_pos, 1)
 
-            path_canvas_points.append(tuple(global_pos))
+            path_canvas_points.extend(global_pos)
 
             color = 'black'
             if obj == self.selectedObject and self.selectedPart['property'] == property:
                 color = 'yellow'
 
-            point_id = self.level_canvas.create_circle(global_pos[0], global_pos[1], 3, fill = color, outline = '', tags = ('part', 'path', property, 'pathPoint', id))
+            self._pathHandle(obj, old_items, property, global_pos, 3, platinum_tag, id, fill = color, outline = '')
 
-        if len(path_canvas_points) > 1:
-            if is_closed:
-                line = self.level_canvas.create_polygon(path_canvas_points, fill = '', outline = 'black', width = 2, tags = ('passthrough', 'part', 'path', property, 'pathLine', id))
+        if len(path_canvas_points) > 2:
+            tags = ('passthrough', 'part', 'path', 'PathPos', 'pathLine', 'view-path', platinum_tag, id)
+            if path.is_closed:
+                self._pathItem(obj, old_items, 'PathPos.polygon', 'pathLine', self.level_canvas.create_polygon, path_canvas_points, fill = '', outline = 'black', width = 2, tags = tags)
             else:
-                line = self.level_canvas.create_line(path_canvas_points, fill = 'black', width = 2, tags = ('passthrough', 'part', 'path', property, 'pathLine', id))
+                self._pathItem(obj, old_items, 'PathPos.line', 'pathLine', self.level_canvas.create_line, path_canvas_points, fill = 'black', width = 2, tags = tags)
 
-    def _drawPathPoints(self, obj, path_points_str, canvas_pos, id):
-        logging.debug(f'_drawPathPoints called for {obj.name} with: {path_points_str}')
-        try:
-            points = []
-            point_pairs = path_points_str.split(',')
+    def _drawPathPoints(self, obj: wmwpy.classes.Object, path: propertyrecords.PathProperties, old_items: dict[str, int], id: str):
+        platinum_tag = self.getViewTag(f'PlatinumType.{self.getPlatinumType(obj)}')
+        points = path.points
 
-            for pair in point_pairs:
-                coords = pair.strip().split()
-                if len(coords) >= 2:
-                    x, y = float(coords[0]), float(coords[1])
-                    points.append((x, y))
+        logging.debug(f'Drawing {len(points)} PathPoints for {obj.name}')
 
-            logging.debug(f'Parsed {len(points)} points: {points}')
+        canvas_points = self.toLevelCanvasCoord(obj.pos) + self.toLevelCanvasCoord(points, 1)
+        last = len(points) - 1
 
-            if len(points) < 2:
-                logging.debug(f'PathPoints has less than 2 points: {len(points)}')
-                return
+        for i, global_pos in enumerate(canvas_points):
 
-            logging.debug(f'Drawing {len(points)} PathPoints for {obj.name}')
+            point_size = 4 if i == 0 or i == last else 3  # Larger endpoints
+            color = 'black'
+            if obj == self.selectedObject and self.selectedPart.get('property') == f'PathPoints[{i}]':
+                color = 'yellow'
 
-            path_canvas_points = []
-            for i, (x, y) in enumerate(points):
-                global_pos = self.toLevelCanvasCoord(obj.pos) + self.toLevelCanvasCoord((x, y), 1)
-                path_canvas_points.append(tuple(global_pos))
+            self._pathHandle(obj, old_items, f'PathPoints[{i}]', global_pos, point_size, platinum_tag, id, fill = color, outline = 'darkblue' if i == 0 else 'darkred' if i == last else '', width = 1)
 
-                point_size = 4 if i == 0 or i == len(points) - 1 else 3  # Larger endpoints
-                color = 'black'
-                if obj == self.selectedObject and self.selectedPart.get('property') == f'PathPoints[{i}]':
-                    color = 'yellow'
+        # one line for the whole path, the arrow shows which way it goes
+        self._pathItem(
+            obj,
+            old_items,
+            'PathPoints',
+            'pathLine',
+            self.level_canvas.create_line,
+            canvas_points.ravel().tolist(),
+            fill = 'black',
+            width = 2,
+            arrow = 'last' if len(points) > 2 else 'none',
+            arrowshape = (10, 12, 4),
+            tags = ('passthrough', 'part', 'path', 'PathPoints', 'pathLine', 'view-path', platinum_tag, id),
+        )
 
-                logging.debug(f'Drawing point {i} at {global_pos}')
-                point_id = self.level_canvas.create_circle(global_pos[0], global_pos[1], point_size, fill = color, outline = 'darkblue' if i == 0 else 'darkred' if i == len(points) - 1 else '', width = 1, tags = ('part', 'path', f'PathPoints[{i}]', 'pathPoint', id))
+    def _indexPart(self, obj: wmwpy.classes.Object, type: str, property: str, item: int, pos: tuple[float, float], radius: float):
+        """Add a selectable part handle to the spatial index.
+
+        Args:
+            obj (wmwpy.classes.Object): Object the part belongs to.
+            type (str): Part type, like `path`.
+            property (str): Property the part edits.
+            item (int): Canvas item of the handle.
+            pos (tuple[float, float]): Handle center in canvas coordinates.
+            radius (float): Handle radius in canvas pixels.
+        """
+        self.spatialIndex.insert(
+            (obj, type, property, item),
+            tuple(float(value) / self.zoom for value in (pos[0] - radius, pos[1] - radius, pos[0] + radius, pos[1] + radius)),
+            owner = obj,
+        )
 
-            if len(path_canvas_points) > 1:
-                logging.debug(f'Drawing {len(path_canvas_points)-1} connecting lines')
-                for i in range(len(path_canvas_points) - 1):
-                    line = self.level_canvas.create_line([path_canvas_points[i], path_canvas_points[i + 1]], fill = 'black', width = 2, tags = ('passthrough', 'part', 'path', f'PathPoints[{i}-{i+1}]', 'pathLine', id))
+    def findObjectsAt(self, pos: tuple[float, float], halo: int | float = 0) -> list[wmwpy.classes.Object | tuple[wmwpy.classes.Object, str, str, int]]:
+        """Find the objects and part handles under a canvas position, topmost first.
 
-                if len(path_canvas_points) > 2:
-                    for i in range(len(path_canvas_points) - 1):
-                        start = path_canvas_points[i]
-                        end = path_canvas_points[i + 1]
-                        mid_x = (start[0] + end[0]) / 2
-                        mid_y = (start[1] + end[1]) / 2
+        Args:
+            pos (tuple[float, float]): Position in canvas coordinates.
+            halo (int | float, optional): Distance around the position in canvas pixels. Defaults to 0.
 
-                        arrow_id = self.level_canvas.create_polygon([mid_x - 2, mid_y - 2, mid_x + 2, mid_y - 2, mid_x, mid_y + 2], fill = 'gray', outline = '', tags = ('passthrough', 'part', 'path', 'PathPoints', 'pathDirection', id))
+        Returns:
+            list[wmwpy.classes.Object | tuple[wmwpy.classes.Object, str, str, int]]: Objects, and parts as (object, type, property, canvas item).
+        """
+        hits = self.spatialIndex.queryPoint(pos[0] / self.zoom, pos[1] / self.zoom, halo / self.zoom)
+        return self._sortHits(hits)
 
-        except (ValueError, IndexError) as e:
-            logging.error(f'Error parsing PathPoints "{path_points_str}": {e}')
-        except Exception as e:
-            logging.error(f'Unexpected error drawing PathPoints: {e}')
+    def findObjectsIn(self, rect: tuple[float, float, float, float]) -> list[wmwpy.classes.Object | tuple[wmwpy.classes.Object, str, str, int]]:
+        """Find the objects and part handles that overlap a rectangle, topmost first.
+
+        Args:
+            rect (tuple[float, float, float, float]): (left, top, right, bottom) in canvas coordinates.
+
+        Returns:
+            list[wmwpy.classes.Object | tuple[wmwpy.classes.Object, str, str, int]]: Objects, and parts as (object, type, property, canvas item).
+        """
+        hits = self.spatialIndex.query(tuple(value / self.zoom for value in rect))
+        return self._sortHits(hits)
+
+    def _sortHits(self, hits: list) -> list:
+        parts = []
+        objects = []
+
+        for hit in hits:
+            if isinstance(hit, tuple):
+                obj = hit[0]
+                # handles of objects in a hidden PlatinumType group stay in the index until the objects are drawn again
+                if not self.isDrawn(obj) or obj not in self.objectOrder:
+                    continue
+                # path handles of unselected objects are hidden with the path view
+                if obj != self.selectedObject and not self.settings.get(f'view.{hit[1]}', True):
+                    continue
+                parts.append(hit)
+            elif self.isDrawn(hit) and hit in self.objectOrder:
+                objects.append(hit)
+
+        # handles are drawn above every object, and newer handles above older ones
+        parts.sort(key = lambda part: part[3], reverse = True)
+        objects.sort(key = self.objectOrder.index, reverse = True)
+
+        return parts + objects
 
     def selectObjectAt(self, pos: tuple[float, float] | list[float] | tk.Event, halo: int | float = 5):
         event = None
@@ -1573,40 +2172,16 @@ class WME(tk.Tk):
 
             pos = (self.level_canvas.canvasx(pos[0]), self.level_canvas.canvasy(pos[1]))
 
-        # objects = self.level_canvas.find_overlapping(*mouse, *mouse)
-        objects = self.level_canvas.find_overlapping(pos[0] - halo, pos[1] - halo, pos[0] + halo, pos[1] + halo)
-        logging.debug(f'under mouse: {objects}')
-
-        for id in reversed(objects):
-            tags = self.level_canvas.gettags(id)
-            logging.debug(f'tags: {tags}')
-            if tags[0] in ['selection', 'level']:
-                continue
-
-            obj_tag = -1
-            if not tags[obj_tag].startswith('object-'):
-                logging.debug(f'tag not obj: {tags}')
-                obj_tag = -2
-
-            if tags[obj_tag].startswith('object-'):
-                obj = self.level.getObjectById(tags[obj_tag][7::])
-                logging.debug(f'obj: {obj}')
-                if obj == None:
-                    continue
-                else:
-                    logging.debug(f'obj name: {obj.name}')
-            else:
-                continue
-
-            if tags[0] == 'passthrough':
-                continue
-            elif tags[0] == 'object':
-                logging.debug(f'selecting obj: {obj.name}')
-                self.selectObject(obj, event)
-                return 'object', obj
-            elif tags[0] == 'part':
-                self.selectPart(obj, tags[1], id, tags[2])
+        for hit in self.findObjectsAt(pos, halo):
+            if isinstance(hit, tuple):
+                obj, type, property, item = hit
+                logging.debug(f'selecting part: {property} of {obj.name}')
+                self.selectPart(obj, type, item, property)
                 return 'part', obj, self.selectedPart
+            else:
+                logging.debug(f'selecting obj: {hit.name}')
+                self.selectObject(hit, event)
+                return 'object', hit
 
         self.selectObject(None)
 
@@ -1626,6 +2201,35 @@ class WME(tk.Tk):
         elif self.selectedObject:
             self.dragObject(self.selectedObject, event)
 
+    def onLevelRelease(self, event: tk.Event):
+        self.commitPathPoints()
+
+    def commitPathPoints(self, obj: wmwpy.classes.Object | None = None):
+        """Write dragged PathPoints to the object properties and the property panel.
+
+        Args:
+            obj (wmwpy.classes.Object | None, optional): Only write the points of this object. Defaults to every object.
+        """
+        if obj is None:
+            objects = list(self.pendingPathPoints)
+        elif obj in self.pendingPathPoints:
+            objects = [obj]
+        else:
+            return
+
+        for obj in objects:
+            del self.pendingPathPoints[obj]
+            path = self.propertyRecords.get(obj, propertyrecords.PathProperties)
+            obj.properties['PathPoints'] = propertyrecords.format_path_points(path.points, path.points_format)
+
+            if obj == self.selectedObject and 'PathPoints' in self.objectProperties:
+                # the panel always shows the string format, which must not be written back through the variable's trace
+                self._syncingPropertyPanel = True
+                try:
+                    self.objectProperties['PathPoints']['var'][0].set(propertyrecords.format_path_points(path.points, 'str'))
+                finally:
+                    self._syncingPropertyPanel = False
+
     def createLevelContextMenu(self):
         self.levelContextMenu = tk.Menu(self.level_canvas, tearoff = 0)
         self.levelContextMenu.add_command(label = 'add object', command = lambda *args: self.addObjectSelector(self.getRelativeMousePos(self.level_canvas.winfo_pointerxy(), self.level_canvas)))
@@ -1718,8 +2322,7 @@ class WME(tk.Tk):
             amount = numpy.array(amount)
             pos = tuple(obj.pos + amount)
             obj.pos = pos
-            self.updateObject(obj)
-            self._updateParentConnections()
+            self.renderScheduler.mark(obj)
 
             if self.selectedObject == obj:
                 if 'pos' in self.objectProperties:
@@ -1742,26 +2345,75 @@ class WME(tk.Tk):
         if self.selectedPart['type']:
             self.deleteProperty(obj, self.selectedPart['property'])
         else:
-            self.level_canvas.delete(f'object-{str(obj.id)}')
-
-            if obj in self.level.objects:
-                index = self.level.objects.index(obj)
-                del self.level.objects[index]
-
-                self._updateParticleTrajectories()
-                self._updateVacuum()
-                self._updateParentConnections()
+            id = f'object-{str(obj.id)}'
+            record = self.canvasItems.get(id)
+            if record is not None:
+                self.level_canvas.delete(*record.popObjectItems())
+            self.imageCache.discard(obj)
+
+            if obj in self.objectOrder:
+                self.objectOrder.remove(obj)
+                self.objectIds.remove(obj)
+                self.objectNames.remove(obj)
+                self.objectClasses.remove(obj)
+                self.propertyRecords.invalidate(obj)
+                self.overlayPlugins.invalidate(obj)
+                self.levelBounds.remove(obj)
+                self.spatialIndex.remove(obj)
+                self.cullIndex.remove(obj)
+                self.overlayCullIndex.removeOwned(obj)
+                self.materializedObjects.discard(obj)
+                self.spatialIndex.removeOwned(obj)
+
+                self._updateObjectOverlays(obj)
+                self.overlayDependencies.remove(obj.id)
+
+            record = self.canvasItems.pop(id)
+            if record is not None:
+                self.deleteItems(*record.items())
 
             if obj == self.selectedObject:
                 self.selectObject(None)
 
             self.updateObjectSelector()
 
+    def onObjectPropertiesChanged(self, obj: wmwpy.classes.Object, properties: typing.Iterable[str] | None = None):
+        """Update everything that is cached from an object's properties.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+            properties (Iterable[str] | None, optional): The properties that changed. Defaults to all of them.
+        """
+        if properties is not None:
+            properties = list(properties)
+
+        self.objectClasses.add(obj)
+        # properties that were set win over points that are still being dragged
+        self.pendingPathPoints.pop(obj, None)
+        self.propertyRecords.invalidate(obj)
+        self.overlayPlugins.invalidate(obj, properties)
+
+        if properties is None or any(self.overlayPlugins.get('parent').dependsOn(obj, property) for property in properties):
+            # an object that isn't drawn keeps no connections until it's drawn again
+            self.overlayDependencies.remove(obj.id)
+
+    def onObjectPropertiesEdited(self, obj: wmwpy.classes.Object, properties: typing.Iterable[str]):
+        """Redraw an object, and only the overlays that are drawn from the edited properties.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+            properties (Iterable[str]): The properties that changed.
+        """
+        properties = list(properties)
+        self.onObjectPropertiesChanged(obj, properties)
+        overlays = [plugin.name for plugin in self.overlayPlugins.affected(obj, properties) if not plugin.with_object]
+        self.renderScheduler.mark(obj, overlays)
+
     def deleteProperty(self, obj: wmwpy.classes.Object, property: str):
         if property in obj.properties:
             del obj.properties[property]
 
-            self.updateObject(obj)
+            self.onObjectPropertiesEdited(obj, [property])
             if self.selectedObject == obj:
                 self.updateProperties()
 
@@ -1779,6 +2431,7 @@ class WME(tk.Tk):
         if obj == None:
             return
 
+        self.commitPathPoints(obj)
         self.clipboard : wmwpy.classes.Object = obj.copy()
 
     def cutObject(self, obj : wmwpy.classes.Object = None):
@@ -1809,18 +2462,23 @@ class WME(tk.Tk):
             obj = self.getFile(obj)
 
         obj = self.level.addObject(filename = obj, properties = properties, pos = pos, name = name)
+        self.objectOrder.add(obj)
+        self.objectIds.add(obj)
+        self.objectNames.add(obj)
+        self.objectClasses.add(obj)
 
         self.updateObject(obj)
         self.updateObjectSelector()
-        self._updateParentConnections()
+        # also redraws the connections that point at its name
+        self._updateObjectOverlays(obj)
 
         return obj
 
     def changeObjectFilename(self, obj: wmwpy.classes.Object, new_path: str | None):
-        if obj not in self.level.objects:
+        if obj not in self.objectOrder:
             return
 
-        level_index = self.level.objects.index(obj)
+        level_index = self.objectOrder.index(obj)
 
         if new_path == None:
             new_path = filedialog.askopenfilename(
@@ -1843,15 +2501,38 @@ class WME(tk.Tk):
         if new_path == None:
             return
 
-        self.level.objects.remove(obj)
+        self.commitPathPoints(obj)
+        self.objectOrder.remove(obj)
+        self.objectIds.remove(obj)
+        self.objectNames.remove(obj)
+        self.objectClasses.remove(obj)
+        self.propertyRecords.invalidate(obj)
+        self.overlayPlugins.invalidate(obj)
+        self.levelBounds.remove(obj)
+        self.spatialIndex.remove(obj)
+        self.cullIndex.remove(obj)
+        self.overlayCullIndex.removeOwned(obj)
+        self.materializedObjects.discard(obj)
+        self.spatialIndex.removeOwned(obj)
+        self.imageCache.discard(obj)
+        record = self.canvasItems.pop(f'object-{str(obj.id)}')
+        if record is not None:
+            self.deleteItems(*record.items())
 
         new_obj = self.level.addObject(new_path, properties = deepcopy(obj.properties), pos = copy(obj.pos), name = obj.name)
+        self.objectOrder.add(new_obj)
+        self.objectIds.add(new_obj)
+        self.objectNames.add(new_obj)
+        self.objectClasses.add(new_obj)
 
-        self.level.objects.insert(level_index, self.level.objects.pop(self.level.objects.index(new_obj)))
+        self.objectOrder.move(new_obj, level_index)
 
         self.updateObject(new_obj)
+        self.restackObject(new_obj)
         self.updateObjectSelector()
-        self._updateParentConnections()
+        # the connections that pointed at the old object point at its name, which the new object has
+        self.overlayDependencies.remove(obj.id)
+        self._updateObjectOverlays(new_obj)
         if self.selectedObject == obj:
             self.selectObject(new_obj)
 
@@ -1878,6 +2559,9 @@ class WME(tk.Tk):
         if obj == None:
             obj = self.selectedObject
 
+        if obj != None:
+            self.commitPathPoints(obj)
+
         self.resetProperties()
 
         isLevel = False
@@ -2047,37 +2731,25 @@ class WME(tk.Tk):
             if property in obj.properties:
                 del obj.properties[property]
                 if not isLevel:
-                    self.updateObject(obj)
-                    self._updateParticleTrajectories()
-                    if property in ['AngleVariation', 'VacuumBaseAngle', 'VacuumMinAngle', 'VacuumMaxAngle', 'VacuumForce', 'VacuumMaxForce', 'VacuumMaxD', 'VacuumFriction']:
-                        self._updateVacuum()
-                    if property in ['Parent', 'ConnectedSpout', 'ConnectedObject', 'ConnectedConverter'] or property.startswith('ConnectedSpout') or property.startswith('ConnectedObject') or property.startswith('ConnectedConverter'):
-                        self._updateParentConnections()
+                    self.onObjectPropertiesEdited(obj, [property])
                     self.updateProperties(obj)
                 else:
                     self.updateProperties()
 
         def updateProperty(property, value):
+            if self._syncingPropertyPanel:
+                # the panel is showing a value that was already written
+                return
             obj.properties[property] = value
             if not isLevel:
-                self.updateObject(obj)
-                self._updateParticleTrajectories()
-                if property in ['Angle', 'AngleVariation', 'VacuumBaseAngle', 'VacuumMinAngle', 'VacuumMaxAngle', 'VacuumForce', 'VacuumMaxForce', 'VacuumMaxD', 'VacuumFriction', 'VacuumCenterOffsetA', 'VacuumCenterOffsetB']:
-                    self._updateVacuum()
-                if property in ['Parent', 'ConnectedSpout', 'ConnectedObject', 'ConnectedConverter'] or property.startswith('ConnectedSpout') or property.startswith('ConnectedObject') or property.startswith('ConnectedConverter'):
-                    self._updateParentConnections()
+                self.onObjectPropertiesEdited(obj, [property])
 
         def resetProperty(property):
             if property in obj.defaultProperties:
                 obj.properties[property] = obj.defaultProperties[property]
 
-                self.updateObject(obj)
+                self.onObjectPropertiesEdited(obj, [property])
                 self.updateProperties(obj)
-                self._updateParticleTrajectories()
-                if property in ['Angle', 'AngleVariation', 'VacuumBaseAngle', 'VacuumMinAngle', 'VacuumMaxAngle', 'VacuumForce', 'VacuumMaxForce', 'VacuumMaxD', 'VacuumFriction', 'VacuumCenterOffsetA', 'VacuumCenterOffsetB']:
-                    self._updateVacuum()
-                if property in ['Parent', 'ConnectedSpout', 'ConnectedObject', 'ConnectedConverter'] or property.startswith('ConnectedSpout') or property.startswith('ConnectedObject') or property.startswith('ConnectedConverter'):
-                    self._updateParentConnections()
 
         def updatePropertyName(property, newName, skip_unedited = False):
             if newName == property and not skip_unedited:
@@ -2102,7 +2774,7 @@ class WME(tk.Tk):
                 if isLevel:
                     self.updateProperties()
                 else:
-                    self.updateObject(obj)
+                    self.onObjectPropertiesEdited(obj, [property, newName])
                     self.updateProperties(obj)
 
                 self.updateObjectSelector()
@@ -2116,14 +2788,20 @@ class WME(tk.Tk):
 
             obj.pos = tuple(pos)
 
-            self.updateObject(obj)
-            self._updateParentConnections()
+            self.renderScheduler.mark(obj)
 
         def updateObjectName(name):
+            old_name = obj.name
             obj.name = name
+            self.objectNames.rename(obj, old_name)
+            # spouts read OffsetToMouth from a .hs file named after the object
+            self.propertyRecords.invalidate(obj)
+            self.overlayPlugins.invalidate(obj, ['OffsetToMouth'])
             self.updateObject(obj)
             self.updateObjectSelector()
-            self._updateParentConnections()
+            # connections to the old name point at the object, so they are found with the ones that use the new name
+            self.updateOverlay('parent', obj)
+            self.updateOverlay('particleTrajectory', obj)
 
         sizes : list[int] = []
 
@@ -2181,7 +2859,7 @@ class WME(tk.Tk):
                     property_type = property_def.get('type', 'string')
 
                     if property_type == 'object':
-                        options = [o.name for o in self.level.objects if o is not obj]
+                        options = self.objectNames.names(exclude = obj)
                     elif property_type == 'fluid':
                         options = []
                         for material in self.game._LEVEL_MATERIALS:
@@ -2247,6 +2925,7 @@ class WME(tk.Tk):
 
             if property != None:
                 obj.properties[property] = properties.get(property, '')
+                self.onObjectPropertiesEdited(obj, [property])
 
                 self.updateProperties()
 
@@ -2302,20 +2981,21 @@ class WME(tk.Tk):
 
             if 'object' in item['tags']:
                 id = item['values'][2]
-                obj = self.level.getObjectById(id)
+                obj = self.objectIds.get(id)
                 self.selectObject(obj)
                 return obj, item
 
             return None, None
 
         def move_object(obj: wmwpy.classes.Object, target_index: int):
-            self.level.objects.insert(target_index, self.level.objects.pop(self.level.objects.index(obj)))
+            self.objectOrder.move(obj, target_index)
 
-            self.redrawLevel()
+            self.restackObject(obj)
+            self.updateObjectSelector()
             self.selectObject(obj)
 
         def move_to_bottom(obj: wmwpy.classes.Object):
-            current_pos = self.level.objects.index(obj)
+            current_pos = self.objectOrder.index(obj)
 
             if current_pos == len(self.level.objects) - 1:
                 return
@@ -2323,7 +3003,7 @@ class WME(tk.Tk):
             move_object(obj, len(self.level.objects) - 1)
 
         def move_down(obj: wmwpy.classes.Object):
-            current_pos = self.level.objects.index(obj)
+            current_pos = self.objectOrder.index(obj)
 
             if current_pos == len(self.level.objects) - 1:
                 return
@@ -2331,7 +3011,7 @@ class WME(tk.Tk):
             move_object(obj, current_pos + 1)
 
         def move_up(obj: wmwpy.classes.Object):
-            current_pos = self.level.objects.index(obj)
+            current_pos = self.objectOrder.index(obj)
 
             if current_pos == 0:
                 return
@@ -2339,7 +3019,7 @@ class WME(tk.Tk):
             move_object(obj, current_pos - 1)
 
         def move_to_top(obj: wmwpy.classes.Object):
-            current_pos = self.level.objects.index(obj)
+            current_pos = self.objectOrder.index(obj)
 
             if current_pos == 0:
                 return
@@ -2382,56 +3062,65 @@ class WME(tk.Tk):
 
     def updateLevelScroll(self):
         if self.level == None:
-            self.level_canvas.config(scrollregion=(0, 0, 0, 0))
+            self._scrollregion = (0, 0, 0, 0)
+            self.level_canvas.config(scrollregion = self._scrollregion)
             return
 
         LEVEL_CANVAS_PADDING = [200,200]
 
-        level_size = numpy.array(
-            (((self.level.image.size[0] / 2) * -1,
-            (self.level.image.size[1] / 2) * -1),
-            ((self.level.image.size[0] / 2),
-            (self.level.image.size[1] / 2)))
-        )
-
-        objects = self.level_canvas.find_withtag('object')
-        coords = numpy.array([self.level_canvas.coords(id) for id in objects])
-        if len(coords) > 0:
-            coords = coords.swapaxes(0,1)
-        else:
-            coords = numpy.array([[0],[0]])
-
-        min = numpy.array([a.min() for a in coords])
-        max = numpy.array([a.max() for a in coords])
-
-        min = numpy.append(min, level_size[0]).reshape([2,2]).swapaxes(0,1)  - LEVEL_CANVAS_PADDING
-        max = numpy.append(max, level_size[1]).reshape([2,2]).swapaxes(0,1)  + LEVEL_CANVAS_PADDING
+        image_size = numpy.array(self.level.size) * self.getCanvasScale()
+        min = -image_size / 2
+        max = image_size / 2
 
-        # logging.debug(f'{max = }')
-        # logging.debug(f'{min = }')
+        # objects outside of the view aren't on the canvas, so use the level positions instead
+        bounds = self.levelBounds.bounds()
+        if bounds is None:
+            bounds = (0, 0, 0, 0)
 
-        min = [a.min() for a in min]
-        max = [a.max() for a in max]
+        # y is flipped on the canvas
+        corners = numpy.array([self.getObjectPosition(bounds[0:2]), self.getObjectPosition(bounds[2:4])])
+        min = numpy.minimum(min, corners.min(axis = 0)) - LEVEL_CANVAS_PADDING
+        max = numpy.maximum(max, corners.max(axis = 0)) + LEVEL_CANVAS_PADDING
 
-        scrollregion = tuple(numpy.append(min,max))
+        scrollregion = tuple(float(value) for value in numpy.append(min, max))
 
         # logging.debug(f'scrollregion = {scrollregion}')
 
-        self.level_canvas.config(scrollregion = scrollregion)
+        # reconfiguring the scrollregion makes Tk redo the scrollbars, so only do it when it changed
+        if scrollregion != self._scrollregion:
+            self._scrollregion = scrollregion
+            self.level_canvas.config(scrollregion = scrollregion)
 
     def updateLevel(self):
         if self.level == None:
             return
 
-        self.level_canvas.itemconfig(self.level_images['background'], image = self.level.PhotoImage)
+        # everything is about to be redrawn anyway
+        self.renderScheduler.clear()
+        self.objectNames.rebuild(self.level.objects)
+        self.objectIds.rebuild(self.level.objects)
+        self.objectOrder.rebuild(self.level.objects)
+        self.objectClasses.rebuild(self.level.objects)
+        self.levelBounds.rebuild(self.level.objects)
+        # filled in by updateObject
+        self.cullIndex.clear()
+        self.staleViews.clear()
+        self.pendingPathPoints.clear()
+
+        self.updateLevelImage()
 
         logging.info('updating level')
 
         self.selectedObject = None
         self.selectedPart = {'type': None, 'id': None, 'property': None}
         
-        for obj in self.level.objects:
-            self.updateObject(obj)
+        # objects are drawn in level order, so they're already stacked right
+        self._drawingLevel = True
+        try:
+            for obj in self.level.objects:
+                self.updateObject(obj)
+        finally:
+            self._drawingLevel = False
 
         # Defer expensive UI updates until after all objects are drawn
         self.updateProperties()
@@ -2439,9 +3128,7 @@ class WME(tk.Tk):
         self.updateObjectSelector()
 
         # Call the proper update functions that handle both enabling and disabling
-        self._updateParticleTrajectories()
-        self._updateVacuum()
-        self._updateParentConnections()
+        self.updateOverlays()
 
         # Defer scroll updates until after all objects are drawn
         self.updateLevelScroll()
@@ -2451,7 +3138,14 @@ class WME(tk.Tk):
         self.level_canvas.tag_bind('passthrough', '<Button-1>', self.onLevelClick)
 
     def redrawLevel(self):
-        self.level_canvas.delete('object')
+        self.deleteItems(*self.canvasItems.clear())
+        for pool in self.overlayPools.values():
+            pool.clear()
+        self.spatialIndex.clear()
+        self.cullIndex.clear()
+        self.overlayCullIndex.clear()
+        self.materializedObjects.clear()
+        self.detachedOverlays.clear()
         self.level_canvas.delete('selection')
 
         self.updateLevel()
@@ -2461,21 +3155,18 @@ class WME(tk.Tk):
 
         obj.pos = self.windowPosToWMWPos(numpy.array((event.x, event.y)) + self.dragInfo['offset'])
 
-        self.updateObject(obj)
-        self._updateParticleTrajectories()
-        self._updateVacuum()
-        self._updateParentConnections()
+        self.renderScheduler.mark(obj)
 
     def windowPosToWMWPos(self, pos : tuple = (0,0), multiplier: float = OBJECT_MULTIPLIER):
         if isinstance(pos, (int, float)):
-            pos = pos / self.level.scale
+            pos = pos / self.getCanvasScale()
             pos = pos / multiplier
 
             return pos
         else:
             pos = numpy.array((self.level_canvas.canvasx(pos[0]),
                             self.level_canvas.canvasy(pos[1])))
-            pos = pos / self.level.scale
+            pos = pos / self.getCanvasScale()
             pos = pos / numpy.array([multiplier, -multiplier])
 
             return tuple(pos)
@@ -2487,7 +3178,7 @@ class WME(tk.Tk):
         self.selectedPart = {'type': None, 'id': None, 'property': None}
         old_object = self.selectedObject
         self.selectedObject = obj
-        if old_object in self.level.objects:
+        if old_object in self.objectOrder:
             self.updateObject(old_object)
 
         if isinstance(partInfo, dict):
@@ -2501,9 +3192,11 @@ class WME(tk.Tk):
         self.updateObject(obj)
         self.updateProperties()
         self.updateSelectionRectangle()
-        self._updateParticleTrajectories()
-        self._updateVacuum()
-        self._updateParentConnections()
+
+        # overlays don't depend on the selection, but the selected object is drawn even when it's out of view
+        for changed in (old_object, obj):
+            if changed is not None and changed in self.objectOrder:
+                self._updateObjectOverlays(changed)
         if event:
             obj_pos = self.getObjectPosition(obj.pos, obj.offset)
             self.dragInfo['offset'] = numpy.array((obj_pos[0], obj_pos[1])) - (self.level_canvas.canvasx(event.x), self.level_canvas.canvasy(event.y))
@@ -2565,6 +3258,7 @@ class WME(tk.Tk):
 
                 logging.debug(f'new pos: {pos}')
                 obj.properties[self.selectedPart['property']] = ' '.join([str(x) for x in pos])
+                self.onObjectPropertiesChanged(obj, [self.selectedPart['property']])
                 self.objectProperties[self.selectedPart['property']]['var'][0].set(obj.properties[self.selectedPart['property']])
 
             # Handle PathPoints property (new functionality)
@@ -2577,63 +3271,27 @@ class WME(tk.Tk):
 
                 point_index = int(match.group(1))
 
-                # Get current PathPoints data
-                path_points_data = obj.Type.get_property('PathPoints')
-                if not path_points_data:
-                    return
-
-                # Handle both string and list formats
-                if isinstance(path_points_data, str):
-                    # Parse string format: "x1 y1,x2 y2,x3 y3"
-                    points = []
-                    point_pairs = path_points_data.split(',')
-                    for pair in point_pairs:
-                        coords = pair.strip().split()
-                        if len(coords) >= 2:
-                            x, y = float(coords[0]), float(coords[1])
-                            points.append((x, y))
-                elif isinstance(path_points_data, list):
-                    # Use list format directly: [[x1, y1], [x2, y2], [x3, y3]]
-                    points = []
-                    for point in path_points_data:
-                        if isinstance(point, (list, tuple)) and len(point) >= 2:
-                            points.append((float(point[0]), float(point[1])))
-                else:
-                    logging.debug(f'PathPoints has unexpected format: {type(path_points_data)}')
-                    return
-
-                if point_index >= len(points):
+                path = self.propertyRecords.get(obj, propertyrecords.PathProperties)
+                if point_index >= len(path.points):
                     return
 
                 # Calculate new position
                 if amount:
-                    new_pos = numpy.array(points[point_index]) + amount
+                    new_pos = path.points[point_index] + amount
                 else:
                     # Convert mouse position to world coordinates
                     world_pos = self.windowPosToWMWPos((event.x, event.y))
                     # PathPoints are relative to object position
                     new_pos = numpy.array(world_pos) - numpy.array(obj.pos)
 
-                # Update specific point
-                points[point_index] = tuple(new_pos)
+                # only the dragged point changes, the property is written when the drag ends
+                path.points[point_index] = new_pos
+                self.pendingPathPoints[obj] = None
+                self.renderScheduler.mark(obj)
 
-                # Update PathPoints in the same format as received
-                if isinstance(path_points_data, str):
-                    # Rebuild string format
-                    new_path_points = ','.join([f'{x:.4f} {y:.4f}' for x, y in points])
-                else:
-                    # Update list format
-                    new_path_points = [[x, y] for x, y in points]
-
-                # Update object property
-                obj.properties['PathPoints'] = new_path_points
-                if 'PathPoints' in self.objectProperties:
-                    if isinstance(path_points_data, str):
-                        self.objectProperties['PathPoints']['var'][0].set(new_path_points)
-                    else:
-                        # For list format, convert to string for display
-                        display_str = ','.join([f'{x:.4f} {y:.4f}' for x, y in points])
-                        self.objectProperties['PathPoints']['var'][0].set(display_str)
+                if amount:
+                    # nudged with the keyboard, there is no drag to end
+                    self.commitPathPoints(obj)
 
                 logging.debug(f'Updated PathPoints[{point_index}] to {new_pos}')
 
@@ -2719,9 +3377,87 @@ class WME(tk.Tk):
         self.menubar.add_cascade(label = 'View', menu = self.view_menu['menu'])
         self.menubar.add_cascade(label = 'Help', menu = self.help_menu)
 
+    def getViewTag(self, view: str) -> str:
+        """Get the canvas tag of the items that a view setting shows.
+
+        Args:
+            view (str): View setting, e.g. `radius` or `PlatinumType.note`.
+
+        Returns:
+            str: Canvas tag.
+        """
+        return f'view-{view.replace(".", "-")}'
+
+    def getPlatinumType(self, obj: wmwpy.classes.Object) -> str:
+        return obj.properties.get('PlatinumType', obj.defaultProperties.get('PlatinumType', 'none'))
+
+    def isObjectShown(self, obj: wmwpy.classes.Object) -> bool:
+        return self.settings.get(['view.PlatinumType', self.getPlatinumType(obj)], True)
+
+    def markStaleView(self, view: str, objects: typing.Iterable[wmwpy.classes.Object]):
+        """Remember objects that weren't drawn for a view because it is hidden, so they are drawn when it is shown.
+
+        Args:
+            view (str): View setting.
+            objects (Iterable[wmwpy.classes.Object]): The objects.
+        """
+        self.staleViews.setdefault(view, set()).update(objects)
+
     def updateView(self, view: str, state: bool = True):
         self.settings.set(['view', view], state)
-        self.updateLevel()
+
+        if self.level == None:
+            return
+
+        tag = self.getViewTag(view)
+
+        if not state:
+            self.level_canvas.itemconfig(tag, state = 'hidden')
+
+            if view.startswith('PlatinumType.'):
+                # overlays don't have the PlatinumType tag, so they are removed instead
+                platinum_type = view.split('.', 1)[1]
+                objects = [obj for obj in self.level.objects if self.getPlatinumType(obj) == platinum_type]
+                for overlay in self.overlayPlugins.names(with_object = False):
+                    self._deleteOverlay(overlay, [f'object-{str(obj.id)}' for obj in objects])
+        else:
+            # items can be in a PlatinumType group that is still hidden, or be a hidden radius or path
+            hidden = [
+                self.getViewTag(other)
+                for other in [*self.overlayPlugins.names(with_object = True), *[f'PlatinumType.{name}' for name in self.settings.get('view.PlatinumType', {})]]
+                if other != view and not self.settings.get(['view', other], True)
+            ]
+            if len(hidden) > 0:
+                tag = f'{tag}&&!({"||".join(hidden)})'
+            self.level_canvas.itemconfig(tag, state = 'normal')
+
+            stale = [obj for obj in self.staleViews.pop(view, set()) if obj in self.objectOrder]
+
+            if view in self.overlayPlugins.names(with_object = False):
+                if len(stale) >= len(self.level.objects):
+                    self.updateOverlay(view)
+                else:
+                    for obj in stale:
+                        self.updateOverlay(view, obj)
+            else:
+                for obj in stale:
+                    self.updateObject(obj)
+
+                if view.startswith('PlatinumType.'):
+                    platinum_type = view.split('.', 1)[1]
+                    for obj in self.level.objects:
+                        # overlays of objects outside of the view can still reach into it
+                        if self.getPlatinumType(obj) == platinum_type and self.isObjectShown(obj):
+                            self._updateObjectOverlays(obj)
+
+        # the selected object always shows its radius and path
+        if self.selectedObject in self.objectOrder and self.isObjectShown(self.selectedObject):
+            record = self.canvasItems.get(f'object-{str(self.selectedObject.id)}')
+            if record is not None:
+                for item in record.radius + list(record.path.values()):
+                    self.level_canvas.itemconfig(item, state = 'normal')
+
+        self.updateSelectionRectangle()
 
     def showAbout(self):
         about = popups.About(
@@ -2792,6 +3528,7 @@ class WME(tk.Tk):
         if not isinstance(self.level, wmwpy.classes.Level):
             self.updateProgressBar(1, 'No level to be saved.', 1)
             return
+        self.commitPathPoints()
         xml = self.level.export(filename = filename, saveImage = True)
 
         if filename == None:
@@ -2926,6 +3663,22 @@ class WME(tk.Tk):
         logging.debug(f'loadLevel: xml: {xml}')
         logging.debug(f'loadLevel: image: {image}')
 
+        self.renderScheduler.clear()
+        self.imageCache.clear()
+        self.objectClasses.clear()
+        self.propertyRecords.clear()
+        self.overlayPlugins.clear()
+        self.overlayDependencies.clear()
+        self.levelBounds.clear()
+        self.deleteItems(*self.canvasItems.clear())
+        for pool in self.overlayPools.values():
+            pool.clear()
+        self.spatialIndex.clear()
+        self.cullIndex.clear()
+        self.overlayCullIndex.clear()
+        self.materializedObjects.clear()
+        self.detachedOverlays.clear()
+
         if isinstance(self.level, wmwpy.classes.Level):
             self.level_canvas.delete('object')
             self.level_canvas.delete('part')
@@ -2956,6 +3709,14 @@ class WME(tk.Tk):
         logging.debug(f'objects = {self.level.objects}')
 
         self.level.scale = 5
+        # read the spout .hs files in the background while the level is drawn, including ones that changed since they were read
+        self.hsProperties.refresh()
+        self.hsProperties.preload(
+            path
+            for obj in self.level.objects
+            if self.objectClasses.get(obj).is_spout
+            for path in self._getSpoutHSPaths(obj)
+        )
         self.updateLevel()
         logging.info('finished loading level')
         self.state = 'enabled'
@@ -2975,6 +3736,7 @@ class WME(tk.Tk):
             self.saveLevelAs()
 
         if result != None:
+            self.overlayWorker.shutdown()
             self.destroy()
 
     def updateSettings(self):
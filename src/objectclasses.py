@@ -0,0 +1,128 @@
+import typing
+
+import wmwpy
+
+class ObjectClass:
+    __slots__ = (
+        'radius_properties',
+        'is_spout',
+        'has_vacuum_force',
+        'image_properties',
+        'image_prefixes',
+    )
+
+    def __init__(self, obj: wmwpy.classes.Object) -> None:
+        """What an object type can draw, worked out from its Type and default properties.
+
+        Args:
+            obj (wmwpy.classes.Object): An object of this type.
+        """
+        Type = obj.Type
+        default_properties = obj.defaultProperties or {}
+
+        # Type properties that are drawn as a radius circle
+        self.radius_properties: tuple[str, ...] = ()
+        if Type is not None:
+            self.radius_properties = tuple(name for name, prop in Type.PROPERTIES.items() if prop.get('type', 'string') == 'radius')
+
+        self.is_spout = False
+        if not (default_properties.get('TemperatureType') == 'cold' or 'icicle' in default_properties.get('ObjectType', '').lower()):
+            self.is_spout = any(prop in default_properties for prop in ObjectClassIndex.SPOUT_INDICATORS)
+
+        # objects can also get a VacuumForce property of their own, see `ObjectClassIndex.hasVacuumForce`
+        self.has_vacuum_force = Type is not None and 'VacuumForce' in Type.PROPERTIES
+
+        # properties the object image can depend on: the image is rotated by `Angle`, and the Type only reads the properties it declares
+        # numbered properties, like `FluidType#`, are matched by prefix
+        self.image_properties: tuple[str, ...] = ('Angle',)
+        self.image_prefixes: tuple[str, ...] = ()
+        if Type is not None:
+            self.image_properties += tuple(name for name in Type.PROPERTIES if not name.endswith('#') and name != 'Angle')
+            self.image_prefixes = tuple(name.rstrip('#') for name in Type.PROPERTIES if name.endswith('#'))
+
+class ObjectClassIndex:
+    SPOUT_INDICATORS = ('ParticleSpeed', 'Angle', 'ExpulsionAngle', 'FluidType', 'OffsetToMouth')
+
+    CATEGORIES = ('radius', 'spout', 'vacuum')
+
+    def __init__(self) -> None:
+        """Classify level objects once per type, and keep track of which objects can draw each overlay.
+
+        The index has to be told about every object that is added, removed, or has its properties changed.
+        """
+        # (type, filename) -> class
+        self._classes: dict[tuple[str, str | None], ObjectClass] = {}
+        # category -> objects, dicts are used as ordered sets
+        self._members: dict[str, dict[wmwpy.classes.Object, None]] = {category: {} for category in self.CATEGORIES}
+
+    def key(self, obj: wmwpy.classes.Object) -> tuple[str, str | None]:
+        return (obj.type, obj.filename)
+
+    def get(self, obj: wmwpy.classes.Object) -> ObjectClass:
+        """Get the class of an object.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+
+        Returns:
+            ObjectClass: The class, shared by every object with the same Type and file.
+        """
+        key = self.key(obj)
+        object_class = self._classes.get(key)
+        if object_class is None:
+            object_class = self._classes[key] = ObjectClass(obj)
+        return object_class
+
+    def hasVacuumForce(self, obj: wmwpy.classes.Object) -> bool:
+        return self.get(obj).has_vacuum_force or bool(obj.properties and 'VacuumForce' in obj.properties)
+
+    def rebuild(self, objects: typing.Iterable[wmwpy.classes.Object]):
+        """Forget the objects, and index these objects instead. Classes are kept.
+
+        Args:
+            objects (Iterable[wmwpy.classes.Object]): Objects in level order.
+        """
+        for members in self._members.values():
+            members.clear()
+        for obj in objects:
+            self.add(obj)
+
+    def add(self, obj: wmwpy.classes.Object):
+        """Add an object, or update it after its properties changed.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+        """
+        object_class = self.get(obj)
+
+        categories = {
+            'radius': len(object_class.radius_properties) > 0,
+            'spout': object_class.is_spout,
+            'vacuum': self.hasVacuumForce(obj),
+        }
+
+        for category, member in categories.items():
+            if member:
+                self._members[category][obj] = None
+            else:
+                self._members[category].pop(obj, None)
+
+    def remove(self, obj: wmwpy.classes.Object):
+        for members in self._members.values():
+            members.pop(obj, None)
+
+    def objects(self, category: typing.Literal['radius', 'spout', 'vacuum']) -> list[wmwpy.classes.Object]:
+        """Get the objects that can draw something for a category.
+
+        Args:
+            category (Literal['radius', 'spout', 'vacuum']): Category.
+
+        Returns:
+            list[wmwpy.classes.Object]: The objects.
+        """
+        return list(self._members[category])
+
+    def clear(self):
+        self._classes.clear()
+        for members in self._members.values():
+            members.clear()
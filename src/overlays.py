@@ -0,0 +1,287 @@
+import typing
+
+from overlayworker import OverlayWorker
+
+class OverlayDependencies:
+    def __init__(self) -> None:
+        """Keeps track of which objects' overlays point at other objects.
+
+        An overlay owner is the object that draws the overlay, e.g. the child in a `Parent` connection, or the object with a `ConnectedSpout` property. A target is the object the overlay points at. When a target moves, only the overlays of its dependents have to be redrawn. Owners also remember the names they point at, so when an object gets a name, only the overlays that use it have to be redrawn.
+        """
+        self._targets: dict[int, set[int]] = {}
+        self._dependents: dict[int, set[int]] = {}
+        self._names: dict[int, set[str]] = {}
+        self._referencing: dict[str, set[int]] = {}
+
+    def setTargets(self, owner: int, targets: typing.Iterable[int], names: typing.Iterable[str] = ()):
+        """Set the targets that an owner's overlays depend on. This replaces any previous targets.
+
+        Args:
+            owner (int): Id of the object that draws the overlays.
+            targets (Iterable[int]): Ids of the objects the overlays point at.
+            names (Iterable[str], optional): Names the overlays point at, including ones that no object has. Defaults to ().
+        """
+        self.remove(owner)
+
+        targets = set(targets)
+        if len(targets) > 0:
+            self._targets[owner] = targets
+            for target in targets:
+                self._dependents.setdefault(target, set()).add(owner)
+
+        names = set(names)
+        if len(names) > 0:
+            self._names[owner] = names
+            for name in names:
+                self._referencing.setdefault(name, set()).add(owner)
+
+    def remove(self, owner: int):
+        """Forget all dependencies of an owner.
+
+        Args:
+            owner (int): Id of the object that draws the overlays.
+        """
+        for target in self._targets.pop(owner, ()):
+            dependents = self._dependents.get(target)
+            if dependents is None:
+                continue
+            dependents.discard(owner)
+            if len(dependents) == 0:
+                del self._dependents[target]
+
+        for name in self._names.pop(owner, ()):
+            referencing = self._referencing.get(name)
+            if referencing is None:
+                continue
+            referencing.discard(owner)
+            if len(referencing) == 0:
+                del self._referencing[name]
+
+    def dependents(self, target: int) -> set[int]:
+        """Get the owners whose overlays point at an object.
+
+        Args:
+            target (int): Id of the object.
+
+        Returns:
+            set[int]: Owner ids.
+        """
+        return set(self._dependents.get(target, ()))
+
+    def referencing(self, name: str) -> set[int]:
+        """Get the owners whose overlays point at a name.
+
+        Args:
+            name (str): Object name.
+
+        Returns:
+            set[int]: Owner ids.
+        """
+        return set(self._referencing.get(name, ()))
+
+    def clear(self):
+        self._targets.clear()
+        self._dependents.clear()
+        self._names.clear()
+        self._referencing.clear()
+
+class OverlayPlugin:
+    def __init__(
+        self,
+        name: str,
+        compute: typing.Callable[[typing.Any], typing.Any],
+        draw: typing.Callable[..., typing.Any],
+        properties: typing.Iterable[str] | typing.Callable[[typing.Any], typing.Iterable[str]] = (),
+        prefixes: typing.Iterable[str] = (),
+        objects: typing.Callable[[], typing.Iterable[typing.Any]] | None = None,
+        applies: typing.Callable[[typing.Any], bool] | None = None,
+        related: typing.Callable[[typing.Any], typing.Iterable[typing.Any]] | None = None,
+        reset: typing.Callable[[], typing.Any] | None = None,
+        key: typing.Callable[[typing.Any], typing.Hashable] | None = None,
+        snapshot: typing.Callable[[typing.Any], typing.Any] | None = None,
+        cached: bool = True,
+        view_default: bool = True,
+        with_object: bool = False,
+    ) -> None:
+        """Something drawn for level objects, and what it's drawn from.
+
+        Args:
+            name (str): Overlay name. It's also the view setting and canvas layer name.
+            compute (Callable[[object], Any]): Work out what to draw for an object. Returns None if there is nothing to draw.
+            draw (Callable[..., Any]): Draw the result of `compute`.
+            properties (Iterable[str] | Callable[[object], Iterable[str]], optional): Properties `compute` reads, or a function that gets them for an object. Defaults to ().
+            prefixes (Iterable[str], optional): Prefixes of numbered properties `compute` reads, like `ConnectedSpout`. Defaults to ().
+            objects (Callable[[], Iterable[object]] | None, optional): Get every object that can draw the overlay. Defaults to None.
+            applies (Callable[[object], bool] | None, optional): Whether an object can draw the overlay. Defaults to every object.
+            related (Callable[[object], Iterable[object]] | None, optional): Get the objects whose overlay has to be redrawn when an object changes. Defaults to only that object.
+            reset (Callable[[], Any] | None, optional): Called before the overlay is redrawn for every object. Defaults to None.
+            key (Callable[[object], Hashable] | None, optional): Anything else the result depends on, like the object position. The result is computed again when it changes. Defaults to None.
+            snapshot (Callable[[object], Any] | None, optional): Copy what `compute` needs from an object into an immutable value, or None if there is nothing to draw. `compute` then gets the snapshot instead of the object, and can run in a worker thread. Defaults to None.
+            cached (bool, optional): Whether results are kept until the properties change. Defaults to True.
+            view_default (bool, optional): Whether the overlay is shown when the view setting isn't set. Defaults to True.
+            with_object (bool, optional): Whether the overlay is drawn by `updateObject` together with the object images, instead of in its own pass. Defaults to False.
+        """
+        self.name = name
+        self.compute = compute
+        self.draw = draw
+        self.properties = properties
+        self.prefixes = tuple(prefixes)
+        self.objects = objects
+        self.applies = applies
+        self.related = related
+        self.reset = reset
+        self.key = key
+        self.snapshot = snapshot
+        self.cached = cached
+        self.view_default = view_default
+        self.with_object = with_object
+
+    def dependsOn(self, obj: typing.Any, property: str) -> bool:
+        """Check whether the overlay of an object is drawn from a property.
+
+        Args:
+            obj (object): The object.
+            property (str): Property name.
+
+        Returns:
+            bool: Whether it depends on the property.
+        """
+        properties = self.properties(obj) if callable(self.properties) else self.properties
+        return property in properties or property.startswith(self.prefixes)
+
+class OverlayRegistry:
+    def __init__(self, worker: OverlayWorker | None = None, on_result: typing.Callable[[str, typing.Any], typing.Any] | None = None) -> None:
+        """Registered overlay plugins, and the results they computed for each object.
+
+        Results are kept until `invalidate` is called for a property the plugin depends on, so it has to be called whenever an object's properties change.
+
+        Args:
+            worker (OverlayWorker | None, optional): Computes the results of plugins with a `snapshot` in the background. Defaults to computing everything right away.
+            on_result (Callable[[str, object], Any] | None, optional): Called with the overlay name and object when a background result is ready, so it can be drawn. Defaults to None.
+        """
+        self.worker = worker
+        self.on_result = on_result
+
+        self._plugins: dict[str, OverlayPlugin] = {}
+        # object -> overlay -> (key, result)
+        self._results: dict[typing.Any, dict[str, tuple[typing.Hashable, typing.Any]]] = {}
+        # (object, overlay) -> key of the result that is being computed
+        self._pending: dict[tuple[typing.Any, str], typing.Hashable] = {}
+
+    def register(self, plugin: OverlayPlugin) -> OverlayPlugin:
+        self._plugins[plugin.name] = plugin
+        return plugin
+
+    def get(self, name: str) -> OverlayPlugin:
+        return self._plugins[name]
+
+    def names(self, with_object: bool | None = None) -> list[str]:
+        """Get the names of the registered overlays.
+
+        Args:
+            with_object (bool | None, optional): Only get the overlays that are (True) or aren't (False) drawn with the object. Defaults to all of them.
+
+        Returns:
+            list[str]: Overlay names.
+        """
+        return [name for name, plugin in self._plugins.items() if with_object is None or plugin.with_object == with_object]
+
+    def affected(self, obj: typing.Any, properties: typing.Iterable[str]) -> list[OverlayPlugin]:
+        """Get the overlays of an object that depend on any of these properties.
+
+        Args:
+            obj (object): The object.
+            properties (Iterable[str]): Property names.
+
+        Returns:
+            list[OverlayPlugin]: The overlays.
+        """
+        properties = list(properties)
+        return [plugin for plugin in self._plugins.values() if any(plugin.dependsOn(obj, property) for property in properties)]
+
+    def result(self, name: str, obj: typing.Any) -> typing.Any:
+        """Get what an overlay draws for an object, computing it if needed.
+
+        Results of plugins with a `snapshot` are computed by the worker. Until the new result is ready, the previous one is returned, or None if there isn't one.
+
+        Args:
+            name (str): Overlay name.
+            obj (object): The object.
+
+        Returns:
+            Any: The result of the plugin's `compute`.
+        """
+        plugin = self._plugins[name]
+        if not plugin.cached:
+            return plugin.compute(obj)
+
+        key = plugin.key(obj) if plugin.key is not None else None
+        results = self._results.setdefault(obj, {})
+        entry = results.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        if plugin.snapshot is None:
+            entry = results[name] = (key, plugin.compute(obj))
+            return entry[1]
+
+        job = (obj, name)
+        if job in self._pending and self._pending[job] == key and self.worker.isPending(job):
+            # already being computed
+            return entry[1] if entry is not None else None
+
+        snapshot = plugin.snapshot(obj)
+        if snapshot is None:
+            self._cancel(job)
+            results[name] = (key, None)
+            return None
+
+        if self.worker is None:
+            entry = results[name] = (key, plugin.compute(snapshot))
+            return entry[1]
+
+        self._pending[job] = key
+        self.worker.submit(job, plugin.compute, snapshot, lambda result: self._finish(obj, name, key, result))
+        return entry[1] if entry is not None else None
+
+    def _finish(self, obj: typing.Any, name: str, key: typing.Hashable, result: typing.Any):
+        self._pending.pop((obj, name), None)
+        self._results.setdefault(obj, {})[name] = (key, result)
+        if self.on_result is not None:
+            self.on_result(name, obj)
+
+    def _cancel(self, job: tuple[typing.Any, str]):
+        self._pending.pop(job, None)
+        if self.worker is not None:
+            self.worker.cancel(job)
+
+    def invalidate(self, obj: typing.Any, properties: typing.Iterable[str] | None = None):
+        """Forget results of an object.
+
+        Args:
+            obj (object): The object.
+            properties (Iterable[str] | None, optional): Only forget the results that depend on these properties. Defaults to every result.
+        """
+        if properties is None:
+            self._results.pop(obj, None)
+            for name in self._plugins:
+                self._cancel((obj, name))
+            return
+
+        results = self._results.get(obj, {})
+        for plugin in self.affected(obj, properties):
+            results.pop(plugin.name, None)
+            self._cancel((obj, plugin.name))
+
+    def clear(self):
+        """Forget every result, and discard the ones that are being computed. Plugins stay registered."""
+        self._results.clear()
+        self._pending.clear()
+        if self.worker is not None:
+            self.worker.clear()
+
+    def __iter__(self) -> typing.Iterator[OverlayPlugin]:
+        return iter(list(self._plugins.values()))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._plugins
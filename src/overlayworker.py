@@ -0,0 +1,109 @@
+import concurrent.futures
+import logging
+import queue
+import tkinter as tk
+import typing
+
+class OverlayWorker:
+    def __init__(self, widget: tk.Misc, workers: int = 2, poll_interval: int = 10) -> None:
+        """Run overlay computations in a thread pool, and hand the results back on the Tk thread.
+
+        Jobs get their input as an immutable snapshot, so they never touch Tk or level objects. Finished jobs are put in a queue that is polled with `after`. Every job has a key, and only the newest job for a key is delivered; older ones are discarded.
+
+        Args:
+            widget (tk.Misc): Widget used to poll the queue with `after`.
+            workers (int, optional): Number of worker threads. Defaults to 2.
+            poll_interval (int, optional): Time between polls while jobs are running in milliseconds. Defaults to 10.
+        """
+        self.widget = widget
+        self.poll_interval = poll_interval
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers = max(1, workers), thread_name_prefix = 'overlay')
+        self._results: queue.SimpleQueue = queue.SimpleQueue()
+
+        # key -> newest job number
+        self._jobs: dict[typing.Hashable, int] = {}
+        # key -> callback of the newest job
+        self._callbacks: dict[typing.Hashable, typing.Callable[[typing.Any], typing.Any]] = {}
+        self._next_job = 0
+        self._after_id: str | None = None
+
+    def submit(self, key: typing.Hashable, compute: typing.Callable[[typing.Any], typing.Any], snapshot: typing.Any, callback: typing.Callable[[typing.Any], typing.Any]):
+        """Start a job. Any job that is still running for the same key is superseded.
+
+        Args:
+            key (Hashable): What the job computes, like (object, overlay).
+            compute (Callable[[Any], Any]): Function to run in a worker thread.
+            snapshot (Any): Argument for `compute`. It must not be changed while the job runs.
+            callback (Callable[[Any], Any]): Called on the Tk thread with the result.
+        """
+        self._next_job += 1
+        job = self._next_job
+        self._jobs[key] = job
+        self._callbacks[key] = callback
+
+        future = self._executor.submit(compute, snapshot)
+        future.add_done_callback(lambda future: self._results.put((key, job, future)))
+
+        self._schedule()
+
+    def isPending(self, key: typing.Hashable) -> bool:
+        return key in self._jobs
+
+    def cancel(self, key: typing.Hashable):
+        """Discard the result of the job for a key when it finishes.
+
+        Args:
+            key (Hashable): Job key.
+        """
+        self._jobs.pop(key, None)
+        self._callbacks.pop(key, None)
+
+    def clear(self):
+        """Discard the results of every running job."""
+        self._jobs.clear()
+        self._callbacks.clear()
+
+    def shutdown(self):
+        self.clear()
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._executor.shutdown(wait = False, cancel_futures = True)
+
+    def poll(self):
+        """Deliver the results of finished jobs."""
+        self._after_id = None
+
+        while True:
+            try:
+                key, job, future = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if self._jobs.get(key) != job:
+                # superseded or cancelled
+                continue
+
+            del self._jobs[key]
+            callback = self._callbacks.pop(key)
+
+            if future.cancelled():
+                continue
+            exception = future.exception()
+            if exception is not None:
+                logging.debug(f'Overlay job {key} failed: {exception}')
+                callback(None)
+                continue
+
+            callback(future.result())
+
+        self._schedule()
+
+    def _schedule(self):
+        if self._after_id is not None or len(self._jobs) == 0:
+            return
+        self._after_id = self.widget.after(self.poll_interval, self.poll)
+
+    def __len__(self) -> int:
+        return len(self._jobs)
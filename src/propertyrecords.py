@@ -0,0 +1,253 @@
+import logging
+import typing
+
+import numpy
+import wmwpy
+
+def merged_properties(obj: wmwpy.classes.Object) -> dict[str, str]:
+    """Get the properties of an object, with its default properties filled in.
+
+    Args:
+        obj (wmwpy.classes.Object): The object.
+
+    Returns:
+        dict[str, str]: Properties.
+    """
+    properties = dict(obj.defaultProperties) if obj.defaultProperties else {}
+    if obj.properties:
+        properties.update(obj.properties)
+    return properties
+
+def parse_vector(value: str | None, default: tuple[float, float] = (0, 0)) -> tuple[float, ...]:
+    """Parse a space separated vector property, like `VacuumCenterOffsetA`.
+
+    Args:
+        value (str | None): Property value.
+        default (tuple[float, float], optional): Value if the property is missing. Defaults to (0, 0).
+
+    Returns:
+        tuple[float, ...]: The numbers.
+    """
+    if value is None:
+        return default
+    return tuple(float(x) for x in str(value).split())
+
+class SpoutProperties:
+    __slots__ = (
+        'particle_speed',
+        'angle',
+        'expulsion_angle',
+        'fluid_type',
+        'offset_variation',
+        'angle_variation',
+        'particle_variation',
+        'particle_offset',
+        'offset_to_mouth',
+    )
+
+    def __init__(self, obj: wmwpy.classes.Object, offset_to_mouth: typing.Callable[[wmwpy.classes.Object], str | None] | None = None) -> None:
+        """Parsed properties used to draw the particle trajectory of a spout.
+
+        Args:
+            obj (wmwpy.classes.Object): The spout.
+            offset_to_mouth (Callable[[wmwpy.classes.Object], str | None] | None, optional): Looks up `OffsetToMouth` when the object doesn't have it. Defaults to None.
+
+        Raises:
+            ValueError: A property isn't a number.
+        """
+        properties = merged_properties(obj)
+
+        self.particle_speed: float | None = None
+        if 'ParticleSpeed' in properties:
+            self.particle_speed = float(properties.get('ParticleSpeed', 1))
+        elif obj.Type and 'ParticleSpeed' in obj.Type.PROPERTIES:
+            default_prop = obj.Type.PROPERTIES['ParticleSpeed']
+            if 'default' in default_prop:
+                self.particle_speed = float(default_prop['default'])
+
+        self.angle = float(properties.get('Angle', 0))
+        self.expulsion_angle = float(properties.get('ExpulsionAngle', 0))
+        self.fluid_type: str = properties.get('FluidType', 'water').lower()
+
+        self.offset_variation = float(properties.get('OffsetVariation', 0))
+        self.angle_variation = float(properties.get('ExpulsionAngleVariation', 0))
+        self.particle_variation = float(properties.get('ParticleVariation', 0))
+        self.particle_offset = parse_vector(properties.get('ParticleOffset'))
+
+        offset = properties.get('OffsetToMouth', None)
+        if offset is None and offset_to_mouth is not None:
+            offset = offset_to_mouth(obj)
+        self.offset_to_mouth: str = offset if offset is not None else '0 0'
+
+class VacuumProperties:
+    __slots__ = (
+        'spout_type',
+        'fan_type',
+        'angle',
+        'angle_variation',
+        'base_angle',
+        'min_angle',
+        'max_angle',
+        'force',
+        'max_force',
+        'max_d',
+        'friction',
+        'center_offset_A',
+        'center_offset_B',
+    )
+
+    def __init__(self, obj: wmwpy.classes.Object) -> None:
+        """Parsed properties used to draw the vacuum of a drain or fan.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+
+        Raises:
+            ValueError: A property isn't a number.
+        """
+        properties = merged_properties(obj)
+
+        self.spout_type: str = properties.get('SpoutType', None)
+        self.fan_type: str = properties.get('FanType', None)
+
+        if self.spout_type is None:
+            self.spout_type = 'spout'
+        if self.fan_type is None:
+            self.fan_type = 'fan'
+
+        self.angle = float(properties.get('Angle', 0))
+        self.angle_variation = float(properties.get('AngleVariation', 0))
+        self.base_angle = float(properties.get('VacuumBaseAngle', 0))
+        self.min_angle = float(properties.get('VacuumMinAngle', 0))
+        self.max_angle = float(properties.get('VacuumMaxAngle', 0))
+        self.force = float(properties.get('VacuumForce', 0))
+        self.max_force = float(properties.get('VacuumMaxForce', 0))
+        self.max_d = float(properties.get('VacuumMaxD', 0))
+        self.friction = float(properties.get('VacuumFriction', 0))
+
+        self.center_offset_A = list(parse_vector(properties.get('VacuumCenterOffsetA')))
+        self.center_offset_B = list(parse_vector(properties.get('VacuumCenterOffsetB')))
+
+def parse_path_points(value: str | list | None) -> list[tuple[float, float]]:
+    """Parse a `PathPoints` property.
+
+    Args:
+        value (str | list | None): Either a string like `"x1 y1,x2 y2"`, or a list of [x, y] points.
+
+    Raises:
+        ValueError: A coordinate isn't a number.
+
+    Returns:
+        list[tuple[float, float]]: The points.
+    """
+    points = []
+    if isinstance(value, str):
+        for pair in value.split(','):
+            coords = pair.strip().split()
+            if len(coords) >= 2:
+                points.append((float(coords[0]), float(coords[1])))
+    elif isinstance(value, list):
+        for point in value:
+            if isinstance(point, (list, tuple)) and len(point) >= 2:
+                points.append((float(point[0]), float(point[1])))
+    elif value is not None:
+        logging.debug(f'PathPoints has unexpected format: {type(value)}')
+    return points
+
+def format_path_points(points: numpy.ndarray, points_format: str | None) -> str | list[list[float]]:
+    """Turn path points back into a `PathPoints` property.
+
+    Args:
+        points (numpy.ndarray): Points, one row each.
+        points_format (str | None): 'list' for a list of [x, y] points, anything else for a string.
+
+    Returns:
+        str | list[list[float]]: Property value.
+    """
+    if points_format == 'list':
+        return [[float(x), float(y)] for x, y in points]
+    return ','.join([f'{x:.4f} {y:.4f}' for x, y in points])
+
+class PathProperties:
+    __slots__ = (
+        'has_type',
+        'is_global',
+        'is_closed',
+        'path_pos',
+        'points',
+        'points_format',
+    )
+
+    def __init__(self, obj: wmwpy.classes.Object) -> None:
+        """Parsed `PathPos#` and `PathPoints` properties used to draw the path of an object.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+        """
+        Type = obj.Type
+
+        self.has_type = Type is not None
+        self.is_global = False
+        self.is_closed = False
+        # property -> point as it's written in the property, it can have only an x
+        self.path_pos: dict[str, list[float]] = {}
+        # one row per point, edited in place while a point is dragged
+        self.points: numpy.ndarray = numpy.zeros((0, 2))
+        # 'str' or 'list', so edited points can be written back the same way
+        self.points_format: str | None = None
+
+        if Type is None:
+            return
+
+        self.is_global = bool(Type.get_property('PathIsGlobal'))
+        self.is_closed = bool(Type.get_property('PathIsClosed'))
+
+        path_pos = Type.get_properties('PathPos#')
+        if isinstance(path_pos, dict):
+            self.path_pos = {property: list(point) if isinstance(point, list) else [] for property, point in path_pos.items()}
+
+        try:
+            value = Type.get_property('PathPoints')
+        except AttributeError as e:
+            logging.debug(f'PathPoints property not found for {obj.name}: {e}')
+            value = None
+
+        if isinstance(value, (str, list)):
+            self.points_format = 'str' if isinstance(value, str) else 'list'
+        try:
+            self.points = numpy.array(parse_path_points(value), dtype = float).reshape(-1, 2)
+        except (ValueError, IndexError) as e:
+            logging.error(f'Error parsing PathPoints "{value}": {e}')
+
+Record = typing.TypeVar('Record', SpoutProperties, VacuumProperties, PathProperties)
+
+class PropertyRecordCache:
+    def __init__(self) -> None:
+        """Parsed property records of level objects.
+
+        Records are kept until `invalidate` is called for the object, so it has to be called whenever the object's properties change.
+        """
+        self._records: dict[wmwpy.classes.Object, dict[type, typing.Any]] = {}
+
+    def get(self, obj: wmwpy.classes.Object, record_type: type[Record], *args) -> Record:
+        """Get a record, parsing it if needed.
+
+        Args:
+            obj (wmwpy.classes.Object): The object.
+            record_type (type[Record]): `SpoutProperties`, `VacuumProperties` or `PathProperties`.
+            *args: Extra arguments for the record when it's created.
+
+        Returns:
+            Record: The record.
+        """
+        records = self._records.setdefault(obj, {})
+        record = records.get(record_type)
+        if record is None:
+            record = records[record_type] = record_type(obj, *args)
+        return record
+
+    def invalidate(self, obj: wmwpy.classes.Object):
+        self._records.pop(obj, None)
+
+    def clear(self):
+        self._records.clear()
@@ -0,0 +1,380 @@
+import functools
+import itertools
+import math
+import tkinter as tk
+import typing
+
+import numpy
+from PIL import Image, ImageColor, ImageDraw, ImageFont, ImageTk
+
+from spatialindex import Rect, SpatialIndex
+
+# shape ids are negative, so they can't be mistaken for canvas items
+_ids = itertools.count(-1, -1)
+
+class Shape:
+    __slots__ = (
+        'kind',
+        'coords',
+        'options',
+        'bbox',
+    )
+
+    def __init__(self, kind: str, coords: numpy.ndarray, options: dict[str, typing.Any]) -> None:
+        """A canvas item that is drawn into a `RasterLayer` instead.
+
+        Args:
+            kind (str): 'line', 'polygon', 'oval', 'text' or 'image'.
+            coords (numpy.ndarray): Points in canvas coordinates, one row each.
+            options (dict[str, Any]): Canvas item options.
+        """
+        self.kind = kind
+        self.coords = coords
+        self.options = options
+        self.bbox: Rect = self._bbox()
+
+    def _bbox(self) -> Rect:
+        if self.kind == 'text':
+            x, y = self.coords[0]
+            left, top, right, bottom = _font(self.options.get('font')).getbbox(str(self.options.get('text', '')))
+            width = right - left
+            height = bottom - top
+            return (x - width / 2 - 2, y - height / 2 - 2, x + width / 2 + 2, y + height / 2 + 2)
+
+        if self.kind == 'image':
+            x, y = self.coords[0]
+            image: Image.Image = self.options['image']
+            return (x, y, x + image.width, y + image.height)
+
+        # room for the line width and arrow heads
+        padding = float(self.options.get('width', 1)) / 2 + 2
+        if self.options.get('arrow'):
+            padding += max(self.options.get('arrowshape', (8, 10, 3)))
+
+        left, top = self.coords.min(axis = 0) - padding
+        right, bottom = self.coords.max(axis = 0) + padding
+        return (float(left), float(top), float(right), float(bottom))
+
+@functools.lru_cache(maxsize = None)
+def _font(font: tuple | str | None) -> ImageFont.ImageFont:
+    # Tk font sizes are in points
+    size = 10
+    if isinstance(font, tuple) and len(font) >= 2:
+        size = abs(int(font[1]))
+    try:
+        return ImageFont.load_default(round(size * 4 / 3))
+    except (TypeError, OSError):
+        return ImageFont.load_default()
+
+class RasterLayer:
+    def __init__(self, canvas: tk.Canvas, tags: tuple[str, ...] = ()) -> None:
+        """Draw canvas shapes into one image instead of creating a canvas item for each.
+
+        It has the same `create_*` methods as the canvas, so drawing code can use either. The image covers the view plus a margin, and is shown as one canvas item. Changes are collected as dirty rectangles, and only those parts are drawn again when the layer is flushed after the current event.
+
+        Args:
+            canvas (tk.Canvas): The canvas.
+            tags (tuple[str, ...], optional): Tags of the image item. Defaults to ().
+        """
+        self.canvas = canvas
+        self.margin = 0
+
+        self.item = self.canvas.create_image(0, 0, anchor = 'nw', tags = tags)
+
+        self._shapes: dict[int, Shape] = {}
+        self._index = SpatialIndex(256)
+
+        # part of the canvas the image covers, (left, top, right, bottom)
+        self._viewport: tuple[int, int, int, int] | None = None
+        self._image: Image.Image | None = None
+        self._photo: ImageTk.PhotoImage | None = None
+        self._dirty: list[Rect] = []
+        self._flush: str | None = None
+
+    def create_line(self, *coords, **options) -> int:
+        return self._add('line', coords, options)
+
+    def create_polygon(self, *coords, **options) -> int:
+        return self._add('polygon', coords, options)
+
+    def create_oval(self, *coords, **options) -> int:
+        return self._add('oval', coords, options)
+
+    def create_circle(self, x: float, y: float, r: float, **options) -> int:
+        return self._add('oval', (x - r, y - r, x + r, y + r), options)
+
+    def create_text(self, x: float, y: float, **options) -> int:
+        return self._add('text', (x, y), options)
+
+    def create_image(self, x: float, y: float, **options) -> int:
+        """Add an image.
+
+        Args:
+            x (float): Left side, only `anchor = 'nw'` is supported.
+            y (float): Top side.
+            image (Image.Image): PIL image, not a Tk image.
+
+        Returns:
+            int: Shape id.
+        """
+        return self._add('image', (x, y), options)
+
+    def delete(self, *ids: int):
+        """Remove shapes. Ids that aren't in this layer are ignored.
+
+        Args:
+            *ids (int): Shape ids.
+        """
+        for id in ids:
+            shape = self._shapes.pop(id, None)
+            if shape is None:
+                continue
+            self._index.remove(id)
+            self._invalidate(shape.bbox)
+
+    def bbox(self, *ids: int) -> Rect | None:
+        """Get the bounds of shapes, like `canvas.bbox`. Ids that aren't in this layer are ignored.
+
+        Args:
+            *ids (int): Shape ids.
+
+        Returns:
+            Rect | None: (left, top, right, bottom), or None if none of the shapes are in this layer.
+        """
+        boxes = [self._shapes[id].bbox for id in ids if id in self._shapes]
+        if len(boxes) == 0:
+            return None
+
+        return (
+            min(box[0] for box in boxes),
+            min(box[1] for box in boxes),
+            max(box[2] for box in boxes),
+            max(box[3] for box in boxes),
+        )
+
+    def clear(self):
+        self._shapes.clear()
+        self._index.clear()
+        self._viewport = None
+        self._schedule()
+
+    def scale(self, factor: float):
+        """Scale shape positions around (0, 0), like `canvas.scale`. Line widths, text and images keep their size.
+
+        Args:
+            factor (float): Scale factor.
+        """
+        self._index.clear()
+        for id, shape in self._shapes.items():
+            shape.coords = shape.coords * factor
+            shape.bbox = shape._bbox()
+            self._index.insert(id, shape.bbox)
+
+        self._viewport = None
+        self._schedule()
+
+    def flush(self):
+        """Draw the dirty parts of the image, or the whole image if the view left the part it covers."""
+        if self._flush is not None:
+            self.canvas.after_cancel(self._flush)
+            self._flush = None
+
+        visible = self._visible()
+        if self._viewport is None or not self._contains(self._viewport, visible):
+            self._render(visible)
+            return
+
+        dirty = self._dirty
+        self._dirty = []
+        if len(dirty) > 16:
+            dirty = [(
+                min(rect[0] for rect in dirty),
+                min(rect[1] for rect in dirty),
+                max(rect[2] for rect in dirty),
+                max(rect[3] for rect in dirty),
+            )]
+
+        left, top, right, bottom = self._viewport
+        for rect in dirty:
+            box = (
+                max(left, math.floor(rect[0])),
+                max(top, math.floor(rect[1])),
+                min(right, math.ceil(rect[2])),
+                min(bottom, math.ceil(rect[3])),
+            )
+            if box[0] >= box[2] or box[1] >= box[3]:
+                continue
+
+            region = self._draw(box)
+            x = box[0] - left
+            y = box[1] - top
+            self._image.paste(region, (x, y))
+
+            # replace that part of the Tk image, instead of making a new one
+            region_photo = ImageTk.PhotoImage(region)
+            self.canvas.tk.call(str(self._photo), 'copy', str(region_photo), '-to', x, y, '-compositingrule', 'set')
+
+    def _add(self, kind: str, coords: typing.Iterable[float], options: dict[str, typing.Any]) -> int:
+        id = next(_ids)
+
+        shape = Shape(kind, numpy.array(coords, dtype = float).reshape(-1, 2), options)
+        self._shapes[id] = shape
+        self._index.insert(id, shape.bbox)
+        self._invalidate(shape.bbox)
+
+        return id
+
+    def _invalidate(self, rect: Rect):
+        self._dirty.append(rect)
+        self._schedule()
+
+    def _schedule(self):
+        if self._flush is None:
+            self._flush = self.canvas.after_idle(self.flush)
+
+    def _visible(self) -> tuple[int, int, int, int]:
+        return (
+            math.floor(self.canvas.canvasx(0)),
+            math.floor(self.canvas.canvasy(0)),
+            math.ceil(self.canvas.canvasx(self.canvas.winfo_width())),
+            math.ceil(self.canvas.canvasy(self.canvas.winfo_height())),
+        )
+
+    def _contains(self, outer: tuple[int, int, int, int], inner: tuple[int, int, int, int]) -> bool:
+        return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+    def _render(self, visible: tuple[int, int, int, int]):
+        self._dirty = []
+        self._viewport = (
+            visible[0] - self.margin,
+            visible[1] - self.margin,
+            visible[2] + self.margin,
+            visible[3] + self.margin,
+        )
+
+        self._image = self._draw(self._viewport)
+        self._photo = ImageTk.PhotoImage(self._image)
+
+        self.canvas.itemconfig(self.item, image = self._photo)
+        self.canvas.coords(self.item, self._viewport[0], self._viewport[1])
+
+    def _draw(self, box: tuple[int, int, int, int]) -> Image.Image:
+        """Draw the shapes in part of the canvas.
+
+        Args:
+            box (tuple[int, int, int, int]): (left, top, right, bottom) in canvas coordinates.
+
+        Returns:
+            Image.Image: RGBA image of that part.
+        """
+        image = Image.new('RGBA', (max(1, box[2] - box[0]), max(1, box[3] - box[1])), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image, 'RGBA')
+        origin = numpy.array(box[:2], dtype = float)
+
+        # oldest first, like canvas items
+        for id in sorted(self._index.query(box), reverse = True):
+            shape = self._shapes[id]
+            points = [tuple(point) for point in shape.coords - origin]
+            options = shape.options
+
+            if shape.kind == 'line':
+                fill = self._color(options.get('fill', 'black'))
+                if fill is None:
+                    continue
+                width = max(1, round(float(options.get('width', 1))))
+                if options.get('dash'):
+                    self._drawDashed(draw, points, fill, width, options['dash'])
+                else:
+                    draw.line(points, fill = fill, width = width)
+                if options.get('arrow') in ('last', 'both') and len(points) >= 2:
+                    self._drawArrowHead(draw, points[-2], points[-1], fill, options.get('arrowshape', (8, 10, 3)))
+                if options.get('arrow') in ('first', 'both') and len(points) >= 2:
+                    self._drawArrowHead(draw, points[1], points[0], fill, options.get('arrowshape', (8, 10, 3)))
+            elif shape.kind == 'polygon':
+                draw.polygon(points, fill = self._color(options.get('fill', 'black')), outline = self._color(options.get('outline', '')))
+            elif shape.kind == 'oval':
+                draw.ellipse(
+                    (points[0], points[1]),
+                    fill = self._color(options.get('fill', '')),
+                    outline = self._color(options.get('outline', 'black')),
+                    width = max(1, round(float(options.get('width', 1)))),
+                )
+            elif shape.kind == 'text':
+                fill = self._color(options.get('fill', 'black'))
+                if fill is None:
+                    continue
+                text = str(options.get('text', ''))
+                font = _font(options.get('font'))
+                left, top, right, bottom = draw.textbbox((0, 0), text, font = font)
+                x, y = points[0]
+                draw.text((x - (left + right) / 2, y - (top + bottom) / 2), text, fill = fill, font = font)
+            elif shape.kind == 'image':
+                self._paste(image, options['image'], points[0])
+
+        return image
+
+    def _paste(self, image: Image.Image, source: Image.Image, pos: tuple[float, float]):
+        # alpha_composite can't take a position outside of the image, so crop the source instead
+        x, y = round(pos[0]), round(pos[1])
+        crop = (max(0, -x), max(0, -y), min(source.width, image.width - x), min(source.height, image.height - y))
+        if crop[0] >= crop[2] or crop[1] >= crop[3]:
+            return
+        image.alpha_composite(source.convert('RGBA'), (x + crop[0], y + crop[1]), crop)
+
+    def _color(self, color: str | None) -> tuple[int, int, int] | None:
+        if not color:
+            return None
+        return _rgb(self.canvas, color)
+
+    def _drawArrowHead(self, draw: ImageDraw.ImageDraw, start: tuple[float, float], end: tuple[float, float], fill, shape: tuple[float, float, float]):
+        # Tk's arrowshape is (length along the line, length to the outer corners, width)
+        length, outer, width = shape
+        direction = numpy.array(end) - numpy.array(start)
+        norm = numpy.linalg.norm(direction)
+        if norm == 0:
+            return
+        direction /= norm
+        normal = numpy.array((-direction[1], direction[0]))
+
+        tip = numpy.array(end)
+        back = tip - direction * length
+        corner = tip - direction * outer
+        draw.polygon([tuple(tip), tuple(corner + normal * width), tuple(back), tuple(corner - normal * width)], fill = fill)
+
+    def _drawDashed(self, draw: ImageDraw.ImageDraw, points: list[tuple[float, float]], fill, width: int, dash: tuple[float, ...]):
+        pattern = itertools.cycle(dash)
+        on = True
+        remaining = next(pattern)
+
+        for start, end in zip(points, points[1:]):
+            start = numpy.array(start)
+            end = numpy.array(end)
+            length = numpy.linalg.norm(end - start)
+            if length == 0:
+                continue
+            direction = (end - start) / length
+
+            distance = 0.0
+            while distance < length:
+                step = min(remaining, length - distance)
+                if on:
+                    draw.line((tuple(start + direction * distance), tuple(start + direction * (distance + step))), fill = fill, width = width)
+                distance += step
+                remaining -= step
+                if remaining <= 0:
+                    on = not on
+                    remaining = next(pattern)
+
+@functools.lru_cache(maxsize = 256)
+def _rgb_name(color: str) -> tuple[int, int, int] | None:
+    try:
+        return ImageColor.getrgb(color)[:3]
+    except ValueError:
+        return None
+
+def _rgb(canvas: tk.Canvas, color: str) -> tuple[int, int, int]:
+    rgb = _rgb_name(color)
+    if rgb is None:
+        # a Tk color name that PIL doesn't know
+        rgb = tuple(value >> 8 for value in canvas.winfo_rgb(color))
+    return rgb
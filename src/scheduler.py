@@ -0,0 +1,75 @@
+import time
+import tkinter as tk
+import typing
+
+class RenderScheduler:
+    def __init__(
+        self,
+        widget: tk.Misc,
+        callback: typing.Callable[[dict[typing.Any, set[str]]], typing.Any],
+        overlays: typing.Callable[[], typing.Iterable[str]],
+        frame_budget: int = 16,
+    ) -> None:
+        """Coalesce redraw requests, and flush them at most once per frame.
+
+        Args:
+            widget (tk.Misc): Widget used to schedule the flush with `after`.
+            callback (Callable[[dict[object, set[str]]], Any]): Called on flush with every dirty object, mapped to the overlays that need to be redrawn for it.
+            overlays (Callable[[], Iterable[str]]): Get the names of the overlays to redraw when `mark` isn't given any, so overlays registered later are included.
+            frame_budget (int, optional): Minimum time between flushes in milliseconds. Defaults to 16.
+        """
+        self.widget = widget
+        self.callback = callback
+        self.overlays = overlays
+        self.frame_budget = frame_budget
+
+        self._dirty: dict[typing.Any, set[str]] = {}
+        self._after_id: str | None = None
+        self._last_flush = 0.0
+
+    def mark(self, obj: typing.Any, overlays: typing.Iterable[str] | None = None):
+        """Mark an object as dirty.
+
+        Args:
+            obj (Any): Object to redraw.
+            overlays (Iterable[str] | None, optional): Overlays to redraw for this object. Defaults to all overlays.
+        """
+        if overlays is None:
+            overlays = self.overlays()
+        self._dirty.setdefault(obj, set()).update(overlays)
+        self._schedule()
+
+    def _schedule(self):
+        if self._after_id is not None:
+            return
+
+        elapsed = (time.perf_counter() - self._last_flush) * 1000
+        if elapsed >= self.frame_budget:
+            self._after_id = self.widget.after_idle(self.flush)
+        else:
+            self._after_id = self.widget.after(int(self.frame_budget - elapsed) + 1, self.flush)
+
+    def flush(self):
+        """Redraw everything that is dirty right now.
+        """
+        self.cancel()
+
+        dirty = self._dirty
+        self._dirty = {}
+        self._last_flush = time.perf_counter()
+
+        if len(dirty) > 0:
+            self.callback(dirty)
+
+    def cancel(self):
+        """Cancel the scheduled flush. Dirty objects are kept.
+        """
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def clear(self):
+        """Cancel the scheduled flush, and forget all dirty objects.
+        """
+        self.cancel()
+        self._dirty.clear()
@@ -0,0 +1,147 @@
+import math
+import typing
+
+Rect = tuple[float, float, float, float]
+
+class SpatialIndex:
+    def __init__(self, cell_size: float = 128) -> None:
+        """Uniform grid of rectangles, for finding what is under the mouse or inside a selection without asking the canvas.
+
+        Args:
+            cell_size (float, optional): Grid cell width and height. Defaults to 128.
+        """
+        self.cell_size = cell_size
+
+        # key -> (rect, cells)
+        self._entries: dict[typing.Hashable, tuple[Rect, list[tuple[int, int]]]] = {}
+        # cell -> keys, dicts are used as ordered sets
+        self._cells: dict[tuple[int, int], dict[typing.Hashable, None]] = {}
+        # owner -> keys
+        self._owned: dict[typing.Hashable, dict[typing.Hashable, None]] = {}
+        # key -> owner
+        self._owners: dict[typing.Hashable, typing.Hashable] = {}
+
+    def insert(self, key: typing.Hashable, rect: Rect, owner: typing.Hashable | None = None):
+        """Add a rectangle, or move it if the key is already in the index.
+
+        Args:
+            key (Hashable): Key to find the rectangle with.
+            rect (Rect): (left, top, right, bottom).
+            owner (Hashable | None, optional): Something the rectangle belongs to, so all of its rectangles can be removed with `removeOwned`. Defaults to None.
+        """
+        rect = (
+            min(rect[0], rect[2]),
+            min(rect[1], rect[3]),
+            max(rect[0], rect[2]),
+            max(rect[1], rect[3]),
+        )
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == rect and self._owners.get(key) == owner:
+            return
+
+        self.remove(key)
+
+        cells = list(self._cellsIn(rect))
+        for cell in cells:
+            self._cells.setdefault(cell, {})[key] = None
+        self._entries[key] = (rect, cells)
+
+        if owner is not None:
+            self._owned.setdefault(owner, {})[key] = None
+            self._owners[key] = owner
+
+    def remove(self, key: typing.Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        for cell in entry[1]:
+            keys = self._cells[cell]
+            keys.pop(key, None)
+            if len(keys) == 0:
+                del self._cells[cell]
+
+        owner = self._owners.pop(key, None)
+        if owner is not None:
+            owned = self._owned[owner]
+            owned.pop(key, None)
+            if len(owned) == 0:
+                del self._owned[owner]
+
+    def removeOwned(self, owner: typing.Hashable):
+        """Remove every rectangle that was inserted with this owner.
+
+        Args:
+            owner (Hashable): The owner.
+        """
+        for key in list(self._owned.get(owner, ())):
+            self.remove(key)
+
+    def get(self, key: typing.Hashable) -> Rect | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry[0]
+
+    def query(self, rect: Rect) -> list[typing.Hashable]:
+        """Find the rectangles that overlap a rectangle.
+
+        Args:
+            rect (Rect): (left, top, right, bottom).
+
+        Returns:
+            list[Hashable]: Keys of the overlapping rectangles.
+        """
+        left, top, right, bottom = (
+            min(rect[0], rect[2]),
+            min(rect[1], rect[3]),
+            max(rect[0], rect[2]),
+            max(rect[1], rect[3]),
+        )
+
+        found = {}
+        for cell in self._cellsIn((left, top, right, bottom)):
+            for key in self._cells.get(cell, ()):
+                if key in found:
+                    continue
+                other = self._entries[key][0]
+                if other[0] <= right and other[2] >= left and other[1] <= bottom and other[3] >= top:
+                    found[key] = None
+
+        return list(found)
+
+    def queryPoint(self, x: float, y: float, halo: float = 0) -> list[typing.Hashable]:
+        """Find the rectangles within `halo` of a point.
+
+        Args:
+            x (float): X position.
+            y (float): Y position.
+            halo (float, optional): Distance around the point. Defaults to 0.
+
+        Returns:
+            list[Hashable]: Keys of the rectangles.
+        """
+        return self.query((x - halo, y - halo, x + halo, y + halo))
+
+    def clear(self):
+        self._entries.clear()
+        self._cells.clear()
+        self._owned.clear()
+        self._owners.clear()
+
+    def _cellsIn(self, rect: Rect) -> typing.Iterator[tuple[int, int]]:
+        first_column = math.floor(rect[0] / self.cell_size)
+        last_column = math.floor(rect[2] / self.cell_size)
+        first_row = math.floor(rect[1] / self.cell_size)
+        last_row = math.floor(rect[3] / self.cell_size)
+
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                yield (column, row)
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
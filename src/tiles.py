@@ -0,0 +1,125 @@
+import math
+import tkinter as tk
+
+from PIL import Image, ImageTk
+
+from imagecache import RotatedImageCache
+
+class TiledImage:
+    def __init__(self, canvas: tk.Canvas, cache: RotatedImageCache, tile_size: int = 256, tags: tuple[str, ...] = ('level',)) -> None:
+        """Show a scaled up image on a canvas as tiles, centered on (0, 0).
+
+        Only the tiles in view have canvas items. Tile images are rendered straight from the source image, so the whole scaled image is never created, and they are cached per scale.
+
+        Args:
+            canvas (tk.Canvas): The canvas.
+            cache (RotatedImageCache): Cache to keep tile images in.
+            tile_size (int, optional): Tile width and height in canvas pixels. Defaults to 256.
+            tags (tuple[str, ...], optional): Tags of the tile items. Defaults to ('level',).
+        """
+        self.canvas = canvas
+        self.cache = cache
+        self.tile_size = tile_size
+        self.tags = tags
+
+        self.source: Image.Image | None = None
+        self.scale: float = 1
+
+        # (column, row) -> (item, image)
+        self._tiles: dict[tuple[int, int], tuple[int, ImageTk.PhotoImage]] = {}
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """Scaled image size in canvas pixels."""
+        if self.source is None:
+            return (0, 0)
+        return (max(1, round(self.source.width * self.scale)), max(1, round(self.source.height * self.scale)))
+
+    def setSource(self, image: Image.Image | None, scale: float):
+        """Change the image or its scale. Call `update` afterwards to show it.
+
+        Args:
+            image (Image.Image | None): Unscaled source image.
+            scale (float): Canvas pixels per source pixel.
+        """
+        if image is not self.source:
+            self.cache.discard(self)
+            self.clear()
+        elif scale != self.scale:
+            self.clear()
+
+        self.source = image
+        self.scale = scale
+
+    def update(self, viewport: tuple[float, float, float, float]):
+        """Create the tiles in view and delete the others.
+
+        Args:
+            viewport (tuple[float, float, float, float]): (left, top, right, bottom) in canvas coordinates.
+        """
+        if self.source is None:
+            self.clear()
+            return
+
+        width, height = self.size
+        left = -width / 2
+        top = -height / 2
+
+        columns = math.ceil(width / self.tile_size)
+        rows = math.ceil(height / self.tile_size)
+
+        first_column = max(0, math.floor((viewport[0] - left) / self.tile_size))
+        last_column = min(columns - 1, math.floor((viewport[2] - left) / self.tile_size))
+        first_row = max(0, math.floor((viewport[1] - top) / self.tile_size))
+        last_row = min(rows - 1, math.floor((viewport[3] - top) / self.tile_size))
+
+        visible = {
+            (column, row)
+            for column in range(first_column, last_column + 1)
+            for row in range(first_row, last_row + 1)
+        }
+
+        for tile in [tile for tile in self._tiles if tile not in visible]:
+            item, image = self._tiles.pop(tile)
+            self.canvas.delete(item)
+
+        for tile in visible:
+            if tile in self._tiles:
+                continue
+
+            column, row = tile
+            image = self.cache.get(
+                self,
+                tile,
+                0,
+                (self.scale, self.tile_size),
+                lambda angle, column = column, row = row: self._renderTile(column, row),
+                quantize = False,
+            )
+            item = self.canvas.create_image(
+                left + column * self.tile_size,
+                top + row * self.tile_size,
+                anchor = 'nw',
+                image = image,
+                tags = self.tags,
+            )
+            # the background goes below everything else
+            self.canvas.tag_lower(item)
+            self._tiles[tile] = (item, image)
+
+    def _renderTile(self, column: int, row: int) -> Image.Image:
+        width, height = self.size
+
+        x0 = column * self.tile_size
+        y0 = row * self.tile_size
+        x1 = min(x0 + self.tile_size, width)
+        y1 = min(y0 + self.tile_size, height)
+
+        box = (x0 / self.scale, y0 / self.scale, x1 / self.scale, y1 / self.scale)
+        return self.source.resize((x1 - x0, y1 - y0), resample = Image.NEAREST, box = box)
+
+    def clear(self):
+        """Delete every tile item."""
+        for item, image in self._tiles.values():
+            self.canvas.delete(item)
+        self._tiles.clear()
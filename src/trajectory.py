@@ -0,0 +1,99 @@
+import math
+import numpy
+
+GRAVITY = 9.8
+
+def exit_time(
+    origin: tuple[float, float],
+    velocity: tuple[float, float],
+    gravity: float,
+    bounds: tuple[float, float, float, float],
+) -> float:
+    """Get the time a particle leaves a rectangle.
+
+    The particle moves along `x = x0 + vx*t` and `y = y0 + vy*t - gravity/2*t^2`.
+
+    Args:
+        origin (tuple[float, float]): Start position (x, y).
+        velocity (tuple[float, float]): Start velocity (x, y).
+        gravity (float): Downward acceleration. Use a negative value for particles that rise, e.g. steam.
+        bounds (tuple[float, float, float, float]): Rectangle (min x, min y, max x, max y).
+
+    Returns:
+        float: Time of the first boundary crossing. `0` if the origin is outside the bounds, `inf` if it never leaves.
+    """
+    x0, y0 = origin
+    vx, vy = velocity
+    min_x, min_y, max_x, max_y = bounds
+
+    if not (min_x <= x0 <= max_x and min_y <= y0 <= max_y):
+        return 0.0
+
+    times = [math.inf]
+
+    if vx > 0:
+        times.append((max_x - x0) / vx)
+    elif vx < 0:
+        times.append((min_x - x0) / vx)
+
+    a = -gravity / 2
+    for edge in (min_y, max_y):
+        c = y0 - edge
+        if a == 0:
+            if vy != 0:
+                times.append(-c / vy)
+            continue
+
+        discriminant = vy * vy - 4 * a * c
+        if discriminant < 0:
+            continue
+
+        root = math.sqrt(discriminant)
+        times.extend(((-vy - root) / (2 * a), (-vy + root) / (2 * a)))
+
+    return min(t for t in times if t > 0)
+
+def particle_trajectory(
+    origin: tuple[float, float],
+    speed: float,
+    angle: float,
+    gravity: float = GRAVITY,
+    bounds: tuple[float, float, float, float] = None,
+    max_time: float = 100,
+    time_step: float = 0.05,
+) -> numpy.ndarray:
+    """Get the path of a particle shot from a spout.
+
+    The whole arc is computed at once, and the last point is placed exactly where the arc leaves `bounds`.
+
+    Args:
+        origin (tuple[float, float]): Start position (x, y).
+        speed (float): Start speed.
+        angle (float): Direction in degrees, counter-clockwise from the x axis.
+        gravity (float, optional): Downward acceleration. Use a negative value for particles that rise, e.g. steam. Defaults to 9.8.
+        bounds (tuple[float, float, float, float], optional): Rectangle (min x, min y, max x, max y) to clip the path to. Defaults to no clipping.
+        max_time (float, optional): Maximum time to simulate. Defaults to 100.
+        time_step (float, optional): Time between points. Defaults to 0.05.
+
+    Returns:
+        numpy.ndarray: Points with shape (n, 2). Empty if the origin is outside the bounds.
+    """
+    angle = math.radians(angle)
+    velocity = (speed * math.cos(angle), speed * math.sin(angle))
+
+    end = max_time
+    if bounds is not None:
+        end = min(end, exit_time(origin, velocity, gravity, bounds))
+
+    if end <= 0:
+        return numpy.empty((0, 2))
+
+    t = numpy.arange(0, end, time_step)
+    if t[-1] < end:
+        t = numpy.append(t, end)
+
+    points = numpy.empty((len(t), 2))
+    points[:, 0] = origin[0] + velocity[0] * t
+    points[:, 1] = origin[1] + velocity[1] * t - (gravity / 2) * t * t
+
+    return points
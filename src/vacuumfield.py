@@ -0,0 +1,308 @@
+import functools
+import math
+
+import numpy
+from PIL import Image, ImageDraw, ImageFont, ImageTk
+
+from propertyrecords import VacuumProperties
+
+# canvas pixels per level unit at zoom 1
+UNIT = 5
+
+FIELD_COLUMNS = 24
+FIELD_ROWS = 12
+ARROW_COLUMNS = 6
+ARROW_ROWS = 4
+
+def field_corners(vacuum: VacuumProperties, scale: float) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """Get the corners of the area a drain pulls from.
+
+    `A` and `B` are the center offsets, the ends of the segment particles are pulled to. `A'` and `B'` are `VacuumMaxD` away from them, in the directions of `VacuumMinAngle` and `VacuumMaxAngle`.
+
+    Args:
+        vacuum (VacuumProperties): Vacuum properties.
+        scale (float): Canvas pixels per level unit.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]: A, B, A' and B' in canvas pixels, relative to the drain.
+    """
+    x_axis_angle = math.radians(-vacuum.angle + vacuum.base_angle)
+    cos_angle = math.cos(x_axis_angle)
+    sin_angle = math.sin(x_axis_angle)
+
+    def center(offset: list[float]) -> numpy.ndarray:
+        if len(offset) < 2:
+            return numpy.zeros(2)
+        return numpy.array((
+            -offset[0] * scale * cos_angle - offset[1] * scale * sin_angle,
+            -offset[0] * scale * sin_angle + offset[1] * scale * cos_angle,
+        ))
+
+    def reach(point: numpy.ndarray, angle: float) -> numpy.ndarray:
+        if vacuum.max_d <= 0:
+            return point
+        angle = x_axis_angle + math.radians(180 - angle)
+        return point + vacuum.max_d * scale * numpy.array((math.cos(angle), math.sin(angle)))
+
+    point_A = center(vacuum.center_offset_A)
+    point_B = center(vacuum.center_offset_B)
+
+    return point_A, point_B, reach(point_A, vacuum.min_angle), reach(point_B, vacuum.max_angle)
+
+def sample_field(
+    corners: tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray],
+    force: float,
+    max_force: float,
+    columns: int,
+    rows: int,
+) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """Sample the force of a drain on a grid that spans its area.
+
+    Columns go from `A` to `B` and rows from the center segment out to `VacuumMaxD`. The force is `VacuumMaxForce` at the center segment and falls off linearly to `VacuumForce` at the far edge, and points back to the center segment.
+
+    Args:
+        corners (tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]): From `field_corners`.
+        force (float): `VacuumForce`.
+        max_force (float): `VacuumMaxForce`.
+        columns (int): Number of cells across.
+        rows (int): Number of cells outward.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]: Grid corners with shape (rows + 1, columns + 1, 2), and the position (rows, columns, 2), force (rows, columns) and direction (rows, columns, 2) at each cell center.
+    """
+    point_A, point_B, point_A_prime, point_B_prime = corners
+
+    def grid(u: numpy.ndarray, t: numpy.ndarray) -> tuple[numpy.ndarray, numpy.ndarray]:
+        near = point_A + u[:, None] * (point_B - point_A)
+        far = point_A_prime + u[:, None] * (point_B_prime - point_A_prime)
+        return near[None, :, :] + t[:, None, None] * (far - near)[None, :, :], near - far
+
+    edges = numpy.linspace(0, 1, columns + 1), numpy.linspace(0, 1, rows + 1)
+    centers = (edges[0][:-1] + edges[0][1:]) / 2, (edges[1][:-1] + edges[1][1:]) / 2
+
+    points, _ = grid(*edges)
+    positions, pull = grid(*centers)
+
+    length = numpy.linalg.norm(pull, axis = 1, keepdims = True)
+    direction = numpy.divide(pull, length, out = numpy.zeros_like(pull), where = length > 0)
+
+    strength = max_force + (force - max_force) * centers[1]
+
+    return (
+        points,
+        positions,
+        numpy.repeat(strength[:, None], columns, axis = 1),
+        numpy.broadcast_to(direction[None, :, :], (rows, columns, 2)),
+    )
+
+@functools.lru_cache(maxsize = None)
+def _font() -> ImageFont.ImageFont:
+    try:
+        return ImageFont.load_default(13)
+    except (TypeError, OSError):
+        return ImageFont.load_default()
+
+class VacuumImage:
+    __slots__ = (
+        'vacuum',
+        'zoom',
+        'image',
+        'offset',
+        'photo',
+    )
+
+    def __init__(self, vacuum: VacuumProperties, zoom: float) -> None:
+        """Everything the vacuum overlay draws for a drain, rendered into one image.
+
+        Rendering doesn't use Tk, so it can run in a worker thread. The Tk image is only created by `photoimage`.
+
+        Args:
+            vacuum (VacuumProperties): Vacuum properties.
+            zoom (float): Canvas zoom.
+        """
+        self.vacuum = vacuum
+        self.zoom = zoom
+        self.image: Image.Image | None = None
+        # position of the image's top left corner relative to the drain, in canvas pixels
+        self.offset = (0.0, 0.0)
+        self.photo: ImageTk.PhotoImage | None = None
+
+        self._render()
+
+    def photoimage(self) -> ImageTk.PhotoImage | None:
+        """Get the Tk image. It's kept here, so it stays on the canvas for as long as this result is used.
+
+        Returns:
+            ImageTk.PhotoImage | None: The image, or None if there's nothing to draw.
+        """
+        if self.photo is None and self.image is not None:
+            self.photo = ImageTk.PhotoImage(self.image)
+        return self.photo
+
+    def _render(self):
+        vacuum = self.vacuum
+        scale = UNIT * self.zoom
+
+        x_axis_angle = math.radians(-vacuum.angle + vacuum.base_angle)
+        axis = numpy.array((math.cos(x_axis_angle), math.sin(x_axis_angle)))
+
+        has_centers = len(vacuum.center_offset_A) >= 2 and len(vacuum.center_offset_B) >= 2
+        has_field = vacuum.min_angle != 0 or vacuum.max_angle != 0 or vacuum.max_d > 0
+        has_forces = vacuum.force > 0 or vacuum.max_force > 0
+
+        corners = field_corners(vacuum, scale)
+        point_A, point_B, point_A_prime, point_B_prime = corners
+
+        # (kind, points, color, width) in canvas pixels relative to the drain
+        shapes = []
+
+        if vacuum.angle_variation > 0:
+            variation = max(vacuum.angle_variation, 5)
+            for angle in (-variation - vacuum.angle, variation - vacuum.angle):
+                angle = math.radians(angle)
+                end = 30 * self.zoom * numpy.array((math.cos(angle), math.sin(angle)))
+                shapes.append(('arrow', (numpy.zeros(2), end), 'white', 2))
+
+        if has_field:
+            if len(vacuum.center_offset_A) >= 2:
+                shapes.append(('dot', (point_A,), 'cyan', 3))
+            if len(vacuum.center_offset_B) >= 2:
+                shapes.append(('dot', (point_B,), 'magenta', 3))
+            shapes.append(('arrow', (point_A, point_B), 'blue', 2))
+            if vacuum.max_d > 0:
+                shapes.append(('arrow', (point_A, point_A_prime), 'green', 2))
+                shapes.append(('arrow', (point_B, point_B_prime), 'red', 2))
+            if vacuum.min_angle != 0 or vacuum.max_angle != 0:
+                shapes.append(('line', (point_A_prime, point_B_prime), 'purple', 2))
+
+        labels = []
+        if has_forces:
+            if has_centers:
+                if vacuum.max_force > 0:
+                    labels.append(((point_A + point_B) / 2 + (0, 10), str(int(vacuum.max_force))))
+                if vacuum.force > 0 and vacuum.max_d > 0:
+                    labels.append(((point_A_prime + point_B_prime) / 2 - (0, 10), str(int(vacuum.force))))
+            else:
+                if vacuum.force > 0:
+                    half = axis * vacuum.force * scale / 2
+                    shapes.append(('line', (half, -half), 'red', 3))
+                if vacuum.max_force > 0:
+                    half = axis * vacuum.max_force * scale / 2
+                    shapes.append(('dashed', (half, -half), 'red', 2))
+
+        if vacuum.friction > 0:
+            shapes.append(('circle', (numpy.zeros(2),), 'orange', max(vacuum.friction * 10, 3)))
+
+        field = None
+        if vacuum.max_d > 0 and has_forces:
+            field = sample_field(corners, vacuum.force, vacuum.max_force, FIELD_COLUMNS, FIELD_ROWS)
+
+        if len(shapes) == 0 and len(labels) == 0 and field is None:
+            return
+
+        # bounding box of everything, with room for line widths, arrow heads and labels
+        extents = [numpy.zeros((1, 2))]
+        for kind, points, color, size in shapes:
+            points = numpy.array(points)
+            if kind == 'circle':
+                points = numpy.concatenate((points - size, points + size))
+            extents.append(points)
+        for pos, text in labels:
+            extents.append(numpy.array((pos - (20, 10), pos + (20, 10))))
+        if field is not None:
+            extents.append(field[0].reshape(-1, 2))
+
+        extents = numpy.concatenate(extents)
+        padding = 8
+        left, top = numpy.floor(extents.min(axis = 0)) - padding
+        right, bottom = numpy.ceil(extents.max(axis = 0)) + padding
+
+        self.offset = (float(left), float(top))
+        origin = numpy.array(self.offset)
+
+        image = Image.new('RGBA', (int(right - left), int(bottom - top)), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+
+        if field is not None:
+            self._drawField(draw, field, origin, max(abs(vacuum.force), abs(vacuum.max_force)))
+
+        for kind, points, color, size in shapes:
+            points = [tuple(point - origin) for point in points]
+            if kind == 'dot':
+                x, y = points[0]
+                draw.ellipse((x - size, y - size, x + size, y + size), fill = color)
+            elif kind == 'circle':
+                x, y = points[0]
+                draw.ellipse((x - size, y - size, x + size, y + size), outline = color, width = 2)
+            elif kind == 'dashed':
+                self._drawDashed(draw, points[0], points[1], color, size)
+            else:
+                draw.line(points, fill = color, width = size)
+                if kind == 'arrow':
+                    self._drawArrowHead(draw, points[0], points[1], color, 5)
+
+        for pos, text in labels:
+            # centered on the position
+            bbox = draw.textbbox((0, 0), text, font = _font())
+            x, y = pos - origin - ((bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2)
+            draw.text((x, y), text, fill = 'red', font = _font())
+
+        self.image = image
+
+    def _drawField(self, draw: ImageDraw.ImageDraw, field: tuple[numpy.ndarray, ...], origin: numpy.ndarray, max_strength: float):
+        points, positions, strength, direction = field
+        points = points - origin
+
+        if max_strength <= 0:
+            return
+
+        # shade every cell by its force
+        alpha = (30 + 90 * numpy.clip(numpy.abs(strength) / max_strength, 0, 1)).astype(int)
+        for row in range(strength.shape[0]):
+            for column in range(strength.shape[1]):
+                cell = (
+                    tuple(points[row, column]),
+                    tuple(points[row, column + 1]),
+                    tuple(points[row + 1, column + 1]),
+                    tuple(points[row + 1, column]),
+                )
+                color = (70, 140, 255) if strength[row, column] >= 0 else (255, 140, 70)
+                draw.polygon(cell, fill = color + (int(alpha[row, column]),))
+
+        # arrows on a coarser grid, pointing the way particles are pulled
+        step = numpy.array((FIELD_ROWS // ARROW_ROWS, FIELD_COLUMNS // ARROW_COLUMNS))
+        cell_size = numpy.linalg.norm(points[step[0], step[1]] - points[0, 0]) / 2
+        for row in range(step[0] // 2, strength.shape[0], step[0]):
+            for column in range(step[1] // 2, strength.shape[1], step[1]):
+                length = cell_size * abs(strength[row, column]) / max_strength
+                if length < 2:
+                    continue
+                center = positions[row, column] - origin
+                half = direction[row, column] * length / 2
+                if strength[row, column] < 0:
+                    half = -half
+                start = tuple(center - half)
+                end = tuple(center + half)
+                draw.line((start, end), fill = (255, 255, 255, 200), width = 1)
+                self._drawArrowHead(draw, start, end, (255, 255, 255, 200), 3)
+
+    def _drawArrowHead(self, draw: ImageDraw.ImageDraw, start: tuple[float, float], end: tuple[float, float], color, size: float):
+        angle = math.atan2(end[1] - start[1], end[0] - start[0])
+        head = [end]
+        for side in (150, -150):
+            head.append((end[0] + size * math.cos(angle + math.radians(side)), end[1] + size * math.sin(angle + math.radians(side))))
+        draw.polygon(head, fill = color, outline = color)
+
+    def _drawDashed(self, draw: ImageDraw.ImageDraw, start: tuple[float, float], end: tuple[float, float], color, width: int, dash: tuple[float, float] = (5, 3)):
+        start = numpy.array(start)
+        end = numpy.array(end)
+        length = numpy.linalg.norm(end - start)
+        if length == 0:
+            return
+        direction = (end - start) / length
+
+        distance = 0.0
+        while distance < length:
+            stop = min(distance + dash[0], length)
+            draw.line((tuple(start + direction * distance), tuple(start + direction * stop)), fill = color, width = width)
+            distance = stop + dash[1]